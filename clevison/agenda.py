@@ -0,0 +1,437 @@
+"""
+Agenda de contatos para milhões de registros
+
+Evolução do exercício Contato/Agenda de poo.ipynb. Lá, buscar_contato e
+remover_contato percorrem a lista inteira, e remover_contato ainda chama
+list.remove dentro do laço (O(n²) no pior caso).
+
+Nesta versão:
+
+    1. Contato usa __slots__, sem um __dict__ por objeto.
+    2. Os contatos ficam em um dicionário id -> Contato, com índices hash
+    por nome, telefone e email: adicionar, remover e buscar são O(1).
+    3. A busca por prefixo do nome (autocompletar) usa um índice ordenado
+    que só é reordenado quando há consultas depois de inclusões.
+    4. A persistência é um log só de acréscimo (uma linha JSON por operação),
+    reaplicado ao abrir e compactado quando a maior parte das linhas já
+    não vale mais. Uma última linha incompleta (gravação interrompida) é
+    descartada ao abrir.
+    5. importar_csv faz a importação em lote de um arquivo CSV.
+"""
+
+import bisect
+import contextlib
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+
+
+class Contato:
+    __slots__ = ("id", "nome", "telefone", "email")
+
+    def __init__(self, nome, telefone, email, id=None):
+        self.id = id
+        self.nome = nome
+        self.telefone = telefone
+        self.email = email
+
+    def __repr__(self):
+        return f"Contato({self.nome!r}, {self.telefone!r}, {self.email!r})"
+
+
+def _chave_prefixo(nome):
+    return nome.casefold()
+
+
+class Agenda:
+    def __init__(self, caminho=None):
+        self.contatos = {}        # id -> Contato, na ordem de inclusão
+        self._por_nome = {}       # nome -> {id: None}, na ordem de inclusão
+        self._por_telefone = {}   # telefone -> {id: None}
+        self._por_email = {}      # email -> {id: None}
+        self._proximo_id = 1
+
+        # Índice de prefixos: lista ordenada de (nome em casefold, nome) e
+        # os nomes incluídos desde a última ordenação.
+        self._nomes_ordenados = []
+        self._nomes_pendentes = []
+
+        self.caminho = caminho
+        self._log = None
+        self._linhas_no_log = 0
+        if caminho is not None:
+            self._carregar_log()
+            self._log = open(caminho, "a", encoding="utf-8")
+
+    # --- Índices -------------------------------------------------------
+
+    @staticmethod
+    def _indexar(indice, chave, id_contato):
+        indice.setdefault(chave, {})[id_contato] = None
+
+    @staticmethod
+    def _desindexar(indice, chave, id_contato):
+        ids = indice[chave]
+        del ids[id_contato]
+        if not ids:
+            del indice[chave]
+
+    def _incluir(self, contato):
+        self.contatos[contato.id] = contato
+        if contato.nome not in self._por_nome:
+            self._nomes_pendentes.append((_chave_prefixo(contato.nome), contato.nome))
+        self._indexar(self._por_nome, contato.nome, contato.id)
+        self._indexar(self._por_telefone, contato.telefone, contato.id)
+        self._indexar(self._por_email, contato.email, contato.id)
+        self._proximo_id = max(self._proximo_id, contato.id + 1)
+
+    def _excluir(self, id_contato):
+        contato = self.contatos.pop(id_contato)
+        # O nome pode continuar no índice de prefixos: ele é filtrado na
+        # consulta e some na próxima reordenação.
+        self._desindexar(self._por_nome, contato.nome, id_contato)
+        self._desindexar(self._por_telefone, contato.telefone, id_contato)
+        self._desindexar(self._por_email, contato.email, id_contato)
+        return contato
+
+    def _atualizar_prefixos(self):
+        if not self._nomes_pendentes and len(self._nomes_ordenados) <= 2 * len(self._por_nome) + 16:
+            return
+        ordenados = self._nomes_ordenados
+        if (len(ordenados) <= 2 * len(self._por_nome) + 16
+                and len(self._nomes_pendentes) * 32 <= len(ordenados)):
+            # Poucos pendentes: cada insort custa uma busca binária e um
+            # deslocamento em C, mais barato que reordenar tudo
+            for item in self._nomes_pendentes:
+                posicao = bisect.bisect_left(ordenados, item)
+                # Um nome excluído e incluído de novo pode ainda estar na lista
+                if posicao == len(ordenados) or ordenados[posicao] != item:
+                    ordenados.insert(posicao, item)
+            self._nomes_pendentes = []
+            return
+        # O timsort aproveita a parte que já estava ordenada
+        nomes = self._nomes_ordenados + sorted(self._nomes_pendentes)
+        nomes.sort()
+        vistos = set()
+        self._nomes_ordenados = []
+        for chave, nome in nomes:
+            if nome in self._por_nome and nome not in vistos:
+                vistos.add(nome)
+                self._nomes_ordenados.append((chave, nome))
+        self._nomes_pendentes = []
+
+    # --- Persistência --------------------------------------------------
+
+    def _carregar_log(self):
+        if not os.path.exists(self.caminho):
+            return
+        completos = 0
+        with open(self.caminho, "rb") as arquivo:
+            for linha in arquivo:
+                if not linha.endswith(b"\n"):
+                    # Última linha sem "\n": um acréscimo interrompido (queda
+                    # no meio da gravação). A operação não chegou a valer.
+                    break
+                registro = json.loads(linha)
+                if registro[0] == "+":
+                    _, id_contato, nome, telefone, email = registro
+                    self._incluir(Contato(nome, telefone, email, id_contato))
+                elif registro[1] in self.contatos:
+                    self._excluir(registro[1])
+                self._linhas_no_log += 1
+                completos += len(linha)
+            incompleto = arquivo.tell() > completos
+        if incompleto:
+            # Tira o pedaço do fim para o próximo acréscimo começar em uma linha nova
+            with open(self.caminho, "r+b") as arquivo:
+                arquivo.truncate(completos)
+
+    def _registrar(self, linhas):
+        if self._log is None:
+            return
+        self._log.writelines(json.dumps(registro, ensure_ascii=False) + "\n" for registro in linhas)
+        self._linhas_no_log += len(linhas)
+
+    def _talvez_compactar(self):
+        if self._log is not None and self._linhas_no_log > 2 * len(self.contatos) + 1024:
+            self.compactar()
+
+    def compactar(self):
+        """
+        Reescreve o log só com os contatos atuais.
+        """
+        if self.caminho is None:
+            return
+        self._log.close()
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.writelines(
+                json.dumps(["+", c.id, c.nome, c.telefone, c.email], ensure_ascii=False) + "\n"
+                for c in self.contatos.values()
+            )
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self.caminho)
+        self._linhas_no_log = len(self.contatos)
+        self._log = open(self.caminho, "a", encoding="utf-8")
+
+    def salvar(self):
+        """
+        Garante que todas as operações estão gravadas em disco.
+        """
+        if self._log is not None:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+
+    def fechar(self):
+        if self._log is not None:
+            self.salvar()
+            self._log.close()
+            self._log = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.fechar()
+
+    # --- Operações -----------------------------------------------------
+
+    def adicionar_contato(self, nome, telefone, email):
+        contato = Contato(nome, telefone, email, self._proximo_id)
+        self._incluir(contato)
+        self._registrar([["+", contato.id, nome, telefone, email]])
+        return contato
+
+    def remover_contato(self, nome):
+        """
+        Remove o contato mais antigo com esse nome, como na versão original.
+        Retorna o contato removido ou None.
+        """
+        ids = self._por_nome.get(nome)
+        if not ids:
+            return None
+        return self.remover_por_id(next(iter(ids)))
+
+    def remover_por_id(self, id_contato):
+        if id_contato not in self.contatos:
+            return None
+        contato = self._excluir(id_contato)
+        self._registrar([["-", id_contato]])
+        self._talvez_compactar()
+        return contato
+
+    def buscar_contato(self, nome):
+        ids = self._por_nome.get(nome)
+        return self.contatos[next(iter(ids))] if ids else None
+
+    def buscar_todos(self, nome):
+        return [self.contatos[i] for i in self._por_nome.get(nome, ())]
+
+    def buscar_por_telefone(self, telefone):
+        return [self.contatos[i] for i in self._por_telefone.get(telefone, ())]
+
+    def buscar_por_email(self, email):
+        return [self.contatos[i] for i in self._por_email.get(email, ())]
+
+    def buscar_por_prefixo(self, prefixo, limite=10):
+        """
+        Nomes que começam com prefixo (sem diferenciar maiúsculas), em ordem
+        alfabética, no máximo limite nomes.
+        """
+        self._atualizar_prefixos()
+        chave = _chave_prefixo(prefixo)
+        posicao = bisect.bisect_left(self._nomes_ordenados, (chave,))
+        nomes = []
+        while posicao < len(self._nomes_ordenados) and len(nomes) < limite:
+            chave_nome, nome = self._nomes_ordenados[posicao]
+            if not chave_nome.startswith(chave):
+                break
+            if nome in self._por_nome:
+                nomes.append(nome)
+            posicao += 1
+        return nomes
+
+    def listar_contatos(self):
+        return iter(self.contatos.values())
+
+    def __len__(self):
+        return len(self.contatos)
+
+    def importar_csv(self, caminho_csv, tamanho_lote=10_000):
+        """
+        Importa um CSV com as colunas nome, telefone e email (com cabeçalho),
+        gravando o log em lotes. Retorna a quantidade de contatos importados.
+        """
+        total = 0
+        lote = []
+        with open(caminho_csv, newline="", encoding="utf-8") as arquivo:
+            for linha in csv.DictReader(arquivo):
+                contato = Contato(linha["nome"], linha["telefone"], linha["email"], self._proximo_id)
+                self._incluir(contato)
+                lote.append(["+", contato.id, contato.nome, contato.telefone, contato.email])
+                if len(lote) == tamanho_lote:
+                    self._registrar(lote)
+                    total += len(lote)
+                    lote = []
+        self._registrar(lote)
+        return total + len(lote)
+
+
+def exibir_contato(contato):
+    print(f"Nome: {contato.nome}")
+    print(f"Telefone: {contato.telefone}")
+    print(f"Email: {contato.email}")
+
+
+def menu(caminho="agenda.log"):
+    with Agenda(caminho) as agenda:
+        while True:
+            print("\nMenu de Gerenciamento de Contatos: ")
+            print("1. Adicionar Contato")
+            print("2. Remover Contato")
+            print("3. Listar Contatos")
+            print("4. Buscar Contato")
+            print("5. Buscar por início do nome")
+            print("6. Importar CSV")
+            print("7. Sair")
+            print("Escolha uma opção (1-7): ", end="")
+            opcao = input().strip()
+
+            if opcao == "1":
+                nome = input("Digite o nome do contato: ")
+                telefone = input("Digite o telefone do contato: ")
+                email = input("Digite o email do contato: ")
+                agenda.adicionar_contato(nome, telefone, email)
+                print("Contato adicionado com sucesso!")
+
+            elif opcao == "2":
+                nome = input("Digite o nome do contato a ser removido: ")
+                if agenda.remover_contato(nome):
+                    print("Contato removido com sucesso!")
+                else:
+                    print("Contato não encontrado.")
+
+            elif opcao == "3":
+                for contato in agenda.listar_contatos():
+                    exibir_contato(contato)
+                    print()
+
+            elif opcao == "4":
+                nome = input("Digite o nome do contato a ser buscado: ")
+                contato = agenda.buscar_contato(nome)
+                if contato:
+                    exibir_contato(contato)
+                else:
+                    print("Contato não encontrado.")
+
+            elif opcao == "5":
+                prefixo = input("Digite o início do nome: ")
+                for nome in agenda.buscar_por_prefixo(prefixo):
+                    print(nome)
+
+            elif opcao == "6":
+                caminho_csv = input("Digite o caminho do arquivo CSV: ")
+                print(f"{agenda.importar_csv(caminho_csv)} contatos importados.")
+
+            elif opcao == "7":
+                print("Saindo...")
+                break
+
+            else:
+                print("Opção inválida. Tente novamente.")
+
+
+class _AgendaOriginal:
+    # Cópia da Agenda de poo.ipynb, usada como referência no benchmark
+    def __init__(self):
+        self.contatos = []
+
+    def adicionar_contato(self, nome, telefone, email):
+        self.contatos.append(_ContatoOriginal(nome, telefone, email))
+
+    def remover_contato(self, nome):
+        for contato in self.contatos:
+            if contato.nome == nome:
+                self.contatos.remove(contato)
+                return
+        print("Contato não encontrado.")
+
+    def buscar_contato(self, nome):
+        for contato in self.contatos:
+            if contato.nome == nome:
+                return contato
+        print("Contato não encontrado.")
+
+
+class _ContatoOriginal:
+    def __init__(self, nome, telefone, email):
+        self.nome = nome
+        self.telefone = telefone
+        self.email = email
+
+
+def benchmark(quantidade=200_000, consultas=200):
+    sorteio = random.Random(7)
+    dados = [(f"Pessoa {i:07d}", f"11{i:09d}", f"pessoa{i}@exemplo.com") for i in range(quantidade)]
+    alvos = [dados[sorteio.randrange(quantidade)][0] for _ in range(consultas)]
+
+    original = _AgendaOriginal()
+    t0 = time.perf_counter()
+    for dado in dados:
+        original.adicionar_contato(*dado)
+    tempo_inclusao_original = time.perf_counter() - t0
+
+    nova = Agenda()
+    t0 = time.perf_counter()
+    for dado in dados:
+        nova.adicionar_contato(*dado)
+    tempo_inclusao = time.perf_counter() - t0
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        for nome in alvos:
+            original.buscar_contato(nome)
+        tempo_busca_original = (time.perf_counter() - t0) / consultas
+
+        t0 = time.perf_counter()
+        for nome in alvos:
+            original.remover_contato(nome)
+        tempo_remocao_original = (time.perf_counter() - t0) / consultas
+
+    t0 = time.perf_counter()
+    for nome in alvos:
+        nova.buscar_contato(nome)
+    tempo_busca = (time.perf_counter() - t0) / consultas
+
+    t0 = time.perf_counter()
+    for nome in alvos:
+        nova.remover_contato(nome)
+    tempo_remocao = (time.perf_counter() - t0) / consultas
+    assert len(nova) == len(original.contatos)
+
+    t0 = time.perf_counter()
+    nova.buscar_por_prefixo("pessoa 01")
+    tempo_primeiro_prefixo = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(consultas):
+        nova.buscar_por_prefixo(f"Pessoa {sorteio.randrange(1000):03d}")
+    tempo_prefixo = (time.perf_counter() - t0) / consultas
+
+    print(f"{quantidade} contatos")
+    print(f"Inclusão: lista {tempo_inclusao_original:.2f} s, indexada {tempo_inclusao:.2f} s")
+    print(f"Busca por nome: lista {tempo_busca_original * 1e3:.2f} ms, indexada {tempo_busca * 1e6:.2f} µs")
+    print(f"Remoção por nome: lista {tempo_remocao_original * 1e3:.2f} ms, indexada {tempo_remocao * 1e6:.2f} µs")
+    print(f"Busca por prefixo: {tempo_prefixo * 1e6:.1f} µs "
+          f"(primeira consulta, com ordenação: {tempo_primeiro_prefixo * 1e3:.0f} ms)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark(*map(int, sys.argv[2:]))
+    else:
+        menu()
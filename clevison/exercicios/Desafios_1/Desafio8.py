@@ -32,7 +32,8 @@ def data_por_extenso(data_str):
     except (ValueError, TypeError):
         return "NULL"
 
-print(data_por_extenso("21/05/2025"))
-print(data_por_extenso("21/13/2025"))
-print(data_por_extenso("31/02/2025"))
-print(data_por_extenso("15/05/2025"))
+if __name__ == "__main__":
+    print(data_por_extenso("21/05/2025"))
+    print(data_por_extenso("21/13/2025"))
+    print(data_por_extenso("31/02/2025"))
+    print(data_por_extenso("15/05/2025"))
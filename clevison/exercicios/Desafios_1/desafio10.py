@@ -29,19 +29,20 @@ def calcular_multa(peso):
     
     return excesso, multa
 
-try:
+if __name__ == "__main__":
+    try:
 
-    peso_total = float(input("Digite o peso total de peixes pescados em quilos: "))
-    excesso, multa = calcular_multa(peso_total)
-    
-    print(f"Peso total: {peso_total:.2f} kg")
-    
-    if excesso > 0:
-        print(f"Peso excedente: {excesso:.2f} kg")
-        print(f"Valor da multa: R$ {multa:.2f}")
-    else:
-        print("Peso dentro do limite permitido.")
+        peso_total = float(input("Digite o peso total de peixes pescados em quilos: "))
+        excesso, multa = calcular_multa(peso_total)
+
+        print(f"Peso total: {peso_total:.2f} kg")
+
+        if excesso > 0:
+            print(f"Peso excedente: {excesso:.2f} kg")
+            print(f"Valor da multa: R$ {multa:.2f}")
+        else:
+            print("Peso dentro do limite permitido.")
 
-except ValueError:
+    except ValueError:
 
-    print("Entrada inválida. Por favor, insira um número válido.")
\ No newline at end of file
+        print("Entrada inválida. Por favor, insira um número válido.")
\ No newline at end of file
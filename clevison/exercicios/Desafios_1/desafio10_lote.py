@@ -0,0 +1,381 @@
+"""
+10.1 Multas de pesca em fluxo
+
+Evolução do desafio 10 para o arquivo de registros de pesca do estado, com
+    centenas de milhões de linhas. calcular_multa recebe um peso por
+    execução do programa, e o limite de 50 kg e os R$ 8,00 por quilo
+    estão fixos na função.
+
+Requisitos:
+- Ler os registros (pescador, data, regiao, peso) de um CSV com cabeçalho
+    ou de um JSONL, em blocos, sem carregar o arquivo inteiro.
+- Calcular excesso e multa de cada bloco de uma vez (NumPy clip), com o
+    mesmo resultado de calcular_multa.
+- Limite e valor por quilo configuráveis por região.
+- Totais por pescador e por dia somados bloco a bloco; os registros
+    multados são gravados à medida que são calculados. A memória depende
+    do tamanho do bloco e da quantidade de pescadores e dias, não da
+    quantidade de linhas.
+"""
+
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # Sem NumPy os blocos são processados em listas
+    np = None
+
+from desafio10 import calcular_multa
+
+Regra = namedtuple("Regra", "limite valor_por_quilo")
+
+REGIAO_PADRAO = "SP"
+REGRAS_PADRAO = {"SP": Regra(50, 8)}  # Regulamento de pesca de São Paulo
+REGISTROS_POR_BLOCO = 1 << 16
+CAPACIDADE_INICIAL = 1024
+COLUNAS_TOTAIS = ("registros", "peso", "excesso", "multa")
+
+
+def carregar_regras(caminho):
+    """
+    Lê as regras de um JSON no formato
+    {"SP": {"limite": 50, "valor_por_quilo": 8}, ...}.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        return {regiao: Regra(dados["limite"], dados["valor_por_quilo"])
+                for regiao, dados in json.load(arquivo).items()}
+
+
+COLUNAS_REGISTRO = ("pescador", "data", "regiao", "peso")
+COLUNAS_OPCIONAIS = ("regiao",)
+
+
+def _linhas_validas(leitor, largura):
+    # Pula as linhas vazias (como csv.DictReader) e rejeita as que não têm
+    # um campo para cada coluna do cabeçalho: no zip do bloco, uma linha
+    # curta encurtaria todas as colunas.
+    for linha in leitor:
+        if len(linha) != largura:
+            if not linha:
+                continue
+            raise ValueError(f"A linha {leitor.line_num} do CSV tem {len(linha)} campos, "
+                             f"mas o cabeçalho tem {largura}.")
+        yield linha
+
+
+def _blocos_csv(arquivo, registros_por_bloco):
+    leitor = csv.reader(arquivo)
+    cabecalho = next(leitor, None)
+    if cabecalho is None:
+        raise ValueError("O arquivo CSV está vazio: falta o cabeçalho.")
+    for nome in COLUNAS_REGISTRO:
+        if nome not in cabecalho and nome not in COLUNAS_OPCIONAIS:
+            raise ValueError(f"Coluna obrigatória ausente no CSV: {nome!r}")
+    posicoes = [cabecalho.index(nome) if nome in cabecalho else None for nome in COLUNAS_REGISTRO]
+    linhas_validas = _linhas_validas(leitor, len(cabecalho))
+    while True:
+        linhas = list(itertools.islice(linhas_validas, registros_por_bloco))
+        if not linhas:
+            return
+        # Transpõe o bloco: uma tupla por coluna do arquivo
+        colunas = list(zip(*linhas))
+        yield [colunas[i] if i is not None else () for i in posicoes]
+
+
+def _blocos_jsonl(arquivo, registros_por_bloco):
+    while True:
+        registros = [json.loads(linha) for linha in itertools.islice(arquivo, registros_por_bloco)
+                     if linha.strip()]
+        if not registros:
+            return
+        try:
+            yield [[registro[nome] if nome not in COLUNAS_OPCIONAIS else registro.get(nome, "")
+                    for registro in registros] for nome in COLUNAS_REGISTRO]
+        except KeyError as erro:
+            raise ValueError(f"Campo obrigatório ausente no registro: {erro.args[0]!r}") from None
+
+
+def ler_registros(arquivo, registros_por_bloco=REGISTROS_POR_BLOCO, formato=None):
+    """
+    Gera blocos de registros como colunas {"pescador": [...], "data": [...],
+    "regiao": [...], "peso": [...]}. O formato (csv ou jsonl) vem da
+    extensão do arquivo quando não é informado. Registros sem região
+    usam REGIAO_PADRAO; as outras colunas são obrigatórias.
+    """
+    if isinstance(arquivo, (str, os.PathLike)):
+        if formato is None:
+            formato = "jsonl" if os.fspath(arquivo).endswith((".jsonl", ".ndjson")) else "csv"
+        with open(arquivo, newline="", encoding="utf-8") as aberto:
+            yield from ler_registros(aberto, registros_por_bloco, formato)
+        return
+
+    blocos = _blocos_jsonl if formato == "jsonl" else _blocos_csv
+    lidos = 0
+    for pescadores, datas, regioes, pesos in blocos(arquivo, registros_por_bloco):
+        if not regioes:
+            regioes = [REGIAO_PADRAO] * len(pesos)
+        elif "" in regioes:
+            regioes = [regiao or REGIAO_PADRAO for regiao in regioes]
+        try:
+            pesos = list(map(float, pesos))
+        except (TypeError, ValueError):
+            posicao = next(i for i, peso in enumerate(pesos) if not _numero(peso))
+            raise ValueError(f"Peso inválido no registro {lidos + posicao + 1} "
+                             f"(posição {posicao} do bloco): {pesos[posicao]!r}") from None
+        lidos += len(pesos)
+        yield {"pescador": pescadores, "data": datas, "regiao": regioes, "peso": pesos}
+
+
+def _numero(valor):
+    try:
+        float(valor)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def calcular_multas(pesos, regioes, regras=REGRAS_PADRAO):
+    """
+    Versão vetorizada de calcular_multa: retorna (excessos, multas) de cada
+    peso, com o limite e o valor por quilo da região de cada registro.
+    """
+    posicoes = {regiao: i for i, regiao in enumerate(regras)}
+    try:
+        indices = [posicoes[regiao] for regiao in regioes]
+    except KeyError as erro:
+        raise ValueError(f"Região sem regra de pesca: {erro.args[0]!r}") from None
+
+    if np is not None:
+        pesos = np.asarray(pesos, dtype=np.float64)
+        invalidos = np.flatnonzero(~(pesos >= 0))  # NaN também é inválido
+        if len(invalidos):
+            raise ValueError(f"Peso inválido na posição {invalidos[0]}: {pesos[invalidos[0]]}")
+        indices = np.asarray(indices, dtype=np.intp)
+        limites = np.array([regra.limite for regra in regras.values()], dtype=np.float64)
+        valores = np.array([regra.valor_por_quilo for regra in regras.values()], dtype=np.float64)
+        excessos = np.clip(pesos - limites[indices], 0, None)
+        return excessos, excessos * valores[indices]
+
+    regras = list(regras.values())
+    excessos, multas = [], []
+    for posicao, (peso, indice) in enumerate(zip(pesos, indices)):
+        if not peso >= 0:
+            raise ValueError(f"Peso inválido na posição {posicao}: {peso}")
+        limite, valor_por_quilo = regras[indice]
+        excesso = peso - limite if peso > limite else 0
+        excessos.append(excesso)
+        multas.append(excesso * valor_por_quilo)
+    return excessos, multas
+
+
+class _Totais:
+    """
+    Group-by incremental: cada chave recebe um código na primeira vez em que
+    aparece, e as somas de cada bloco são acumuladas por código.
+    """
+
+    def __init__(self):
+        self.codigos = {}
+        self.chaves = []
+        if np is not None:
+            self._somas = np.zeros((CAPACIDADE_INICIAL, len(COLUNAS_TOTAIS)))
+        else:
+            self._somas = []
+
+    def __len__(self):
+        return len(self.chaves)
+
+    def _codificar(self, chaves):
+        # As chaves novas do bloco recebem códigos antes; depois cada chave
+        # vira o seu código com uma consulta ao dicionário.
+        novas = set(chaves).difference(self.codigos)
+        for chave in sorted(novas):
+            self.codigos[chave] = len(self.chaves)
+            self.chaves.append(chave)
+            if np is None:
+                self._somas.append([0] * len(COLUNAS_TOTAIS))
+        return list(map(self.codigos.__getitem__, chaves))
+
+    def _garantir_capacidade(self, quantidade):
+        capacidade = len(self._somas)
+        if quantidade <= capacidade:
+            return
+        while capacidade < quantidade:
+            capacidade *= 2
+        novas = np.zeros((capacidade, len(COLUNAS_TOTAIS)))
+        novas[:len(self._somas)] = self._somas
+        self._somas = novas
+
+    def somar(self, chaves, pesos, excessos, multas):
+        codigos = self._codificar(chaves)
+        if np is not None:
+            quantidade = len(self.chaves)
+            self._garantir_capacidade(quantidade)
+            codigos = np.asarray(codigos, dtype=np.intp)
+            self._somas[:quantidade, 0] += np.bincount(codigos, minlength=quantidade)
+            for coluna, valores in enumerate((pesos, excessos, multas), start=1):
+                self._somas[:quantidade, coluna] += np.bincount(codigos, weights=valores, minlength=quantidade)
+            return
+        for codigo, peso, excesso, multa in zip(codigos, pesos, excessos, multas):
+            somas = self._somas[codigo]
+            somas[0] += 1
+            somas[1] += peso
+            somas[2] += excesso
+            somas[3] += multa
+
+    def itens(self, ordenar=True):
+        """
+        Gera (chave, registros, peso, excesso, multa) de cada chave.
+        """
+        somas = self._somas[:len(self.chaves)]
+        if np is not None:
+            somas = somas.tolist()
+        ordem = sorted(range(len(self.chaves)), key=self.chaves.__getitem__) if ordenar else range(len(self.chaves))
+        for codigo in ordem:
+            registros, peso, excesso, multa = somas[codigo]
+            yield self.chaves[codigo], int(registros), peso, excesso, multa
+
+
+def processar_registros(entrada, saida_multas=None, regras=REGRAS_PADRAO,
+                        registros_por_bloco=REGISTROS_POR_BLOCO, formato=None):
+    """
+    Calcula as multas de todos os registros de entrada. Os registros com
+    multa são gravados em saida_multas (CSV) bloco a bloco. Retorna
+    (quantidade de registros, totais por pescador, totais por dia).
+    """
+    por_pescador, por_dia = _Totais(), _Totais()
+    total = 0
+    arquivo_saida = None
+    try:
+        if saida_multas is not None:
+            arquivo_saida = open(saida_multas, "w", newline="", encoding="utf-8")
+            escritor = csv.writer(arquivo_saida)
+            escritor.writerow(["pescador", "data", "regiao", "peso", "excesso", "multa"])
+
+        for bloco in ler_registros(entrada, registros_por_bloco, formato):
+            try:
+                excessos, multas = calcular_multas(bloco["peso"], bloco["regiao"], regras)
+            except ValueError as erro:
+                raise ValueError(f"{erro} no bloco que começa no registro {total + 1}") from None
+            por_pescador.somar(bloco["pescador"], bloco["peso"], excessos, multas)
+            por_dia.somar(bloco["data"], bloco["peso"], excessos, multas)
+
+            if arquivo_saida is not None:
+                if np is not None:
+                    multados = np.flatnonzero(multas > 0).tolist()
+                    excessos, multas = excessos.tolist(), multas.tolist()
+                else:
+                    multados = [i for i, multa in enumerate(multas) if multa > 0]
+                escritor.writerows(
+                    (bloco["pescador"][i], bloco["data"][i], bloco["regiao"][i],
+                     bloco["peso"][i], excessos[i], multas[i])
+                    for i in multados
+                )
+            total += len(bloco["peso"])
+    finally:
+        if arquivo_saida is not None:
+            arquivo_saida.close()
+    return total, por_pescador, por_dia
+
+
+def gravar_totais(totais, caminho, nome_chave):
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow([nome_chave, *COLUNAS_TOTAIS])
+        escritor.writerows(totais.itens())
+
+
+def processar_arquivo(entrada, pasta_saida, regras=REGRAS_PADRAO, formato=None):
+    """
+    Grava multas.csv, totais_por_pescador.csv e totais_por_dia.csv em
+    pasta_saida. Retorna a quantidade de registros.
+    """
+    os.makedirs(pasta_saida, exist_ok=True)
+    total, por_pescador, por_dia = processar_registros(
+        entrada, os.path.join(pasta_saida, "multas.csv"), regras, formato=formato)
+    gravar_totais(por_pescador, os.path.join(pasta_saida, "totais_por_pescador.csv"), "pescador")
+    gravar_totais(por_dia, os.path.join(pasta_saida, "totais_por_dia.csv"), "data")
+    return total
+
+
+def _gerar_registros(caminho, quantidade, pescadores, regioes, sorteio):
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["pescador", "data", "regiao", "peso"])
+        for i in range(quantidade):
+            escritor.writerow([
+                f"P{sorteio.randrange(pescadores):06d}",
+                f"2025-{1 + i * 12 // quantidade:02d}-{sorteio.randint(1, 28):02d}",
+                sorteio.choice(regioes),
+                round(sorteio.uniform(0, 90), 2),
+            ])
+
+
+def benchmark(quantidade=1_000_000, pescadores=20_000):
+    regras = {**REGRAS_PADRAO, "RJ": Regra(40, 10), "SC": Regra(60, 7.5)}
+    sorteio = random.Random(10)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        entrada = os.path.join(pasta, "registros.csv")
+        _gerar_registros(entrada, quantidade, pescadores, list(regras), sorteio)
+
+        # Conferência com calcular_multa nos registros de São Paulo
+        primeiro = next(ler_registros(entrada))
+        excessos, multas = calcular_multas(primeiro["peso"], primeiro["regiao"], regras)
+        for peso, regiao, excesso, multa in zip(primeiro["peso"], primeiro["regiao"], excessos, multas):
+            if regiao == REGIAO_PADRAO:
+                assert (excesso, multa) == calcular_multa(peso)
+
+        # O mesmo trabalho com calcular_multa registro a registro (só a regra
+        # de SP): totais em dicionários e multados gravados um a um.
+        t0 = time.perf_counter()
+        totais_pescador, totais_dia = {}, {}
+        with open(os.path.join(pasta, "multas_original.csv"), "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.writer(arquivo)
+            for bloco in ler_registros(entrada):
+                for pescador, data, regiao, peso in zip(*bloco.values()):
+                    excesso, multa = calcular_multa(peso)
+                    for totais, chave in ((totais_pescador, pescador), (totais_dia, data)):
+                        somas = totais.setdefault(chave, [0, 0, 0, 0])
+                        somas[0] += 1
+                        somas[1] += peso
+                        somas[2] += excesso
+                        somas[3] += multa
+                    if multa > 0:
+                        escritor.writerow((pescador, data, regiao, peso, excesso, multa))
+        tempo_original = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        total, por_pescador, por_dia = processar_registros(
+            entrada, os.path.join(pasta, "multas.csv"), regras)
+        tempo_fluxo = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for bloco in ler_registros(entrada):
+            pass
+        tempo_leitura = time.perf_counter() - t0
+
+    multa_total = sum(multa for *_, multa in por_pescador.itens(ordenar=False))
+    assert math.isclose(multa_total, sum(multa for *_, multa in por_dia.itens(ordenar=False)))
+    print(f"{total} registros, {len(por_pescador)} pescadores, {len(por_dia)} dias")
+    print(f"Leitura do CSV: {total / tempo_leitura:,.0f} registros/s")
+    print(f"calcular_multa registro a registro: {total / tempo_original:,.0f} registros/s")
+    print(f"Fluxo com regras por região e totais: {total / tempo_fluxo:,.0f} registros/s")
+    print(f"Multa total: R$ {multa_total:,.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3:
+        regras = carregar_regras(sys.argv[3]) if len(sys.argv) > 3 else REGRAS_PADRAO
+        print(f"{processar_arquivo(sys.argv[1], sys.argv[2], regras)} registros processados.")
+    else:
+        benchmark(*map(int, sys.argv[1:]))
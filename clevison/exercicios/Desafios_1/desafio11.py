@@ -26,21 +26,22 @@ def calcular_tinta(area):
 
     return latas_necessarias, preco_total
 
-try:
+if __name__ == "__main__":
+    try:
 
-    area = float(input("Digite o tamanho da área a ser pintada em metros quadrados: "))
+        area = float(input("Digite o tamanho da área a ser pintada em metros quadrados: "))
 
-    if area <= 0:
-        raise ValueError("A área deve ser um valor positivo.")
-    
-    latas_necessarias, preco_total = calcular_tinta(area)
+        if area <= 0:
+            raise ValueError("A área deve ser um valor positivo.")
 
-    print(f"Quantidade de latas de tinta necessárias: {latas_necessarias}")
-    print(f"Preço total das latas de tinta: R$ {preco_total:.2f}")
+        latas_necessarias, preco_total = calcular_tinta(area)
 
-except ValueError as e:
-    print(f"Erro: {e}")
-except Exception as e:
-    print(f"Ocorreu um erro inesperado: {e}")
-finally:
-    print("Programa encerrado.")
+        print(f"Quantidade de latas de tinta necessárias: {latas_necessarias}")
+        print(f"Preço total das latas de tinta: R$ {preco_total:.2f}")
+
+    except ValueError as e:
+        print(f"Erro: {e}")
+    except Exception as e:
+        print(f"Ocorreu um erro inesperado: {e}")
+    finally:
+        print("Programa encerrado.")
@@ -0,0 +1,286 @@
+"""
+11.1 Orçamento de tintas em lote
+
+Evolução do desafio 11 para a rede de lojas, que orça centenas de milhares
+    de pedidos por noite. calcular_tinta atende uma área por vez, lida com
+    input().
+
+Requisitos:
+- Calcular latas e preço de um array NumPy de áreas (ou de uma coluna de
+    CSV lida em blocos) de uma vez, com o mesmo resultado de calcular_tinta.
+- Cobertura, tamanho e preço da lata configuráveis.
+- Com latas de vários tamanhos, escolher a combinação mais barata que
+    cobre a área (um pequeno problema de programação inteira, resolvido por
+    programação dinâmica). A tabela de soluções por faixa de litros é
+    calculada uma vez por configuração e guardada em cache.
+- Áreas inválidas são rejeitadas como no programa original: ValueError
+    com a mensagem "A área deve ser um valor positivo.". Áreas infinitas ou
+    tão grandes que a quantidade de latas não cabe em int64 também.
+"""
+
+import csv
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from fractions import Fraction
+from functools import lru_cache, reduce
+
+try:
+    import numpy as np
+except ImportError:  # Sem NumPy as áreas são processadas em listas
+    np = None
+
+from desafio11 import calcular_tinta
+
+COBERTURA_POR_LITRO = 5
+LITROS_POR_LATA = 18
+PRECO_POR_LATA = 100.00
+# Latas de vários tamanhos: (litros, preço)
+LATAS_MISTAS = ((18, 100.00), (3.6, 25.00), (0.9, 8.00))
+AREAS_POR_BLOCO = 1 << 16
+# Maior tabela de _TabelaLatas (em unidades de volume) aceita
+LIMITE_TABELA = 1 << 18
+_MAIOR_INT64 = 2 ** 63 - 1
+
+
+def _validar(areas):
+    """
+    Converte as áreas para um array (ou lista) de float e rejeita valores
+    que não são positivos ou não são finitos.
+    """
+    if np is not None:
+        areas = np.asarray(areas, dtype=np.float64)
+        invalidas = np.flatnonzero(~((areas > 0) & np.isfinite(areas)))  # NaN também é inválido
+        primeira = int(invalidas[0]) if len(invalidas) else None
+    else:
+        areas = [float(area) for area in areas]
+        primeira = next((i for i, area in enumerate(areas) if not (area > 0 and math.isfinite(area))), None)
+    if primeira is not None:
+        raise ValueError(f"A área deve ser um valor positivo. (posição {primeira}: {areas[primeira]})")
+    return areas
+
+
+def _inteiros(valores, maximo=_MAIOR_INT64):
+    """
+    Converte valores inteiros (já arredondados para cima) para int64,
+    rejeitando os que chegam a maximo.
+    """
+    if np is not None:
+        grandes = np.flatnonzero(valores >= float(maximo))
+    else:
+        grandes = [i for i, valor in enumerate(valores) if valor >= float(maximo)]
+    if len(grandes):
+        raise ValueError(f"A área é grande demais para o orçamento. (posição {int(grandes[0])})")
+    if np is not None:
+        return valores.astype(np.int64)
+    return [int(valor) for valor in valores]
+
+
+def calcular_tinta_lote(areas, cobertura_por_litro=COBERTURA_POR_LITRO,
+                        litros_por_lata=LITROS_POR_LATA, preco_por_lata=PRECO_POR_LATA):
+    """
+    Versão vetorizada de calcular_tinta: retorna (latas, precos), com as
+    mesmas contas (e os mesmos arredondamentos) para cada área.
+    """
+    areas = _validar(areas)
+    if np is not None:
+        latas = _inteiros(np.ceil(areas / cobertura_por_litro / litros_por_lata))
+        return latas, latas * preco_por_lata
+    latas = _inteiros([math.ceil(area / cobertura_por_litro / litros_por_lata) for area in areas])
+    return latas, [n * preco_por_lata for n in latas]
+
+
+class _TabelaLatas:
+    """
+    Solução ótima para cada necessidade de 0 até limite unidades de volume
+    (a unidade é o maior divisor comum dos tamanhos de lata).
+
+    Acima do limite, a solução ótima é a do valor menos uma lata de melhor
+    preço por litro mais essa lata: se houvesse tantas latas dos outros
+    tamanhos quanto o volume da melhor lata (em unidades), algum grupo
+    delas teria volume múltiplo dela e poderia ser trocado por ela sem
+    ficar mais caro. Então só os restos até o limite precisam da tabela.
+    """
+
+    def __init__(self, latas):
+        volumes = [Fraction(str(litros)) for litros, _ in latas]
+        self.precos_centavos = [round(preco * 100) for _, preco in latas]
+        # O mdc de frações irredutíveis é mdc(numeradores) / mmc(denominadores)
+        unidade = Fraction(reduce(math.gcd, (v.numerator for v in volumes)),
+                           math.lcm(*(v.denominator for v in volumes)))
+        self.unidade = float(unidade)
+        self.volumes = [int(v / unidade) for v in volumes]
+        self.melhor = min(range(len(latas)), key=lambda j: (self.precos_centavos[j] / self.volumes[j], j))
+        self.limite = self.volumes[self.melhor] * (max(self.volumes) + 1)
+        if self.limite > LIMITE_TABELA:
+            raise ValueError(f"As latas {latas} precisam de uma tabela com {self.limite} posições "
+                             f"(máximo {LIMITE_TABELA}); use tamanhos com menos casas decimais.")
+        # Até essa necessidade (em unidades), nem as quantidades nem o preço
+        # em centavos passam de int64
+        self.maximo_unidades = _MAIOR_INT64 // (2 * max(self.precos_centavos))
+
+        custo = [0] * (self.limite + 1)
+        quantidades = [(0,) * len(latas)]
+        for u in range(1, self.limite + 1):
+            opcoes = []
+            for j, volume in enumerate(self.volumes):
+                anterior = max(0, u - volume)
+                opcoes.append((custo[anterior] + self.precos_centavos[j], sum(quantidades[anterior]) + 1, j))
+            custo[u], _, j = min(opcoes)
+            anterior = max(0, u - self.volumes[j])
+            quantidades.append(tuple(q + (i == j) for i, q in enumerate(quantidades[anterior])))
+        self.custo = custo
+        self.quantidades = quantidades
+        if np is not None:
+            self._custo_array = np.array(custo, dtype=np.int64)
+            self._quantidades_array = np.array(quantidades, dtype=np.int64)
+
+    def resolver(self, unidades):
+        """
+        Para um array (ou lista) de necessidades em unidades, retorna as
+        quantidades de cada lata e o preço em centavos.
+        """
+        volume_melhor = self.volumes[self.melhor]
+        if np is not None:
+            unidades = np.asarray(unidades, dtype=np.int64)
+            extras = np.maximum(0, -(-(unidades - self.limite) // volume_melhor))
+            restos = unidades - extras * volume_melhor
+            quantidades = self._quantidades_array[restos]
+            quantidades[:, self.melhor] += extras
+            custo = self._custo_array[restos] + extras * self.precos_centavos[self.melhor]
+            return quantidades, custo
+        resultado_quantidades, resultado_custo = [], []
+        for u in unidades:
+            extras = max(0, -(-(u - self.limite) // volume_melhor))
+            resto = u - extras * volume_melhor
+            quantidades = list(self.quantidades[resto])
+            quantidades[self.melhor] += extras
+            resultado_quantidades.append(quantidades)
+            resultado_custo.append(self.custo[resto] + extras * self.precos_centavos[self.melhor])
+        return resultado_quantidades, resultado_custo
+
+
+@lru_cache(maxsize=32)
+def _tabela_latas(latas):
+    return _TabelaLatas(latas)
+
+
+def orcar_latas_mistas(areas, latas=LATAS_MISTAS, cobertura_por_litro=COBERTURA_POR_LITRO):
+    """
+    Combinação mais barata de latas (litros, preço) que cobre cada área.
+    Retorna (quantidades, precos): quantidades tem uma linha por área e uma
+    coluna por tamanho de lata, na ordem de latas.
+    """
+    areas = _validar(areas)
+    tabela = _tabela_latas(tuple((litros, preco) for litros, preco in latas))
+    # O arredondamento antes do ceil evita que 18.0 / 0.9 = 20.000000000000004
+    # peça uma unidade a mais.
+    if np is not None:
+        unidades = np.ceil(np.round(areas / cobertura_por_litro / tabela.unidade, 9))
+    else:
+        unidades = [math.ceil(round(area / cobertura_por_litro / tabela.unidade, 9)) for area in areas]
+    unidades = _inteiros(unidades, tabela.maximo_unidades)
+    quantidades, centavos = tabela.resolver(unidades)
+    if np is not None:
+        return quantidades, centavos / 100
+    return quantidades, [c / 100 for c in centavos]
+
+
+def ler_areas_csv(arquivo, coluna="area", areas_por_bloco=AREAS_POR_BLOCO):
+    """
+    Gera blocos de áreas de uma coluna de um CSV com cabeçalho. arquivo
+    pode ser um caminho ou um arquivo já aberto.
+    """
+    if isinstance(arquivo, (str, os.PathLike)):
+        with open(arquivo, newline="", encoding="utf-8") as aberto:
+            yield from ler_areas_csv(aberto, coluna, areas_por_bloco)
+        return
+    leitor = csv.reader(arquivo)
+    posicao = next(leitor).index(coluna)
+    bloco = []
+    for linha in leitor:
+        bloco.append(float(linha[posicao]))
+        if len(bloco) == areas_por_bloco:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def orcar_csv(entrada, saida, coluna="area", latas=None, **configuracao):
+    """
+    Orça cada área do CSV entrada e grava saida com as colunas area, uma
+    coluna de quantidade por tamanho de lata e preco. Sem latas, usa a lata
+    única de calcular_tinta. Retorna a quantidade de pedidos.
+    """
+    total = 0
+    with open(saida, "w", newline="", encoding="utf-8") as arquivo_saida:
+        escritor = csv.writer(arquivo_saida)
+        if latas is None:
+            escritor.writerow(["area", "latas", "preco"])
+        else:
+            escritor.writerow(["area", *(f"latas_{litros}l" for litros, _ in latas), "preco"])
+        for bloco in ler_areas_csv(entrada, coluna):
+            try:
+                if latas is None:
+                    quantidades, precos = calcular_tinta_lote(bloco, **configuracao)
+                    linhas = zip(bloco, _lista(quantidades), _lista(precos))
+                else:
+                    quantidades, precos = orcar_latas_mistas(bloco, latas, **configuracao)
+                    linhas = ([a, *q, p] for a, q, p in zip(bloco, _lista(quantidades), _lista(precos)))
+            except ValueError as erro:
+                raise ValueError(f"{erro} no bloco que começa na linha {total + 2}") from None
+            escritor.writerows(linhas)
+            total += len(bloco)
+    return total
+
+
+def _lista(valores):
+    return valores.tolist() if np is not None else valores
+
+
+def benchmark(quantidade=500_000):
+    sorteio = random.Random(11)
+    areas = [round(sorteio.uniform(1, 2_000), 2) for _ in range(quantidade)]
+
+    t0 = time.perf_counter()
+    esperado = [calcular_tinta(area) for area in areas]
+    tempo_original = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    latas, precos = calcular_tinta_lote(areas)
+    tempo_lote = time.perf_counter() - t0
+    assert list(zip(_lista(latas), _lista(precos))) == esperado
+
+    t0 = time.perf_counter()
+    quantidades, precos_mistos = orcar_latas_mistas(areas)
+    tempo_misto = time.perf_counter() - t0
+    economia = sum(_lista(precos)) - sum(_lista(precos_mistos))
+
+    print(f"{quantidade} pedidos")
+    print(f"calcular_tinta por pedido: {quantidade / tempo_original:,.0f} pedidos/s")
+    print(f"calcular_tinta_lote: {quantidade / tempo_lote:,.0f} pedidos/s "
+          f"({tempo_original / tempo_lote:.0f}x)")
+    print(f"orcar_latas_mistas {LATAS_MISTAS}: {quantidade / tempo_misto:,.0f} pedidos/s, "
+          f"economia total de R$ {economia:,.2f}")
+    print(f"Exemplo: {areas[0]} m² -> {_lista(quantidades)[0]} latas, R$ {_lista(precos_mistos)[0]:.2f}")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        entrada = os.path.join(pasta, "pedidos.csv")
+        with open(entrada, "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(["pedido", "area"])
+            escritor.writerows(enumerate(areas))
+        t0 = time.perf_counter()
+        orcar_csv(entrada, os.path.join(pasta, "orcamentos.csv"), latas=LATAS_MISTAS)
+        print(f"orcar_csv (lendo e gravando CSV): {quantidade / (time.perf_counter() - t0):,.0f} pedidos/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        print(f"{orcar_csv(sys.argv[1], sys.argv[2], latas=LATAS_MISTAS)} pedidos orçados.")
+    else:
+        benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,240 @@
+"""
+13.1 Geração de senhas seguras em lote
+
+Evolução do desafio 13 para gerar centenas de milhares de senhas de uma vez.
+    Em vez de uma chamada de sorteio por caractere, os caracteres saem de
+    grandes blocos de bytes do os.urandom (a mesma fonte do módulo secrets).
+
+Requisitos:
+- Criar a função gerar_senhas(n, tamanho, ...) que retorna uma lista com
+    n senhas de tamanho caracteres.
+- Usar amostragem por rejeição sem viés sobre o alfabeto
+    string.ascii_letters + string.digits + string.punctuation: bytes acima
+    do maior múltiplo do tamanho do alfabeto são descartados.
+- Aceitar uma quantidade mínima de minúsculas, maiúsculas, dígitos e
+    caracteres especiais em cada senha: os caracteres exigidos são
+    sorteados de cada classe, o resto do alfabeto inteiro, e a senha é
+    embaralhada (Fisher-Yates) com índices que também saem de os.urandom
+    em bloco, com a mesma rejeição sem viés.
+- Permitir dividir lotes muito grandes entre vários processos.
+- Exibir um benchmark de senhas por segundo e um teste estatístico de
+    uniformidade (qui-quadrado).
+"""
+
+import itertools
+import math
+import os
+import secrets
+import string
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from desafio13 import gerar_senha
+
+CARACTERES = string.ascii_letters + string.digits + string.punctuation
+
+CLASSES = {
+    "minusculas": frozenset(string.ascii_lowercase),
+    "maiusculas": frozenset(string.ascii_uppercase),
+    "digitos": frozenset(string.digits),
+    "pontuacao": frozenset(string.punctuation),
+}
+
+_SORTEIO = secrets.SystemRandom()
+
+
+@lru_cache(maxsize=None)
+def _tabela_de_bytes(alfabeto):
+    """
+    Monta a tabela usada por bytes.translate: cada byte abaixo do limite vira
+    um caractere do alfabeto e os bytes a partir do limite são descartados.
+    """
+    if not alfabeto.isascii() or len(set(alfabeto)) != len(alfabeto):
+        raise ValueError("O alfabeto deve ter apenas caracteres ASCII, sem repetição.")
+    if not 2 <= len(alfabeto) <= 256:
+        raise ValueError("O alfabeto deve ter entre 2 e 256 caracteres.")
+
+    return _tabela_modulo(alfabeto.encode("ascii"))
+
+
+@lru_cache(maxsize=None)
+def _tabela_modulo(codigos):
+    # Cada byte b abaixo do limite vira codigos[b % len(codigos)]
+    limite = 256 - 256 % len(codigos)
+    tabela = bytes(codigos[b % len(codigos)] for b in range(limite)) + bytes(256 - limite)
+    rejeitados = bytes(range(limite, 256))
+    return tabela, rejeitados, limite / 256
+
+
+def caracteres_aleatorios(quantidade, alfabeto=CARACTERES):
+    """
+    Retorna uma string com quantidade caracteres sorteados uniformemente
+    do alfabeto.
+    """
+    return _bytes_aleatorios(quantidade, *_tabela_de_bytes(alfabeto)).decode("ascii")
+
+
+def _indices_aleatorios(quantidade, limite):
+    """
+    Bytes com quantidade valores sorteados uniformemente de range(limite),
+    com 2 <= limite <= 256.
+    """
+    return _bytes_aleatorios(quantidade, *_tabela_modulo(bytes(range(limite))))
+
+
+def _bytes_aleatorios(quantidade, tabela, rejeitados, taxa_aceite):
+    partes = []
+    obtidos = 0
+    while obtidos < quantidade:
+        faltam = quantidade - obtidos
+        bruto = os.urandom(int(faltam / taxa_aceite) + 64)
+        aceitos = bruto.translate(tabela, rejeitados)
+        partes.append(aceitos)
+        obtidos += len(aceitos)
+    return b"".join(partes)[:quantidade]
+
+
+def _atende_minimos(senha, minimos):
+    for classe, minimo in minimos:
+        if sum(map(classe.__contains__, senha)) < minimo:
+            return False
+    return True
+
+
+def _sortear(quantidade, alfabeto):
+    # caracteres_aleatorios precisa de pelo menos dois caracteres
+    if len(alfabeto) == 1:
+        return alfabeto * quantidade
+    return caracteres_aleatorios(quantidade, alfabeto)
+
+
+def _gerar_lote(n, tamanho, minimos, alfabeto):
+    livres = tamanho - sum(minimo for _, minimo in minimos)
+    texto = caracteres_aleatorios(n * livres, alfabeto)
+    if not minimos:
+        return [texto[i:i + tamanho] for i in range(0, len(texto), tamanho)]
+    # Os caracteres exigidos de cada classe são sorteados de uma vez para o
+    # lote inteiro; cada senha recebe a sua parte e é embaralhada.
+    exigidos = [(_sortear(n * minimo, classe), minimo) for classe, minimo in minimos]
+    if tamanho > 256:
+        trocas = None  # Índices maiores que um byte: embaralha com SystemRandom
+    elif tamanho == 1:
+        trocas = itertools.repeat(())
+    else:
+        # Fisher-Yates: na posição i, a troca é com um índice uniforme em
+        # range(i + 1). Os índices do lote inteiro saem de os.urandom de uma
+        # vez, uma sequência de bytes por posição; trocas[k] tem os índices
+        # da senha k, da última posição para a segunda.
+        trocas = zip(*(_indices_aleatorios(n, i + 1) for i in range(tamanho - 1, 0, -1)))
+    posicoes = range(tamanho - 1, 0, -1)
+    senhas = []
+    for k in range(n):
+        caracteres = list(texto[k * livres:(k + 1) * livres])
+        for sorteados, minimo in exigidos:
+            caracteres.extend(sorteados[k * minimo:(k + 1) * minimo])
+        if trocas is None:
+            _SORTEIO.shuffle(caracteres)
+        else:
+            for i, j in zip(posicoes, next(trocas)):
+                caracteres[i], caracteres[j] = caracteres[j], caracteres[i]
+        senhas.append("".join(caracteres))
+    return senhas
+
+
+def gerar_senhas(n, tamanho, minusculas=0, maiusculas=0, digitos=0, pontuacao=0,
+                 alfabeto=CARACTERES, processos=1, senhas_por_tarefa=50_000):
+    """
+    Gera n senhas de tamanho caracteres com os.urandom e amostragem por
+    rejeição. Os parâmetros minusculas, maiusculas, digitos e pontuacao
+    definem a quantidade mínima de cada classe em cada senha. Com
+    processos > 1 o lote é dividido em tarefas de senhas_por_tarefa senhas.
+    """
+    if n < 0:
+        raise ValueError("A quantidade de senhas não pode ser negativa.")
+    if tamanho <= 0:
+        raise ValueError("O tamanho da senha deve ser maior que zero.")
+
+    exigencias = {"minusculas": minusculas, "maiusculas": maiusculas,
+                  "digitos": digitos, "pontuacao": pontuacao}
+    if any(minimo < 0 for minimo in exigencias.values()):
+        raise ValueError("Os mínimos por classe não podem ser negativos.")
+    if sum(exigencias.values()) > tamanho:
+        raise ValueError("A soma dos mínimos por classe é maior que o tamanho da senha.")
+
+    minimos = []
+    for nome, minimo in exigencias.items():
+        if minimo > 0:
+            classe = "".join(sorted(CLASSES[nome] & set(alfabeto)))
+            if not classe:
+                raise ValueError(f"O alfabeto não tem caracteres da classe '{nome}'.")
+            minimos.append((classe, minimo))
+    minimos = tuple(minimos)
+
+    if processos <= 1 or n <= senhas_por_tarefa:
+        return _gerar_lote(n, tamanho, minimos, alfabeto)
+
+    tarefas = [senhas_por_tarefa] * (n // senhas_por_tarefa)
+    if n % senhas_por_tarefa:
+        tarefas.append(n % senhas_por_tarefa)
+
+    senhas = []
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        lotes = executor.map(_gerar_lote, tarefas, [tamanho] * len(tarefas),
+                             [minimos] * len(tarefas), [alfabeto] * len(tarefas))
+        for lote in lotes:
+            senhas.extend(lote)
+    return senhas
+
+
+def teste_uniformidade(amostra=2_000_000, alfabeto=CARACTERES, z=3.09):
+    """
+    Teste qui-quadrado da frequência de cada caractere. Retorna a estatística,
+    o valor crítico (aproximação de Wilson-Hilferty, z = 3.09 equivale a
+    p = 0.001) e se a hipótese de uniformidade foi aceita.
+    """
+    contagem = Counter(caracteres_aleatorios(amostra, alfabeto))
+    esperado = amostra / len(alfabeto)
+    qui_quadrado = sum((contagem[c] - esperado) ** 2 / esperado for c in alfabeto)
+
+    graus = len(alfabeto) - 1
+    critico = graus * (1 - 2 / (9 * graus) + z * math.sqrt(2 / (9 * graus))) ** 3
+    return qui_quadrado, critico, qui_quadrado <= critico
+
+
+def benchmark(n=200_000, tamanho=16):
+    t0 = time.perf_counter()
+    for _ in range(n // 10):
+        gerar_senha(tamanho)
+    tempo_original = (time.perf_counter() - t0) * 10
+
+    t0 = time.perf_counter()
+    senhas = gerar_senhas(n, tamanho)
+    tempo_lote = time.perf_counter() - t0
+    assert len(senhas) == n and all(len(senha) == tamanho for senha in senhas)
+
+    t0 = time.perf_counter()
+    com_regras = gerar_senhas(n, tamanho, minusculas=1, maiusculas=1, digitos=1, pontuacao=1)
+    tempo_regras = time.perf_counter() - t0
+    assert all(_atende_minimos(senha, tuple((c, 1) for c in CLASSES.values())) for senha in com_regras)
+
+    processos = os.cpu_count() or 1
+    t0 = time.perf_counter()
+    gerar_senhas(n * 5, tamanho, processos=processos)
+    tempo_processos = time.perf_counter() - t0
+
+    print(f"{n} senhas de {tamanho} caracteres")
+    print(f"gerar_senha (um sorteio por caractere): {n / tempo_original:,.0f} senhas/s (estimado)")
+    print(f"gerar_senhas: {n / tempo_lote:,.0f} senhas/s")
+    print(f"gerar_senhas com uma de cada classe: {n / tempo_regras:,.0f} senhas/s")
+    print(f"gerar_senhas com {processos} processos: {n * 5 / tempo_processos:,.0f} senhas/s")
+
+    qui_quadrado, critico, uniforme = teste_uniformidade()
+    situacao = "uniforme" if uniforme else "NÃO uniforme"
+    print(f"Qui-quadrado: {qui_quadrado:.1f} (crítico {critico:.1f}) -> {situacao}")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,134 @@
+"""
+8.1 Conversão de datas por extenso em lote
+
+Evolução do desafio 8 para arquivos com milhões de linhas no formato
+    dd/mm/aaaa. A função data_por_extenso chama datetime.strptime em cada
+    data, que é um dos analisadores mais lentos da biblioteca padrão.
+
+Requisitos:
+- Ler as datas de qualquer iterável ou de um arquivo (uma data por linha)
+    e escrever o resultado "D de Mês de AAAA" linha a linha.
+- Usar um analisador próprio para o formato dd/mm/aaaa, com as suas
+    próprias regras de validade (meses de 28, 29, 30 e 31 dias e anos
+    bissextos).
+- Guardar as datas repetidas em um cache LRU de tamanho limitado.
+- Continuar retornando "NULL" para datas inválidas, como 31/02/2025.
+- Exibir um benchmark de linhas por segundo contra a função original.
+"""
+
+import random
+import re
+import sys
+import time
+from functools import lru_cache
+
+from Desafio8 import data_por_extenso, meses_por_extenso
+
+DIAS_POR_MES = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Só dígitos ASCII e sempre com dois dígitos no dia e no mês: é o formato
+# de quase todas as linhas. O resto (ex.: "1/5/2025") vai para data_por_extenso.
+_formato_rapido = re.compile(r"(\d\d)/(\d\d)/(\d\d\d\d)", re.ASCII).fullmatch
+
+
+def eh_bissexto(ano):
+    return ano % 4 == 0 and (ano % 100 != 0 or ano % 400 == 0)
+
+
+def converter_data(data_str):
+    """
+    Mesmo resultado de data_por_extenso, sem passar pelo strptime quando a
+    data está no formato dd/mm/aaaa.
+    """
+    if not isinstance(data_str, str):
+        return data_por_extenso(data_str)
+
+    partes = _formato_rapido(data_str)
+    if partes is None:
+        return data_por_extenso(data_str)
+
+    dia, mes, ano = int(partes[1]), int(partes[2]), int(partes[3])
+
+    if ano == 0 or not 1 <= mes <= 12:
+        return "NULL"
+
+    ultimo_dia = 29 if mes == 2 and eh_bissexto(ano) else DIAS_POR_MES[mes]
+    if not 1 <= dia <= ultimo_dia:
+        return "NULL"
+
+    return f"{dia} de {meses_por_extenso[mes]} de {ano}"
+
+
+def converter_datas(datas, tamanho_cache=65536):
+    """
+    Gera o texto por extenso de cada data recebida, guardando as mais
+    recentes em um cache LRU com no máximo tamanho_cache entradas.
+    """
+    converter = lru_cache(maxsize=tamanho_cache)(converter_data)
+    for data_str in datas:
+        yield converter(data_str)
+
+
+def converter_arquivo(entrada, saida, tamanho_cache=65536, linhas_por_bloco=8192):
+    """
+    Lê as datas do arquivo entrada e escreve o resultado no arquivo saida,
+    em blocos de linhas_por_bloco linhas. Retorna a quantidade de linhas.
+    """
+    total = 0
+    with open(entrada, encoding="utf-8") as arquivo_entrada, \
+            open(saida, "w", encoding="utf-8") as arquivo_saida:
+        datas = (linha.rstrip("\r\n") for linha in arquivo_entrada)
+        bloco = []
+        for resultado in converter_datas(datas, tamanho_cache):
+            bloco.append(resultado)
+            if len(bloco) == linhas_por_bloco:
+                arquivo_saida.write("\n".join(bloco) + "\n")
+                total += len(bloco)
+                bloco = []
+        if bloco:
+            arquivo_saida.write("\n".join(bloco) + "\n")
+            total += len(bloco)
+    return total
+
+
+def _gerar_datas(quantidade, distintas, sorteio):
+    # Logs reais são muito repetitivos: sorteamos de um conjunto menor de datas
+    base = [
+        f"{sorteio.randint(1, 31):02d}/{sorteio.randint(1, 12):02d}/{sorteio.randint(1900, 2100)}"
+        for _ in range(distintas)
+    ]
+    return [sorteio.choice(base) for _ in range(quantidade)]
+
+
+def benchmark(quantidade=500_000, distintas=20_000):
+    sorteio = random.Random(8)
+    datas = _gerar_datas(quantidade, distintas, sorteio)
+    datas += ["31/02/2025", "1/5/2025", " 1/05/2025", "29/02/1900", "29/02/2000",
+              "01/01/0000", "21/13/2025", "", "abc", "01/01/20255"]
+
+    t0 = time.perf_counter()
+    esperado = [data_por_extenso(data) for data in datas]
+    tempo_original = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    resultado = list(converter_datas(datas))
+    tempo_lote = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sem_cache = [converter_data(data) for data in datas]
+    tempo_sem_cache = time.perf_counter() - t0
+
+    assert resultado == esperado == sem_cache
+    print(f"{len(datas)} datas ({distintas} distintas)")
+    print(f"data_por_extenso: {len(datas) / tempo_original:,.0f} linhas/s")
+    print(f"Analisador próprio: {len(datas) / tempo_sem_cache:,.0f} linhas/s")
+    print(f"Analisador próprio + cache LRU: {len(datas) / tempo_lote:,.0f} linhas/s")
+    print(f"Ganho: {tempo_original / tempo_lote:.1f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        linhas = converter_arquivo(sys.argv[1], sys.argv[2])
+        print(f"{linhas} linhas convertidas.")
+    else:
+        benchmark()
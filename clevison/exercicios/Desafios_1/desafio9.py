@@ -48,4 +48,5 @@ def comparar_strings():
     else:
         print("As duas strings possuem conteúdo diferente")
 
-comparar_strings()
+if __name__ == "__main__":
+    comparar_strings()
@@ -0,0 +1,311 @@
+"""
+9.1 Comparação de arquivos e strings em lote
+
+Evolução do desafio 9 para comparar pares de arquivos de vários GB e
+    milhões de pares de strings. comparar_strings lê duas strings com
+    input() e responde "mesmo comprimento" e "mesmo conteúdo" com len e ==.
+
+Requisitos:
+- Mesmas duas respostas, mais a posição da primeira diferença.
+- Arquivos de tamanhos diferentes são resolvidos pelo os.stat, sem leitura
+    (a não ser que a posição da diferença seja pedida).
+- Arquivos comparados em blocos grandes, lidos por memoryview em dois
+    buffers reaproveitados, sem ler o arquivo inteiro de uma vez.
+- Hash blake2b de cada arquivo calculado durante a comparação e guardado
+    em cache: um arquivo que já foi visto é comparado em O(1).
+- Comparação de pares em lote, para strings e para arquivos.
+"""
+
+import hashlib
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+BLOCO_ARQUIVO = 8 << 20
+BLOCO_TEXTO = 1 << 16
+BUSCA_LINEAR = 64  # Abaixo disso a diferença é procurada posição a posição
+
+
+class Comparacao(namedtuple("Comparacao", "comprimento1 comprimento2 iguais primeira_diferenca")):
+    """
+    Resultado de uma comparação. primeira_diferenca é a posição do primeiro
+    caractere (ou byte) diferente; é None quando os dois são iguais ou
+    quando a posição não foi pedida.
+    """
+
+    __slots__ = ()
+
+    @property
+    def mesmo_comprimento(self):
+        return self.comprimento1 == self.comprimento2
+
+    @property
+    def mesmo_conteudo(self):
+        return self.iguais
+
+
+def primeira_diferenca(a, b, inicio=0):
+    """
+    Posição da primeira diferença entre duas strings (ou bytes) a partir de
+    inicio, ou None se forem iguais. Se uma é o começo da outra, a
+    diferença está no fim da menor.
+    """
+    n = min(len(a), len(b))
+    for bloco in range(inicio, n, BLOCO_TEXTO):
+        fim = min(bloco + BLOCO_TEXTO, n)
+        if a[bloco:fim] == b[bloco:fim]:
+            continue
+        # Busca binária: a metade da esquerda decide para que lado seguir
+        while fim - bloco > BUSCA_LINEAR:
+            meio = (bloco + fim) // 2
+            if a[bloco:meio] != b[bloco:meio]:
+                fim = meio
+            else:
+                bloco = meio
+        for posicao, (x, y) in enumerate(zip(a[bloco:fim], b[bloco:fim]), bloco):
+            if x != y:
+                return posicao
+    return None if len(a) == len(b) else n
+
+
+def comparar_textos(a, b, localizar=True):
+    """
+    Compara duas strings (ou bytes).
+    """
+    if a == b:
+        return Comparacao(len(a), len(b), True, None)
+    return Comparacao(len(a), len(b), False, primeira_diferenca(a, b) if localizar else None)
+
+
+def comparar_pares(pares, localizar=True):
+    """
+    Gera a Comparacao de cada par (a, b) de strings.
+    """
+    for a, b in pares:
+        if a == b:
+            yield Comparacao(len(a), len(b), True, None)
+        else:
+            yield Comparacao(len(a), len(b), False, primeira_diferenca(a, b) if localizar else None)
+
+
+class CacheHashes:
+    """
+    Hash blake2b do conteúdo de cada arquivo, identificado por dispositivo,
+    inode, tamanho e data de modificação: um arquivo alterado não reaproveita
+    o hash antigo. Pode ser gravado em um JSON e carregado de novo.
+    """
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho
+        self._hashes = {}
+        if caminho is not None and os.path.exists(caminho):
+            with open(caminho, encoding="utf-8") as arquivo:
+                self._hashes = {tuple(chave): digest for chave, digest in json.load(arquivo)}
+
+    def __len__(self):
+        return len(self._hashes)
+
+    @staticmethod
+    def _chave(estado):
+        return estado.st_dev, estado.st_ino, estado.st_size, estado.st_mtime_ns
+
+    def obter(self, estado):
+        return self._hashes.get(self._chave(estado))
+
+    def guardar(self, estado, digest):
+        self._hashes[self._chave(estado)] = digest
+
+    def hash_arquivo(self, caminho):
+        """
+        Hash do arquivo, calculado em blocos só se ainda não estiver no cache.
+        """
+        estado = os.stat(caminho)
+        digest = self.obter(estado)
+        if digest is None:
+            hasher = hashlib.blake2b()
+            with open(caminho, "rb") as arquivo:
+                while bloco := arquivo.read(BLOCO_ARQUIVO):
+                    hasher.update(bloco)
+            digest = hasher.hexdigest()
+            self.guardar(estado, digest)
+        return digest
+
+    def salvar(self, caminho=None):
+        with open(caminho or self.caminho, "w", encoding="utf-8") as arquivo:
+            json.dump([[list(chave), digest] for chave, digest in self._hashes.items()], arquivo)
+
+
+def _ler_bloco(arquivo, visao):
+    # readinto pode ler menos que o pedido; repete até preencher a visão
+    lidos = 0
+    while lidos < len(visao):
+        quantidade = arquivo.readinto(visao[lidos:])
+        if not quantidade:
+            raise OSError(f"{arquivo.name}: arquivo alterado durante a comparação.")
+        lidos += quantidade
+
+
+def _comparar_blocos(arquivo1, arquivo2, tamanho, hashers=None):
+    # Primeira diferença nos tamanho bytes iniciais, ou None. Com hashers,
+    # cada bloco comparado também alimenta o hash do seu arquivo.
+    buffer1, buffer2 = bytearray(BLOCO_ARQUIVO), bytearray(BLOCO_ARQUIVO)
+    with memoryview(buffer1) as visao1, memoryview(buffer2) as visao2:
+        for inicio in range(0, tamanho, BLOCO_ARQUIVO):
+            quantidade = min(BLOCO_ARQUIVO, tamanho - inicio)
+            _ler_bloco(arquivo1, visao1[:quantidade])
+            _ler_bloco(arquivo2, visao2[:quantidade])
+            # bytearray == bytearray usa memcmp; == entre memoryviews compara
+            # item a item e é bem mais lento.
+            if quantidade == BLOCO_ARQUIVO:
+                bloco1, bloco2 = buffer1, buffer2
+            else:
+                bloco1, bloco2 = buffer1[:quantidade], buffer2[:quantidade]
+            if bloco1 != bloco2:
+                return inicio + primeira_diferenca(bloco1, bloco2)
+            if hashers is not None:
+                hashers[0].update(visao1[:quantidade])
+                hashers[1].update(visao2[:quantidade])
+    return None
+
+
+def comparar_arquivos(caminho1, caminho2, cache=None, localizar=True):
+    """
+    Compara o conteúdo de dois arquivos. Com cache (CacheHashes), arquivos
+    com hash conhecido são comparados sem leitura quando são iguais (ou
+    quando a posição da diferença não é pedida).
+    """
+    estado1, estado2 = os.stat(caminho1), os.stat(caminho2)
+    tamanho1, tamanho2 = estado1.st_size, estado2.st_size
+    if os.path.samestat(estado1, estado2):
+        return Comparacao(tamanho1, tamanho2, True, None)
+    if tamanho1 != tamanho2 and not localizar:
+        return Comparacao(tamanho1, tamanho2, False, None)
+
+    if cache is not None and tamanho1 == tamanho2:
+        hash1, hash2 = cache.obter(estado1), cache.obter(estado2)
+        if hash1 is not None and hash2 is not None:
+            if hash1 == hash2:
+                return Comparacao(tamanho1, tamanho2, True, None)
+            if not localizar:
+                return Comparacao(tamanho1, tamanho2, False, None)
+
+    # Só arquivos do mesmo tamanho são lidos até o fim quando iguais, então
+    # só eles têm o hash calculado durante a comparação.
+    hashers = None
+    if cache is not None and tamanho1 == tamanho2:
+        hashers = (hashlib.blake2b(), hashlib.blake2b())
+    with open(caminho1, "rb", buffering=0) as arquivo1, open(caminho2, "rb", buffering=0) as arquivo2:
+        posicao = _comparar_blocos(arquivo1, arquivo2, min(tamanho1, tamanho2), hashers)
+    if posicao is None and tamanho1 != tamanho2:
+        posicao = min(tamanho1, tamanho2)
+
+    if posicao is None:
+        if hashers is not None:
+            cache.guardar(estado1, hashers[0].hexdigest())
+            cache.guardar(estado2, hashers[1].hexdigest())
+        return Comparacao(tamanho1, tamanho2, True, None)
+    return Comparacao(tamanho1, tamanho2, False, posicao)
+
+
+def comparar_pares_arquivos(pares, cache=None, localizar=True):
+    """
+    Gera a Comparacao de cada par (caminho1, caminho2), com um cache de
+    hashes compartilhado por todos os pares.
+    """
+    if cache is None:
+        cache = CacheHashes()
+    for caminho1, caminho2 in pares:
+        yield comparar_arquivos(caminho1, caminho2, cache, localizar)
+
+
+def _comparar_como_desafio9(a, b):
+    # len e == do desafio 9, mais a diferença procurada caractere a caractere
+    diferenca = None
+    if a != b:
+        diferenca = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+    return len(a) == len(b), a == b, diferenca
+
+
+def _gravar(caminho, tamanho, sorteio, trocar=None):
+    # Conteúdo determinístico em blocos de 1 MB; trocar muda um byte
+    with open(caminho, "wb") as arquivo:
+        bloco = sorteio.randbytes(1 << 20)
+        for inicio in range(0, tamanho, len(bloco)):
+            parte = bloco[:tamanho - inicio]
+            if trocar is not None and inicio <= trocar < inicio + len(parte):
+                parte = bytearray(parte)
+                parte[trocar - inicio] ^= 0xFF
+            arquivo.write(parte)
+
+
+def benchmark(pares_texto=1_000_000, megabytes=256):
+    # Registros longos: metade iguais, o resto com um caractere trocado ou
+    # cortado no fim
+    sorteio = random.Random(9)
+    bases = ["".join(sorteio.choices(string.ascii_letters, k=sorteio.randint(100, 3000))) for _ in range(1000)]
+    pares = []
+    for _ in range(pares_texto):
+        a = sorteio.choice(bases)
+        sorteado = sorteio.random()
+        if sorteado < 0.5:
+            b = a[:]
+        elif sorteado < 0.9:
+            posicao = sorteio.randrange(len(a))
+            b = a[:posicao] + "#" + a[posicao + 1:]
+        else:
+            b = a[:sorteio.randrange(len(a))]
+        pares.append((a, b))
+
+    t0 = time.perf_counter()
+    esperado = [_comparar_como_desafio9(a, b) for a, b in pares]
+    tempo_original = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    resultado = list(comparar_pares(pares))
+    tempo_lote = time.perf_counter() - t0
+    assert [(r.mesmo_comprimento, r.mesmo_conteudo, r.primeira_diferenca) for r in resultado] == esperado
+    print(f"{pares_texto} pares de strings, com a posição da diferença: caractere a caractere "
+          f"{len(pares) / tempo_original:,.0f} pares/s, comparar_pares {len(pares) / tempo_lote:,.0f} pares/s")
+
+    tamanho = megabytes << 20
+    with tempfile.TemporaryDirectory() as pasta:
+        original, copia, alterado, maior = (os.path.join(pasta, nome) for nome in ("a", "b", "c", "d"))
+        _gravar(original, tamanho, random.Random(1))
+        _gravar(copia, tamanho, random.Random(1))
+        _gravar(alterado, tamanho, random.Random(1), trocar=tamanho - 12_345)
+        _gravar(maior, tamanho + 1, random.Random(1))
+
+        t0 = time.perf_counter()
+        with open(original, "rb") as arquivo1, open(alterado, "rb") as arquivo2:
+            assert arquivo1.read() != arquivo2.read()
+        tempo_leitura = time.perf_counter() - t0
+
+        cache = CacheHashes()
+        medicoes = []
+        t0 = time.perf_counter()
+        comparacao = comparar_arquivos(original, alterado)
+        medicoes.append(("diferença no fim, sem cache", time.perf_counter() - t0, comparacao))
+        for descricao, par in (("tamanhos diferentes", (original, maior)),
+                               ("diferença no fim, calculando o hash", (original, alterado)),
+                               ("iguais, primeira vez", (original, copia)),
+                               ("iguais, hash em cache", (original, copia))):
+            t0 = time.perf_counter()
+            comparacao = comparar_arquivos(*par, cache, localizar=descricao != "tamanhos diferentes")
+            medicoes.append((descricao, time.perf_counter() - t0, comparacao))
+        assert medicoes[0][2] == medicoes[2][2] and medicoes[0][2].primeira_diferenca == tamanho - 12_345
+        assert medicoes[-1][2].iguais
+
+    print(f"Arquivos de {megabytes} MB: ler os dois inteiros e comparar {tempo_leitura * 1e3:.0f} ms")
+    for descricao, tempo, comparacao in medicoes:
+        print(f"  {descricao}: {tempo * 1e3:.3f} ms -> {comparacao}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and not sys.argv[1].isdigit():
+        print(comparar_arquivos(sys.argv[1], sys.argv[2]))
+    else:
+        benchmark(*map(int, sys.argv[1:]))
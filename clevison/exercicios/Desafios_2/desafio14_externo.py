@@ -0,0 +1,186 @@
+"""
+14.1 Ordenação alfabética de listas enormes de nomes
+
+Evolução do desafio 14 para as exportações de clientes, com centenas de
+    milhões de nomes. sorted(input().split()) compara pelos códigos dos
+    caracteres ("Álvaro" fica depois de "Zé" e "ana" depois de "Bruno") e
+    precisa da entrada inteira na memória.
+
+Requisitos:
+- Calcular uma única vez a chave de cada nome: sem acentos e sem diferença
+    entre maiúsculas e minúsculas, com o próprio nome como desempate.
+- Ordenar blocos de tamanho limitado em processos separados, gravando cada
+    bloco ordenado em um arquivo temporário.
+- Intercalar os blocos a partir do disco e gravar a saída em blocos
+    grandes, sem carregar a lista inteira.
+"""
+
+import heapq
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from utilitarios import TabelaTraducao, dobrar_caractere, lotes, reduzir_runs, resultados_em_ordem
+except ImportError:  # Executado da própria pasta: a raiz do repositório não está no caminho
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), *[os.pardir] * 3))
+    from utilitarios import TabelaTraducao, dobrar_caractere, lotes, reduzir_runs, resultados_em_ordem
+
+NOMES_POR_RUN = 500_000
+MAXIMO_ARQUIVOS_ABERTOS = 256
+BYTES_POR_LEITURA = 1 << 22
+NOMES_POR_ESCRITA = 65536
+
+# Nos arquivos temporários cada linha é "chave\0nome\0". Como os nomes não
+# podem ter \0 e nenhum caractere é menor que ele, comparar as linhas como
+# texto é o mesmo que comparar (chave, nome), e a intercalação não calcula
+# nada.
+_SEPARADOR = "\0"
+
+
+# Tabela de str.translate que tira os acentos e passa para minúsculas
+# (casefold), com Latin-1 e Latin Extended A/B pré-calculados
+TABELA_CHAVE = TabelaTraducao(dobrar_caractere, [range(0x250)])
+
+
+def chave_nome(nome):
+    """
+    Chave de ordenação de um nome: "Álvaro" -> "alvaro".
+    """
+    if nome.isascii():
+        return nome.lower()
+    return nome.translate(TABELA_CHAVE)
+
+
+def ordenar_nomes(nomes):
+    """
+    Versão em memória: mesma ordem de ordenar_arquivo.
+    """
+    return sorted(nomes, key=lambda nome: (chave_nome(nome), nome))
+
+
+def ler_nomes(caminho):
+    """
+    Gera os nomes do arquivo, separados por espaços ou quebras de linha
+    (como input().split()), lendo pedaços de tamanho fixo.
+    """
+    resto = ""
+    with open(caminho, encoding="utf-8") as arquivo:
+        while dados := arquivo.read(BYTES_POR_LEITURA):
+            if _SEPARADOR in dados:
+                raise ValueError(f"{caminho} contém o caractere \\0.")
+            partes = (resto + dados).split()
+            # O último nome pode ter sido cortado no fim do pedaço
+            resto = partes.pop() if partes and not dados[-1].isspace() else ""
+            yield from partes
+    if resto:
+        yield resto
+
+
+def _linhas_ordenadas(nomes):
+    linhas = [chave_nome(nome) + _SEPARADOR + nome + _SEPARADOR + "\n" for nome in nomes]
+    linhas.sort()
+    return linhas
+
+
+def _ordenar_run(nomes, caminho):
+    # Roda no processo que vai ordenar o bloco, inclusive o cálculo das chaves
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.writelines(_linhas_ordenadas(nomes))
+    return caminho
+
+
+def _intercalar(caminhos, pilha):
+    # As linhas já comparam na ordem certa, então heapq.merge não precisa de key
+    arquivos = [pilha.enter_context(open(c, encoding="utf-8")) for c in caminhos]
+    return heapq.merge(*arquivos)
+
+
+def _gravar_intercalados(caminhos, destino):
+    with ExitStack() as pilha, open(destino, "w", encoding="utf-8") as arquivo:
+        arquivo.writelines(_intercalar(caminhos, pilha))
+
+
+def _escrever(linhas, saida, separador):
+    # Tira a chave de cada linha e grava os nomes em blocos
+    total = 0
+    for bloco in lotes(linhas, NOMES_POR_ESCRITA):
+        saida.write(separador.join(linha[linha.index(_SEPARADOR) + 1:-2] for linha in bloco))
+        saida.write(separador)
+        total += len(bloco)
+    return total
+
+
+def ordenar_arquivo(entrada, saida, separador="\n", nomes_por_run=NOMES_POR_RUN, processos=1,
+                    diretorio=None, maximo_arquivos=MAXIMO_ARQUIVOS_ABERTOS):
+    """
+    Ordena os nomes do arquivo entrada e grava em saida, um por linha (ou
+    com outro separador). No máximo nomes_por_run nomes por processo ficam
+    na memória ao mesmo tempo. Retorna a quantidade de nomes.
+    """
+    blocos = lotes(ler_nomes(entrada), nomes_por_run)
+    primeiro = next(blocos, [])
+    segundo = next(blocos, None)
+
+    with open(saida, "w", encoding="utf-8", buffering=1 << 20) as arquivo_saida:
+        if segundo is None:
+            # Tudo coube em um bloco: não precisa de arquivos temporários
+            return _escrever(_linhas_ordenadas(primeiro), arquivo_saida, separador)
+
+        with tempfile.TemporaryDirectory(dir=diretorio, prefix="nomes_") as pasta:
+            chamadas = ((lote, os.path.join(pasta, f"run_{indice}.txt"))
+                        for indice, lote in enumerate(itertools.chain([primeiro, segundo], blocos)))
+            if processos <= 1:
+                caminhos = [_ordenar_run(*argumentos) for argumentos in chamadas]
+            else:
+                with ProcessPoolExecutor(max_workers=processos) as executor:
+                    # Limita os blocos em trânsito para a memória continuar limitada
+                    caminhos = list(resultados_em_ordem(executor, _ordenar_run, chamadas, 2 * processos))
+
+            caminhos = reduzir_runs(caminhos, pasta, maximo_arquivos, _gravar_intercalados, ".txt")
+            with ExitStack() as pilha:
+                return _escrever(_intercalar(caminhos, pilha), arquivo_saida, separador)
+
+
+def _gerar_nomes(quantidade, semente=14):
+    sorteio = random.Random(semente)
+    nomes = ["Álvaro", "alvaro", "Zé", "Ana", "ana", "Bruno", "Érica", "Íris", "Óscar", "Úrsula",
+             "Çelik", "joão", "João", "Maria", "Ñandu", "Zoë", "Renée", "Chloé", "Ødegaard"]
+    return [sorteio.choice(nomes) + str(sorteio.randrange(1000)) for _ in range(quantidade)]
+
+
+def benchmark(quantidade=2_000_000):
+    nomes = _gerar_nomes(quantidade)
+    print(f"sorted padrão: {' '.join(sorted(['Zé', 'Álvaro', 'ana', 'Bruno']))}")
+    print(f"ordenar_nomes: {' '.join(ordenar_nomes(['Zé', 'Álvaro', 'ana', 'Bruno']))}")
+
+    t0 = time.perf_counter()
+    esperado = ordenar_nomes(nomes)
+    tempo_memoria = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as pasta:
+        entrada = os.path.join(pasta, "nomes.txt")
+        saida = os.path.join(pasta, "ordenados.txt")
+        with open(entrada, "w", encoding="utf-8") as arquivo:
+            arquivo.write(" ".join(nomes))
+
+        print(f"{quantidade} nomes em memória: {tempo_memoria:.2f} s")
+        for processos in (1, max(2, os.cpu_count() or 1)):
+            t0 = time.perf_counter()
+            total = ordenar_arquivo(entrada, saida, nomes_por_run=quantidade // 10, processos=processos)
+            tempo = time.perf_counter() - t0
+            with open(saida, encoding="utf-8") as arquivo:
+                assert total == quantidade and arquivo.read().split("\n")[:-1] == esperado
+            print(f"{quantidade} nomes com ordenação externa e {processos} processo(s): {tempo:.2f} s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        print(f"{ordenar_arquivo(sys.argv[1], sys.argv[2])} nomes ordenados.")
+    else:
+        benchmark(*map(int, sys.argv[1:]))
@@ -29,6 +29,22 @@ o cadastro de veículos, contendo os seguintes atributos:
     completas, incluindo o identificador de memória.
 """
 
+import itertools
+import os
+import sys
+
+
+def _saida():
+    # saida.py fica na raiz do repositório. O import só acontece na primeira
+    # exibição, e o caminho só é ajustado se o módulo não for encontrado.
+    try:
+        import saida
+    except ImportError:
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), *[os.pardir] * 3))
+        import saida
+    return saida
+
+
 class Veiculo:    
     
     def __init__(self, marca, modelo, ano, cor, valor):
@@ -38,26 +54,34 @@ class Veiculo:
         self.cor = cor
         self.valor = valor
 
+    def linhas_informacoes(self):
+        yield "--- Informações do Veículo ---\n"
+        yield f"Marca: {self.marca}\n"
+        yield f"Modelo: {self.modelo}\n"
+        yield f"Ano: {self.ano}\n"
+        yield f"Cor: {self.cor}\n"
+        yield f"Valor: R${self.valor:.2f}\n"
+        yield f"Identificador de memória: {id(self)}\n"
+        yield "-" * 40 + "\n"
+
     def exibir_informacoes(self):
-        print("--- Informações do Veículo ---")
-        print(f"Marca: {self.marca}")
-        print(f"Modelo: {self.modelo}")
-        print(f"Ano: {self.ano}")
-        print(f"Cor: {self.cor}")
-        print(f"Valor: R${self.valor:.2f}")
-        print(f"Identificador de memória: {id(self)}")
-        print("-" * 40)
-
-# Cadastro de veículos
-veiculo1 = Veiculo("Ford", "Mustang", 2022, "Vermelho", 350000.00)
-veiculo2 = Veiculo("Chevrolet", "Camaro", 2021, "Preto", 320000.00)
-veiculo3 = Veiculo("Dodge", "Challenger", 2023, "Azul", 380000.00)
-veiculo4 = Veiculo("Bentley", "Continental GT", 2025, "Azul", 2000000.00)
-veiculo5 = Veiculo("Toyota", "Corolla", 2025, "Preto", 150000.00)
-
-# Exibição das informações dos veículos
-veiculo1.exibir_informacoes()
-veiculo2.exibir_informacoes()
-veiculo3.exibir_informacoes()
-veiculo4.exibir_informacoes()
-veiculo5.exibir_informacoes()
+        _saida().escrever(self.linhas_informacoes())
+
+
+def exibir_frota(veiculos, destino=None):
+    """
+    Exibe as informações de vários veículos, gravando em blocos grandes
+    em vez de uma linha por vez.
+    """
+    return _saida().escrever(itertools.chain.from_iterable(v.linhas_informacoes() for v in veiculos), destino)
+
+if __name__ == "__main__":
+    # Cadastro de veículos
+    veiculo1 = Veiculo("Ford", "Mustang", 2022, "Vermelho", 350000.00)
+    veiculo2 = Veiculo("Chevrolet", "Camaro", 2021, "Preto", 320000.00)
+    veiculo3 = Veiculo("Dodge", "Challenger", 2023, "Azul", 380000.00)
+    veiculo4 = Veiculo("Bentley", "Continental GT", 2025, "Azul", 2000000.00)
+    veiculo5 = Veiculo("Toyota", "Corolla", 2025, "Preto", 150000.00)
+
+    # Exibição das informações dos veículos
+    exibir_frota([veiculo1, veiculo2, veiculo3, veiculo4, veiculo5])
@@ -0,0 +1,330 @@
+"""
+16.1 Cadastro de milhões de veículos em colunas
+
+Evolução do desafio 16 para manter milhões de veículos na memória e filtrar
+    por valor e ano. Cada Veiculo do desafio guarda seus atributos em um
+    dicionário próprio, e a única operação disponível é exibir_informacoes.
+
+Requisitos:
+- Veiculo com __slots__, com os mesmos atributos e a mesma exibição.
+- FrotaColunar: ano e valor em arrays NumPy (array da biblioteca padrão
+    quando o NumPy não estiver instalado) e marca, modelo e cor guardados
+    como códigos de categoria, com cada texto armazenado uma única vez.
+- Consultas vetorizadas por faixa (valor entre, ano a partir de), totais
+    por marca e índices ordenados por coluna.
+- Informar a memória por veículo comparada à da classe original.
+"""
+
+import bisect
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # Sem NumPy as colunas são array da biblioteca padrão
+    np = None
+
+import desafio16
+
+COLUNAS_NUMERICAS = {"ano": ("h", "int16"), "valor": ("d", "float64")}
+COLUNAS_CATEGORIA = ("marca", "modelo", "cor")
+CAPACIDADE_INICIAL = 1024
+
+
+class Veiculo:
+    __slots__ = ("marca", "modelo", "ano", "cor", "valor")
+
+    def __init__(self, marca, modelo, ano, cor, valor):
+        self.marca = marca
+        self.modelo = modelo
+        self.ano = ano
+        self.cor = cor
+        self.valor = valor
+
+    linhas_informacoes = desafio16.Veiculo.linhas_informacoes
+    exibir_informacoes = desafio16.Veiculo.exibir_informacoes
+
+    def __repr__(self):
+        return f"Veiculo({self.marca!r}, {self.modelo!r}, {self.ano}, {self.cor!r}, {self.valor})"
+
+    def __eq__(self, outro):
+        if not isinstance(outro, Veiculo):
+            return NotImplemented
+        return all(getattr(self, nome) == getattr(outro, nome) for nome in self.__slots__)
+
+
+class _Categorias:
+    # Cada texto diferente recebe um código inteiro; a coluna guarda só o código
+    def __init__(self):
+        self.codigos = {}
+        self.valores = []
+
+    def codigo(self, valor):
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = self.codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+
+class FrotaColunar:
+    def __init__(self, veiculos=()):
+        self._quantidade = 0
+        self._categorias = {nome: _Categorias() for nome in COLUNAS_CATEGORIA}
+        tipos = {**COLUNAS_NUMERICAS, **{nome: ("I", "uint32") for nome in COLUNAS_CATEGORIA}}
+        if np is not None:
+            self._dados = {nome: np.empty(CAPACIDADE_INICIAL, dtype=tipo)
+                           for nome, (_, tipo) in tipos.items()}
+        else:
+            self._dados = {nome: array(codigo) for nome, (codigo, _) in tipos.items()}
+        self._indices_ordenados = {}
+        self.adicionar_muitos(veiculos)
+
+    def __len__(self):
+        return self._quantidade
+
+    def _garantir_capacidade(self, quantidade):
+        if np is None:
+            return
+        capacidade = len(self._dados["ano"])
+        if quantidade <= capacidade:
+            return
+        while capacidade < quantidade:
+            capacidade *= 2
+        for nome, coluna in self._dados.items():
+            nova = np.empty(capacidade, dtype=coluna.dtype)
+            nova[:self._quantidade] = coluna[:self._quantidade]
+            self._dados[nome] = nova
+
+    def adicionar(self, marca, modelo, ano, cor, valor):
+        """
+        Cadastra um veículo e retorna a sua posição na frota.
+        """
+        return self.adicionar_muitos([(marca, modelo, ano, cor, valor)])
+
+    def adicionar_muitos(self, veiculos):
+        """
+        Cadastra vários veículos (objetos Veiculo, do desafio 16 ou tuplas
+        (marca, modelo, ano, cor, valor)). Retorna a posição do último.
+        """
+        linhas = [(v.marca, v.modelo, v.ano, v.cor, v.valor) if not isinstance(v, tuple) else v
+                  for v in veiculos]
+        if not linhas:
+            return self._quantidade - 1
+        marcas, modelos, anos, cores, valores = zip(*linhas)
+        colunas = {
+            "marca": list(map(self._categorias["marca"].codigo, marcas)),
+            "modelo": list(map(self._categorias["modelo"].codigo, modelos)),
+            "cor": list(map(self._categorias["cor"].codigo, cores)),
+            "ano": anos,
+            "valor": valores,
+        }
+
+        inicio = self._quantidade
+        fim = inicio + len(linhas)
+        self._garantir_capacidade(fim)
+        for nome, valores_coluna in colunas.items():
+            if np is not None:
+                self._dados[nome][inicio:fim] = valores_coluna
+            else:
+                self._dados[nome].extend(valores_coluna)
+        self._quantidade = fim
+        self._indices_ordenados.clear()
+        return fim - 1
+
+    def coluna(self, nome):
+        """
+        Coluna como array (somente leitura). marca, modelo e cor vêm como
+        códigos; o texto de cada código está em categorias(nome).
+        """
+        if np is None:
+            return self._dados[nome]
+        visao = self._dados[nome][:self._quantidade]
+        visao.flags.writeable = False
+        return visao
+
+    def categorias(self, nome):
+        return self._categorias[nome].valores
+
+    def __getitem__(self, posicao):
+        if not -self._quantidade <= posicao < self._quantidade:
+            raise IndexError("Posição fora da frota.")
+        posicao %= self._quantidade
+        dados = self._dados
+        return Veiculo(
+            self._categorias["marca"].valores[dados["marca"][posicao]],
+            self._categorias["modelo"].valores[dados["modelo"][posicao]],
+            int(dados["ano"][posicao]),
+            self._categorias["cor"].valores[dados["cor"][posicao]],
+            float(dados["valor"][posicao]),
+        )
+
+    def veiculos(self, posicoes=None):
+        """
+        Gera os objetos Veiculo das posições pedidas (todas, se None).
+        """
+        for posicao in range(self._quantidade) if posicoes is None else posicoes:
+            yield self[int(posicao)]
+
+    def filtrar(self, valor_min=None, valor_max=None, ano_min=None, ano_max=None, marca=None):
+        """
+        Posições dos veículos com valor entre valor_min e valor_max, ano
+        entre ano_min e ano_max (limites inclusivos) e da marca informada.
+        Os critérios None são ignorados.
+        """
+        codigo_marca = None
+        if marca is not None:
+            codigo_marca = self._categorias["marca"].codigos.get(marca)
+            if codigo_marca is None:
+                return np.empty(0, dtype=np.intp) if np is not None else []
+
+        condicoes = [("valor", valor_min, valor_max), ("ano", ano_min, ano_max),
+                     ("marca", codigo_marca, codigo_marca)]
+        if np is not None:
+            mascara = np.ones(self._quantidade, dtype=bool)
+            for nome, minimo, maximo in condicoes:
+                coluna = self.coluna(nome)
+                if minimo is not None:
+                    mascara &= coluna >= minimo
+                if maximo is not None:
+                    mascara &= coluna <= maximo
+            return np.flatnonzero(mascara)
+
+        posicoes = range(self._quantidade)
+        for nome, minimo, maximo in condicoes:
+            coluna = self._dados[nome]
+            if minimo is not None:
+                posicoes = [i for i in posicoes if coluna[i] >= minimo]
+            if maximo is not None:
+                posicoes = [i for i in posicoes if coluna[i] <= maximo]
+        return list(posicoes)
+
+    def indice_ordenado(self, nome):
+        """
+        Posições da frota em ordem crescente da coluna (estável). O índice
+        fica guardado até o próximo cadastro.
+        """
+        if nome not in self._indices_ordenados:
+            if np is not None:
+                indice = np.argsort(self.coluna(nome), kind="stable")
+            else:
+                indice = sorted(range(self._quantidade), key=self._dados[nome].__getitem__)
+            self._indices_ordenados[nome] = indice
+        return self._indices_ordenados[nome]
+
+    def faixa(self, nome, minimo=None, maximo=None):
+        """
+        Posições com minimo <= coluna <= maximo, já ordenadas pela coluna,
+        por busca binária no índice ordenado.
+        """
+        indice = self.indice_ordenado(nome)
+        if np is not None:
+            valores = self.coluna(nome)[indice]
+            inicio = 0 if minimo is None else np.searchsorted(valores, minimo, side="left")
+            fim = len(indice) if maximo is None else np.searchsorted(valores, maximo, side="right")
+        else:
+            chave = self._dados[nome].__getitem__
+            inicio = 0 if minimo is None else bisect.bisect_left(indice, minimo, key=chave)
+            fim = len(indice) if maximo is None else bisect.bisect_right(indice, maximo, key=chave)
+        return indice[inicio:fim]
+
+    def totais_por_marca(self, posicoes=None):
+        """
+        Para cada marca: quantidade de veículos e valor total, médio, mínimo
+        e máximo. Com posicoes (por exemplo, o resultado de filtrar), só
+        esses veículos entram na conta.
+        """
+        marcas = self._categorias["marca"].valores
+        if np is not None:
+            codigos = self.coluna("marca")
+            valores = self.coluna("valor")
+            if posicoes is not None:
+                codigos, valores = codigos[posicoes], valores[posicoes]
+            quantidade = np.bincount(codigos, minlength=len(marcas))
+            total = np.bincount(codigos, weights=valores, minlength=len(marcas))
+            minimo = np.full(len(marcas), np.inf)
+            maximo = np.full(len(marcas), -np.inf)
+            np.minimum.at(minimo, codigos, valores)
+            np.maximum.at(maximo, codigos, valores)
+            linhas = zip(quantidade.tolist(), total.tolist(), minimo.tolist(), maximo.tolist())
+        else:
+            acumulado = [[0, 0.0, float("inf"), float("-inf")] for _ in marcas]
+            codigos = self._dados["marca"]
+            valores = self._dados["valor"]
+            for i in range(self._quantidade) if posicoes is None else posicoes:
+                linha = acumulado[codigos[i]]
+                linha[0] += 1
+                linha[1] += valores[i]
+                linha[2] = min(linha[2], valores[i])
+                linha[3] = max(linha[3], valores[i])
+            linhas = acumulado
+
+        return {
+            marca: {"quantidade": qtd, "valor_total": total, "valor_medio": total / qtd,
+                    "valor_min": minimo, "valor_max": maximo}
+            for marca, (qtd, total, minimo, maximo) in zip(marcas, linhas) if qtd
+        }
+
+
+def _gerar_veiculos(quantidade, semente=16):
+    sorteio = random.Random(semente)
+    modelos = {"Ford": ["Mustang", "Ka", "Ranger"], "Chevrolet": ["Camaro", "Onix", "S10"],
+               "Dodge": ["Challenger", "Ram"], "Bentley": ["Continental GT"],
+               "Toyota": ["Corolla", "Hilux", "Yaris"], "Volkswagen": ["Gol", "Polo", "T-Cross"]}
+    marcas = list(modelos)
+    cores = ["Vermelho", "Preto", "Azul", "Branco", "Prata", "Cinza"]
+    for _ in range(quantidade):
+        marca = sorteio.choice(marcas)
+        yield (marca, sorteio.choice(modelos[marca]), sorteio.randint(1990, 2025),
+               sorteio.choice(cores), round(sorteio.uniform(20_000, 2_000_000), 2))
+
+
+def _memoria(criar):
+    tracemalloc.start()
+    objeto = criar()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objeto, memoria
+
+
+def benchmark(quantidade=1_000_000):
+    # Os textos vêm de listas fixas (compartilhados), como em um cadastro real
+    dados = list(_gerar_veiculos(quantidade))
+
+    originais, memoria_original = _memoria(lambda: [desafio16.Veiculo(*d) for d in dados])
+    compactos, memoria_slots = _memoria(lambda: [Veiculo(*d) for d in dados])
+    frota, memoria_frota = _memoria(lambda: FrotaColunar(dados))
+    print(f"{quantidade} veículos, memória por veículo:")
+    print(f"  Veiculo original: {memoria_original / quantidade:.0f} bytes")
+    print(f"  Veiculo com __slots__: {memoria_slots / quantidade:.0f} bytes")
+    print(f"  FrotaColunar: {memoria_frota / quantidade:.1f} bytes")
+
+    t0 = time.perf_counter()
+    esperado = [i for i, v in enumerate(originais) if 100_000 <= v.valor <= 300_000 and v.ano >= 2015]
+    tempo_lista = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    posicoes = frota.filtrar(valor_min=100_000, valor_max=300_000, ano_min=2015)
+    tempo_frota = time.perf_counter() - t0
+    assert list(posicoes) == esperado
+    print(f"Valor entre 100 mil e 300 mil e ano >= 2015 ({len(esperado)} veículos): "
+          f"lista {tempo_lista * 1e3:.1f} ms, FrotaColunar {tempo_frota * 1e3:.1f} ms")
+
+    t0 = time.perf_counter()
+    totais = frota.totais_por_marca()
+    tempo_totais = time.perf_counter() - t0
+    assert sum(t["quantidade"] for t in totais.values()) == quantidade
+    print(f"Totais por marca em {tempo_totais * 1e3:.1f} ms:")
+    for marca, total in sorted(totais.items()):
+        print(f"  {marca}: {total['quantidade']} veículos, média R${total['valor_medio']:,.2f}")
+
+    baratos = frota.faixa("valor", maximo=25_000)
+    assert [frota[int(i)] for i in baratos] == sorted(
+        (v for v in compactos if v.valor <= 25_000), key=lambda v: v.valor)
+    print(f"{len(baratos)} veículos até R$25.000 pelo índice ordenado de valor")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:]))
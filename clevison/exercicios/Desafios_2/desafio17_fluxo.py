@@ -0,0 +1,367 @@
+"""
+17.1 Maior número, duplicidade e ordenação em fluxos de números
+
+Evolução do desafio 17 para fluxos com bilhões de valores, que não cabem
+    em uma lista. maior_valor compara par a par, verificar_duplicidade monta
+    um set com todos os números e exibir_numeros_ordenados ordena tudo na
+    memória.
+
+Requisitos:
+- Ler os números em blocos (de um arquivo de texto com números separados
+    por espaço ou quebra de linha, ou de qualquer iterável) e calcular o
+    maior, o menor e os k maiores em uma única passada, com NumPy quando
+    disponível e um heap de tamanho k.
+- Detectar duplicidade com um filtro de Bloom configurável (capacidade e
+    taxa de falsos positivos). Enquanto couber, um set exato é usado; se a
+    fonte puder ser lida de novo, uma segunda passada confirma os candidatos
+    e o resultado volta a ser exato.
+- Gerar os números em ordem decrescente com memória limitada: blocos
+    ordenados são gravados em arquivos binários temporários e intercalados,
+    em várias rodadas quando há mais blocos que arquivos abertos permitidos.
+"""
+
+import heapq
+import itertools
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Sem NumPy os blocos são array('d')
+    np = None
+
+try:
+    from utilitarios import reduzir_runs
+except ImportError:  # Executado da própria pasta: a raiz do repositório não está no caminho
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), *[os.pardir] * 3))
+    from utilitarios import reduzir_runs
+
+from desafio17 import maior_valor, verificar_duplicidade
+
+NUMEROS_POR_BLOCO = 1 << 20
+BYTES_POR_LEITURA = 1 << 22
+MAXIMO_ARQUIVOS_ABERTOS = 128  # Folga dentro do limite de 256 arquivos comum no macOS
+
+
+def _bloco(numeros):
+    if np is not None:
+        return np.asarray(numeros, dtype=np.float64)
+    return array("d", numeros)
+
+
+def _ler_texto(caminho, numeros_por_bloco):
+    # Lê o arquivo em pedaços grandes, guardando o último número de cada
+    # pedaço (que pode estar cortado) para o próximo.
+    resto = b""
+    pendentes = []
+    with open(caminho, "rb") as arquivo:
+        while dados := arquivo.read(BYTES_POR_LEITURA):
+            partes = (resto + dados).split()
+            if partes and not dados[-1:].isspace():
+                resto = partes.pop()
+            else:
+                resto = b""
+            pendentes.extend(map(float, partes))
+            while len(pendentes) >= numeros_por_bloco:
+                yield _bloco(pendentes[:numeros_por_bloco])
+                del pendentes[:numeros_por_bloco]
+    if resto:
+        pendentes.append(float(resto))
+    if pendentes:
+        yield _bloco(pendentes)
+
+
+def ler_numeros(fonte, numeros_por_bloco=NUMEROS_POR_BLOCO):
+    """
+    Gera blocos de no máximo numeros_por_bloco números. fonte pode ser o
+    caminho de um arquivo de texto, um array NumPy ou qualquer iterável.
+    """
+    if isinstance(fonte, (str, os.PathLike)):
+        yield from _ler_texto(fonte, numeros_por_bloco)
+        return
+    if np is not None and isinstance(fonte, np.ndarray):
+        for inicio in range(0, len(fonte), numeros_por_bloco):
+            yield fonte[inicio:inicio + numeros_por_bloco].astype(np.float64, copy=False)
+        return
+
+    iterador = iter(fonte)
+    while True:
+        pendentes = [float(x) for _, x in zip(range(numeros_por_bloco), iterador)]
+        if not pendentes:
+            return
+        yield _bloco(pendentes)
+
+
+def _maiores_do_bloco(bloco, k):
+    if np is not None:
+        if len(bloco) > k:
+            return np.partition(bloco, len(bloco) - k)[-k:].tolist()
+        return bloco.tolist()
+    return heapq.nlargest(k, bloco)
+
+
+def resumo_fluxo(fonte, k=10, numeros_por_bloco=NUMEROS_POR_BLOCO):
+    """
+    Uma única passada pela fonte. Retorna (maior, menor, k_maiores), com os
+    k maiores em ordem decrescente, ou (None, None, []) para fonte vazia.
+    """
+    maior = menor = None
+    heap = []  # Heap mínimo com os k maiores vistos até agora
+
+    for bloco in ler_numeros(fonte, numeros_por_bloco):
+        if not len(bloco):
+            continue
+        maior_bloco, menor_bloco = (float(bloco.max()), float(bloco.min())) if np is not None \
+            else (max(bloco), min(bloco))
+        maior = maior_bloco if maior is None else max(maior, maior_bloco)
+        menor = menor_bloco if menor is None else min(menor, menor_bloco)
+
+        if k > 0:
+            for valor in _maiores_do_bloco(bloco, k):
+                if len(heap) < k:
+                    heapq.heappush(heap, valor)
+                elif valor > heap[0]:
+                    heapq.heapreplace(heap, valor)
+
+    return maior, menor, sorted(heap, reverse=True)
+
+
+def maior_valor_fluxo(fonte, numeros_por_bloco=NUMEROS_POR_BLOCO):
+    return resumo_fluxo(fonte, 0, numeros_por_bloco)[0]
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom para números: diz com certeza que um valor nunca foi
+    visto, ou que ele provavelmente foi visto (com chance de erro de
+    aproximadamente taxa_falso_positivo quando capacidade valores distintos
+    tiverem sido inseridos).
+    """
+
+    def __init__(self, capacidade, taxa_falso_positivo=0.01):
+        if capacidade <= 0 or not 0 < taxa_falso_positivo < 1:
+            raise ValueError("Capacidade deve ser positiva e a taxa deve estar entre 0 e 1.")
+        bits = math.ceil(-capacidade * math.log(taxa_falso_positivo) / math.log(2) ** 2)
+        self.bits = max(64, bits + (-bits) % 64)
+        self.funcoes = max(1, round(self.bits / capacidade * math.log(2)))
+        if np is not None:
+            self._vetor = np.zeros(self.bits // 8, dtype=np.uint8)
+        else:
+            self._vetor = bytearray(self.bits // 8)
+
+    def _posicoes(self, valores):
+        if np is not None:
+            # Bits do float64 (com -0.0 igualado a 0.0) misturados pelo
+            # splitmix64, em hashing duplo: h1 + i * h2.
+            chaves = (np.asarray(valores, dtype=np.float64) + 0.0).view(np.uint64)
+            h1 = _splitmix64(chaves)
+            h2 = _splitmix64(chaves ^ np.uint64(0x9E3779B97F4A7C15)) | np.uint64(1)
+            i = np.arange(self.funcoes, dtype=np.uint64)[:, None]
+            return (h1 + i * h2) % np.uint64(self.bits)
+        posicoes = []
+        for valor in valores:
+            h1 = hash(valor)
+            h2 = hash((valor, 0x9E3779B9)) | 1
+            posicoes.append([(h1 + i * h2) % self.bits for i in range(self.funcoes)])
+        return posicoes
+
+    def contem(self, valores):
+        """
+        Lista (ou vetor) de booleanos: True onde o valor provavelmente já foi inserido.
+        """
+        posicoes = self._posicoes(valores)
+        if np is not None:
+            bits = (self._vetor[posicoes >> np.uint64(3)] >> (posicoes & np.uint64(7)).astype(np.uint8)) & 1
+            return bits.all(axis=0)
+        vetor = self._vetor
+        return [all(vetor[p >> 3] >> (p & 7) & 1 for p in lista) for lista in posicoes]
+
+    def adicionar(self, valores):
+        posicoes = self._posicoes(valores)
+        if np is not None:
+            posicoes = posicoes.ravel()
+            np.bitwise_or.at(self._vetor, (posicoes >> np.uint64(3)).astype(np.intp),
+                             (np.uint8(1) << (posicoes & np.uint64(7)).astype(np.uint8)))
+            return
+        for lista in posicoes:
+            for p in lista:
+                self._vetor[p >> 3] |= 1 << (p & 7)
+
+
+def _splitmix64(x):
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _unicos_e_repetidos(bloco):
+    if np is not None:
+        unicos, contagens = np.unique(bloco, return_counts=True)
+        return unicos, unicos[contagens > 1].tolist()
+    vistos, repetidos = set(), set()
+    for valor in bloco:
+        (repetidos if valor in vistos else vistos).add(valor)
+    return list(vistos), list(repetidos)
+
+
+def duplicados_fluxo(fonte, capacidade=100_000_000, taxa_falso_positivo=0.001,
+                     limite_exato=1_000_000, numeros_por_bloco=NUMEROS_POR_BLOCO):
+    """
+    Retorna (duplicados, exato): o conjunto de valores que aparecem mais de
+    uma vez e se o resultado é exato. Até limite_exato valores distintos a
+    contagem usa um set; acima disso passa para um FiltroBloom. Se a fonte
+    for um arquivo ou uma sequência, uma segunda passada elimina os falsos
+    positivos do filtro.
+    """
+    vistos = set()
+    filtro = None
+    candidatos = set()
+    confirmados = set()
+
+    for bloco in ler_numeros(fonte, numeros_por_bloco):
+        unicos, repetidos = _unicos_e_repetidos(bloco)
+        confirmados.update(repetidos)
+
+        if filtro is None:
+            for valor in (unicos.tolist() if np is not None else unicos):
+                if valor in vistos:
+                    confirmados.add(valor)
+                else:
+                    vistos.add(valor)
+            if len(vistos) > limite_exato:
+                filtro = FiltroBloom(capacidade, taxa_falso_positivo)
+                filtro.adicionar(list(vistos))
+                vistos = None
+            continue
+
+        ja_vistos = filtro.contem(unicos)
+        if np is not None:
+            candidatos.update(unicos[ja_vistos].tolist())
+        else:
+            candidatos.update(v for v, visto in zip(unicos, ja_vistos) if visto)
+        filtro.adicionar(unicos)
+
+    candidatos -= confirmados
+    if not candidatos:
+        return confirmados, True
+
+    relida = isinstance(fonte, (str, os.PathLike, Sequence)) or \
+        (np is not None and isinstance(fonte, np.ndarray))
+    if not relida:
+        return confirmados | candidatos, False
+
+    # Segunda passada: conta exatamente só os candidatos do filtro
+    ocorrencias = dict.fromkeys(candidatos, 0)
+    for bloco in ler_numeros(fonte, numeros_por_bloco):
+        valores = bloco[np.isin(bloco, list(candidatos))].tolist() if np is not None else bloco
+        for valor in valores:
+            if valor in ocorrencias:
+                ocorrencias[valor] += 1
+    confirmados.update(valor for valor, total in ocorrencias.items() if total > 1)
+    return confirmados, True
+
+
+def verificar_duplicidade_fluxo(fonte, **opcoes):
+    return bool(duplicados_fluxo(fonte, **opcoes)[0])
+
+
+def _ler_run(caminho, itens_por_leitura=1 << 16):
+    with open(caminho, "rb") as arquivo:
+        while True:
+            bloco = array("d")
+            try:
+                bloco.fromfile(arquivo, itens_por_leitura)
+            except EOFError:  # Último pedaço, menor que itens_por_leitura
+                pass
+            if not bloco:
+                return
+            yield from bloco
+
+
+def _intercalar(caminhos):
+    return heapq.merge(*(_ler_run(c) for c in caminhos), reverse=True)
+
+
+def _gravar_intercalados(caminhos, destino):
+    intercalados = _intercalar(caminhos)
+    with open(destino, "wb") as arquivo:
+        while pedaco := array("d", itertools.islice(intercalados, 1 << 16)):
+            pedaco.tofile(arquivo)
+
+
+def ordenados_decrescente_fluxo(fonte, numeros_por_bloco=NUMEROS_POR_BLOCO, diretorio=None,
+                                maximo_arquivos=MAXIMO_ARQUIVOS_ABERTOS):
+    """
+    Gera todos os números da fonte em ordem decrescente. Só um bloco fica na
+    memória de cada vez; os blocos ordenados vão para arquivos temporários,
+    e no máximo maximo_arquivos deles ficam abertos ao mesmo tempo.
+    """
+    with tempfile.TemporaryDirectory(dir=diretorio, prefix="decrescente_") as pasta:
+        caminhos = []
+        for indice, bloco in enumerate(ler_numeros(fonte, numeros_por_bloco)):
+            if np is not None:
+                ordenado = array("d", np.sort(bloco)[::-1].tobytes())
+            else:
+                ordenado = array("d", sorted(bloco, reverse=True))
+            caminho = os.path.join(pasta, f"run_{indice}.bin")
+            with open(caminho, "wb") as arquivo:
+                ordenado.tofile(arquivo)
+            caminhos.append(caminho)
+        caminhos = reduzir_runs(caminhos, pasta, maximo_arquivos, _gravar_intercalados, ".bin")
+        yield from _intercalar(caminhos)
+
+
+def exibir_numeros_ordenados_fluxo(fonte, saida=sys.stdout, **opcoes):
+    saida.write("Números em ordem decrescente: ")
+    for numero in ordenados_decrescente_fluxo(fonte, **opcoes):
+        saida.write(f"{numero} ")
+    saida.write("\n")
+
+
+def benchmark(quantidade=2_000_000, k=10):
+    sorteio = random.Random(17)
+    numeros = [float(sorteio.randrange(10 ** 9)) for _ in range(quantidade)]
+
+    t0 = time.perf_counter()
+    maior = maior_valor(numeros)
+    duplicado = verificar_duplicidade(numeros)
+    ordenados = sorted(numeros, reverse=True)
+    tempo_original = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    resumo = resumo_fluxo(numeros, k, numeros_por_bloco=quantidade // 8)
+    tempo_resumo = time.perf_counter() - t0
+    assert resumo == (maior, min(numeros), ordenados[:k])
+
+    t0 = time.perf_counter()
+    duplicados, exato = duplicados_fluxo(numeros, capacidade=quantidade, limite_exato=quantidade // 4,
+                                         numeros_por_bloco=quantidade // 8)
+    tempo_duplicados = time.perf_counter() - t0
+    assert exato and bool(duplicados) == duplicado
+    repetidos = {v for i, v in enumerate(ordenados[1:]) if v == ordenados[i]}
+    assert duplicados == repetidos
+
+    t0 = time.perf_counter()
+    for esperado, valor in zip(ordenados, ordenados_decrescente_fluxo(numeros, quantidade // 8)):
+        assert esperado == valor
+    tempo_ordenacao = time.perf_counter() - t0
+
+    motor = "NumPy" if np is not None else "Python puro"
+    print(f"{quantidade} números ({motor})")
+    print(f"Original (maior, set e sorted, tudo em memória): {tempo_original:.2f} s")
+    print(f"Maior, menor e {k} maiores em uma passada: {tempo_resumo:.2f} s")
+    print(f"Duplicidade com filtro de Bloom e confirmação: {tempo_duplicados:.2f} s "
+          f"({len(duplicados)} valores repetidos)")
+    print(f"Ordem decrescente por arquivos temporários: {tempo_ordenacao:.2f} s")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,207 @@
+"""
+18.1 Contagem de letras maiúsculas e minúsculas em arquivos grandes
+
+Evolução do desafio 18 para corpora de logs com vários GB. A função
+    contar_maiusculas_minusculas chama isalpha(), isupper() e islower()
+    para cada caractere em um laço Python, o que fica em poucos MB/s.
+
+Requisitos:
+- Processar arquivos em blocos, retornando exatamente as mesmas contagens
+    de contar_maiusculas_minusculas.
+- As letras ASCII são contadas direto nos bytes: bytes.translate apaga as
+    letras de uma classe e a diferença de tamanho é a contagem.
+- Em UTF-8 um byte ASCII nunca faz parte de um caractere de vários bytes.
+    Então, nos blocos com outros caracteres, os bytes ASCII são apagados e
+    só o que sobra é decodificado (sem cortar caracteres entre blocos) e
+    classificado por uma tabela de str.translate que guarda a classe de cada
+    caractere já visto.
+- Dividir o arquivo entre vários processos.
+- Exibir um benchmark em MB/s.
+"""
+
+import codecs
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from desafio18 import contar_maiusculas_minusculas
+
+TAMANHO_BLOCO = 1 << 22
+
+_ASCII_MAIUSCULAS = bytes(range(ord("A"), ord("Z") + 1))
+_ASCII_MINUSCULAS = bytes(range(ord("a"), ord("z") + 1))
+_ASCII_TODOS = bytes(range(128))
+
+
+class _TabelaClasses(dict):
+    # Para str.translate: maiúscula vira "M", minúscula vira "m" e o resto é
+    # apagado, seguindo as mesmas regras de contar_maiusculas_minusculas.
+    def __missing__(self, codigo):
+        caractere = chr(codigo)
+        if caractere.isalpha() and caractere.isupper():
+            valor = "M"
+        elif caractere.isalpha() and caractere.islower():
+            valor = "m"
+        else:
+            valor = None
+        self[codigo] = valor
+        return valor
+
+
+TABELA_CLASSES = _TabelaClasses()
+
+
+def contar_bytes_ascii(dados):
+    """
+    Conta as letras ASCII (A-Z e a-z) de um bloco de bytes.
+    """
+    tamanho = len(dados)
+    maiusculas = tamanho - len(dados.translate(None, _ASCII_MAIUSCULAS))
+    minusculas = tamanho - len(dados.translate(None, _ASCII_MINUSCULAS))
+    return maiusculas, minusculas
+
+
+def contar_bytes_utf8(dados, decodificador=None, erros="strict"):
+    """
+    Contagem para um bloco de bytes em UTF-8. Com um decodificador
+    incremental, o bloco pode terminar no meio de um caractere.
+    """
+    maiusculas, minusculas = contar_bytes_ascii(dados)
+    if not dados.isascii():
+        resto = dados.translate(None, _ASCII_TODOS)
+        texto = decodificador.decode(resto) if decodificador else resto.decode("utf-8", erros)
+        classes = texto.translate(TABELA_CLASSES)
+        maiusculas += classes.count("M")
+        minusculas += classes.count("m")
+    return maiusculas, minusculas
+
+
+def contar_texto(texto):
+    """
+    Mesmo resultado de contar_maiusculas_minusculas, para qualquer str.
+    """
+    # surrogatepass deixa passar surrogates soltos, que não são letras
+    return contar_bytes_utf8(texto.encode("utf-8", "surrogatepass"), erros="surrogatepass")
+
+
+def _contar_intervalo(caminho, inicio, fim, tamanho_bloco, erros):
+    """
+    Conta os bytes [inicio, fim) do arquivo. Os limites precisam cair no
+    começo de um caractere UTF-8.
+    """
+    # O validador só confere se o arquivo é UTF-8 válido (como faria a
+    # leitura em modo texto); a contagem usa outro decodificador.
+    validador = codecs.getincrementaldecoder("utf-8")("strict") if erros == "strict" else None
+    decodificador = codecs.getincrementaldecoder("utf-8")(erros)
+    maiusculas = minusculas = 0
+    with open(caminho, "rb") as arquivo:
+        arquivo.seek(inicio)
+        restante = fim - inicio
+        while restante > 0:
+            dados = arquivo.read(min(tamanho_bloco, restante))
+            if not dados:
+                break
+            restante -= len(dados)
+            if validador is not None and not dados.isascii():
+                validador.decode(dados)
+            m, n = contar_bytes_utf8(dados, decodificador)
+            maiusculas += m
+            minusculas += n
+    if validador is not None:
+        validador.decode(b"", final=True)
+    decodificador.decode(b"", final=True)
+    return maiusculas, minusculas
+
+
+def _intervalos(caminho, partes):
+    """
+    Divide o arquivo em partes de tamanho parecido, movendo cada corte para
+    frente até o início de um caractere UTF-8.
+    """
+    tamanho = os.path.getsize(caminho)
+    cortes = [0]
+    with open(caminho, "rb") as arquivo:
+        for i in range(1, partes):
+            corte = max(tamanho * i // partes, cortes[-1])
+            arquivo.seek(corte)
+            proximos = arquivo.read(4)
+            deslocamento = 0
+            while deslocamento < len(proximos) and (proximos[deslocamento] & 0xC0) == 0x80:
+                deslocamento += 1
+            cortes.append(min(corte + deslocamento, tamanho))
+    cortes.append(tamanho)
+    return [(a, b) for a, b in zip(cortes, cortes[1:]) if b > a]
+
+
+def contar_em_arquivo(caminho, processos=1, tamanho_bloco=TAMANHO_BLOCO, erros="strict"):
+    """
+    Retorna (maiusculas, minusculas) do arquivo UTF-8 inteiro. Com
+    processos > 1 o arquivo é dividido em faixas contadas em paralelo.
+    """
+    if processos <= 1:
+        return _contar_intervalo(caminho, 0, os.path.getsize(caminho), tamanho_bloco, erros)
+
+    intervalos = _intervalos(caminho, processos * 4)
+    maiusculas = minusculas = 0
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = [executor.submit(_contar_intervalo, caminho, a, b, tamanho_bloco, erros)
+                   for a, b in intervalos]
+        for futuro in futuros:
+            m, n = futuro.result()
+            maiusculas += m
+            minusculas += n
+    return maiusculas, minusculas
+
+
+def _gerar_texto(megabytes, proporcao_acentos, sorteio):
+    palavras = ["Olá", "MUNDO", "ação", "Python", "LOG", "erro:", "São", "Paulo", "123", "ÉPOCA",
+                "ǅungla", "ßtraße", "İstanbul", "Ωmega", "ﬁm"]
+    ascii_apenas = ["INFO", "request", "id=42", "Status", "OK", "GET", "/index.html", "200"]
+    linhas = []
+    tamanho = 0
+    while tamanho < megabytes * 1_000_000:
+        fonte = palavras if sorteio.random() < proporcao_acentos else ascii_apenas
+        linha = " ".join(sorteio.choice(fonte) for _ in range(12)) + "\n"
+        linhas.append(linha)
+        tamanho += len(linha)
+    return "".join(linhas)
+
+
+def benchmark(megabytes=50):
+    sorteio = random.Random(18)
+    texto = _gerar_texto(megabytes, 0.05, sorteio)
+    tamanho_mb = len(texto.encode("utf-8")) / 1e6
+
+    amostra = texto[: len(texto) // 10]
+    t0 = time.perf_counter()
+    esperado_amostra = contar_maiusculas_minusculas(amostra)
+    tempo_original = time.perf_counter() - t0
+    assert contar_texto(amostra) == esperado_amostra
+    velocidade_original = len(amostra.encode("utf-8")) / 1e6 / tempo_original
+    esperado = contar_maiusculas_minusculas(texto)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "log.txt")
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+
+        print(f"Arquivo de {tamanho_mb:.0f} MB com {esperado[0]} maiúsculas e {esperado[1]} minúsculas")
+        print(f"contar_maiusculas_minusculas: {velocidade_original:.1f} MB/s")
+        for processos in (1, max(2, os.cpu_count() or 1)):
+            t0 = time.perf_counter()
+            resultado = contar_em_arquivo(caminho, processos=processos, tamanho_bloco=1 << 16)
+            tempo = time.perf_counter() - t0
+            assert resultado == esperado
+            print(f"contar_em_arquivo com {processos} processo(s): {tamanho_mb / tempo:.1f} MB/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and os.path.isfile(sys.argv[1]):
+        maiusculas, minusculas = contar_em_arquivo(sys.argv[1], processos=os.cpu_count() or 1)
+        print(f"Número de letras maiúsculas: {maiusculas}")
+        print(f"Número de letras minúsculas: {minusculas}")
+    else:
+        benchmark(*map(int, sys.argv[1:]))
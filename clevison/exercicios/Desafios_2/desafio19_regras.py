@@ -0,0 +1,186 @@
+"""
+19.1 Validação de endereços de sites em lote
+
+Evolução do desafio 19 para os arquivos da fila do crawler, com dezenas de
+    milhões de hostnames. validar_endereco só conhece o prefixo 'www.' e o
+    sufixo '.com.br', e cada regra nova viraria mais um startswith/endswith
+    encadeado.
+
+Requisitos:
+- Aceitar vários prefixos permitidos e vários sufixos públicos. Sem
+    argumentos, as regras são as de validar_endereco.
+- Os sufixos ficam em uma trie de rótulos invertidos ('br' -> 'com'), então
+    o custo depende do número de rótulos do endereço e não do número de
+    sufixos cadastrados.
+- Validar um arquivo (um endereço por linha) ou qualquer iterável sob
+    demanda, informando a quantidade de válidos e inválidos e as linhas por
+    segundo.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from desafio19 import validar_endereco
+
+_FIM = ""  # Chave que marca, em um nó da trie, o fim de um sufixo
+
+
+class RegrasEndereco:
+    def __init__(self, prefixos=("www.",), sufixos=(".com.br",)):
+        """
+        Um endereço é válido se começa com um dos prefixos e termina com um
+        dos sufixos. Os sufixos são comparados por rótulos inteiros: '.com.br'
+        e 'com.br' são o mesmo sufixo e exigem pelo menos um rótulo antes.
+        """
+        self.prefixos = tuple(prefixos)
+        self.sufixos = tuple(sufixos)
+        if not self.prefixos or not self.sufixos:
+            raise ValueError("Informe pelo menos um prefixo e um sufixo.")
+
+        # Prefixos terminados em ponto são rótulos inteiros ('www.', 'm.') e
+        # são conferidos com um set; os outros usam startswith.
+        rotulo_inteiro = [p.endswith(".") and p.count(".") == 1 for p in self.prefixos]
+        self._rotulos_prefixo = {p[:-1] for p, inteiro in zip(self.prefixos, rotulo_inteiro) if inteiro}
+        self._outros_prefixos = tuple(p for p, inteiro in zip(self.prefixos, rotulo_inteiro) if not inteiro)
+
+        self._trie = {}
+        for sufixo in self.sufixos:
+            rotulos = sufixo.strip(".").split(".")
+            if not all(rotulos):
+                raise ValueError(f"Sufixo inválido: {sufixo!r}")
+            no = self._trie
+            for rotulo in reversed(rotulos):
+                no = no.setdefault(rotulo, {})
+            no[_FIM] = True
+
+    def _tem_prefixo(self, endereco):
+        rotulo, ponto, _ = endereco.partition(".")
+        if ponto and rotulo in self._rotulos_prefixo:
+            return True
+        return bool(self._outros_prefixos) and endereco.startswith(self._outros_prefixos)
+
+    def _tem_sufixo(self, endereco):
+        # Anda na trie do último rótulo para o primeiro; o sufixo só vale se
+        # ainda sobrar um ponto (e o que vem antes dele) no endereço.
+        no = self._trie
+        resto = endereco
+        while True:
+            resto, ponto, rotulo = resto.rpartition(".")
+            if not ponto:
+                return False
+            no = no.get(rotulo)
+            if no is None:
+                return False
+            if _FIM in no:
+                return True
+
+    def validar(self, endereco):
+        return self._tem_prefixo(endereco) and self._tem_sufixo(endereco)
+
+    __call__ = validar
+
+
+REGRAS_PADRAO = RegrasEndereco()
+
+
+def _linhas(fonte):
+    if isinstance(fonte, (str, os.PathLike)):
+        with open(fonte, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                yield linha.rstrip("\r\n")
+    else:
+        yield from fonte
+
+
+def validar_enderecos(fonte, regras=REGRAS_PADRAO):
+    """
+    Gera (endereco, valido) para cada endereço de fonte, que pode ser o
+    caminho de um arquivo com um endereço por linha ou um iterável.
+    Linhas vazias são ignoradas.
+    """
+    validar = regras.validar
+    for endereco in _linhas(fonte):
+        if endereco:
+            yield endereco, validar(endereco)
+
+
+def resumo_validacao(fonte, regras=REGRAS_PADRAO, saida_validos=None):
+    """
+    Valida toda a fonte e retorna um relatório com as contagens e a
+    velocidade. Se saida_validos for um caminho, os endereços válidos são
+    gravados nele.
+    """
+    t0 = time.perf_counter()
+    validos = invalidos = 0
+    arquivo_saida = open(saida_validos, "w", encoding="utf-8") if saida_validos else None
+    try:
+        for endereco, valido in validar_enderecos(fonte, regras):
+            if valido:
+                validos += 1
+                if arquivo_saida:
+                    arquivo_saida.write(endereco + "\n")
+            else:
+                invalidos += 1
+    finally:
+        if arquivo_saida:
+            arquivo_saida.close()
+    segundos = time.perf_counter() - t0
+    total = validos + invalidos
+    return {
+        "validos": validos,
+        "invalidos": invalidos,
+        "segundos": segundos,
+        "linhas_por_segundo": total / segundos if segundos else float("inf"),
+    }
+
+
+def _gerar_enderecos(quantidade, sufixos, semente=19):
+    sorteio = random.Random(semente)
+    prefixos = ["www.", "www2.", "m.", "api.", "", "wwwx."]
+    nomes = ["loja", "noticias", "banco", "blog", "portal", "shop", "com", "br"]
+    return [sorteio.choice(prefixos) + sorteio.choice(nomes) + str(sorteio.randrange(1000))
+            + sorteio.choice(sufixos) for _ in range(quantidade)]
+
+
+def benchmark(quantidade=2_000_000):
+    sufixos_teste = [".com.br", ".com", ".br", ".gov.br", "com.br", ".net", ".br.com", ""]
+    enderecos = _gerar_enderecos(quantidade, sufixos_teste)
+    enderecos += ["www.com.br", "www..com.br", "www.", ".com.br", "www.x.com.br", "wwwcom.br"]
+
+    # As regras padrão precisam concordar com validar_endereco
+    t0 = time.perf_counter()
+    esperado = [validar_endereco(e) for e in enderecos]
+    tempo_original = time.perf_counter() - t0
+    assert [valido for _, valido in validar_enderecos(enderecos)] == esperado
+
+    # Muitos sufixos: endswith encadeado contra a trie
+    sufixos = [".com.br", ".gov.br", ".org.br", ".net"] + [f".cidade{i}.br" for i in range(2000)]
+    prefixos = ["www.", "www2.", "m."]
+    regras = RegrasEndereco(prefixos, sufixos)
+    amostra = enderecos[:100_000]
+    t0 = time.perf_counter()
+    esperado = [any(e.startswith(p) for p in prefixos) and any(e.endswith(s) for s in sufixos)
+                for e in amostra]
+    tempo_encadeado = time.perf_counter() - t0
+    assert [regras.validar(e) for e in amostra] == esperado
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "fila.txt")
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.writelines(e + "\n" for e in enderecos)
+        relatorio = resumo_validacao(caminho, regras, os.path.join(pasta, "validos.txt"))
+
+    print(f"validar_endereco original (1 regra): {len(enderecos) / tempo_original:,.0f} linhas/s")
+    print(f"{len(sufixos)} sufixos com endswith encadeado: {len(amostra) / tempo_encadeado:,.0f} linhas/s")
+    print(f"{len(sufixos)} sufixos com trie, lendo arquivo: {relatorio['validos']} válidos, "
+          f"{relatorio['invalidos']} inválidos, {relatorio['linhas_por_segundo']:,.0f} linhas/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        print(resumo_validacao(sys.argv[1]))
+    else:
+        benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,221 @@
+"""
+21.1 Contagem de dias da semana em um dia do mês, em lote
+
+Evolução do desafio 21: em vez de percorrer o intervalo dia a dia com
+    timedelta(days=1), a contagem usa o ciclo de 400 anos do calendário
+    gregoriano (4800 meses, 146097 dias, múltiplo exato de 7 semanas) e uma
+    tabela pré-calculada de somas acumuladas por mês.
+
+Requisitos:
+- Contar quantas vezes o dia da semana W (0 = segunda-feira) cai no dia D
+    do mês entre duas datas, inclusive, com o mesmo resultado de
+    contar_segundas_feiras para W = 0 e D = 1.
+- Responder cada consulta em O(1), independentemente do tamanho do intervalo.
+- Oferecer uma função em lote que receba vetores NumPy datetime64 de início
+    e de fim e responda milhões de intervalos de forma vetorizada.
+- Exibir um benchmark comparando com a versão dia a dia.
+"""
+
+import calendar
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # O modo em lote é opcional
+    np = None
+
+from desafio21 import contar_segundas_feiras
+
+# O ciclo começa em janeiro de 1970 para coincidir com a época do NumPy.
+# Qualquer mês serviria: o padrão de dias da semana se repete a cada 4800 meses.
+ANO_BASE = 1970
+MESES_NO_CICLO = 4800
+
+
+@lru_cache(maxsize=None)
+def _tabela_acumulada(dia_semana, dia_mes):
+    """
+    Retorna uma tupla com 4801 posições onde a posição i guarda quantos
+    dos primeiros i meses do ciclo têm o dia dia_mes caindo em dia_semana.
+    """
+    acumulado = [0]
+    total = 0
+    for indice in range(MESES_NO_CICLO):
+        ano = ANO_BASE + indice // 12
+        mes = indice % 12 + 1
+        primeiro_dia, dias_no_mes = calendar.monthrange(ano, mes)
+        if dia_mes <= dias_no_mes and (primeiro_dia + dia_mes - 1) % 7 == dia_semana:
+            total += 1
+        acumulado.append(total)
+    return tuple(acumulado)
+
+
+@lru_cache(maxsize=None)
+def _tabela_numpy(dia_semana, dia_mes):
+    return np.array(_tabela_acumulada(dia_semana, dia_mes), dtype=np.int64)
+
+
+def _validar_parametros(dia_semana, dia_mes):
+    if not 0 <= dia_semana <= 6:
+        raise ValueError("O dia da semana deve estar entre 0 (segunda) e 6 (domingo).")
+    if not 1 <= dia_mes <= 31:
+        raise ValueError("O dia do mês deve estar entre 1 e 31.")
+
+
+def _contar_meses_antes(indice_mes, tabela):
+    """
+    Conta as ocorrências nos meses anteriores a indice_mes (contado a partir
+    de janeiro de ANO_BASE, podendo ser negativo).
+    """
+    ciclos, posicao = divmod(indice_mes, MESES_NO_CICLO)
+    return ciclos * tabela[-1] + tabela[posicao]
+
+
+def _ultimo_dia(data_inicio, data_fim):
+    """
+    Último dia alcançado ao somar dias inteiros a data_inicio sem passar de
+    data_fim, exatamente como o laço do desafio 21 faz com datetimes.
+    """
+    if isinstance(data_inicio, datetime):
+        meia_noite = datetime.combine(data_inicio.date(), datetime.min.time(), data_inicio.tzinfo)
+        data_fim = data_fim - (data_inicio - meia_noite)
+    if isinstance(data_fim, datetime):
+        return data_fim.date()
+    return data_fim
+
+
+def _dia(data):
+    return data.date() if isinstance(data, datetime) else data
+
+
+def contar_dia_semana_no_dia(data_inicio, data_fim, dia_semana=0, dia_mes=1):
+    """
+    Conta quantas vezes o dia dia_mes de algum mês cai em dia_semana
+    (0 = segunda-feira) entre data_inicio e data_fim, inclusive.
+    """
+    _validar_parametros(dia_semana, dia_mes)
+    inicio = _dia(data_inicio)
+    fim = _ultimo_dia(data_inicio, data_fim)
+
+    if inicio > fim:
+        return 0
+
+    # Primeiro mês cujo dia dia_mes ainda está dentro do intervalo
+    primeiro_mes = (inicio.year - ANO_BASE) * 12 + inicio.month - 1
+    if inicio.day > dia_mes:
+        primeiro_mes += 1
+
+    # Mês seguinte ao último cujo dia dia_mes está dentro do intervalo
+    fim_meses = (fim.year - ANO_BASE) * 12 + fim.month
+    if fim.day < dia_mes:
+        fim_meses -= 1
+
+    if fim_meses <= primeiro_mes:
+        return 0
+
+    tabela = _tabela_acumulada(dia_semana, dia_mes)
+    return _contar_meses_antes(fim_meses, tabela) - _contar_meses_antes(primeiro_mes, tabela)
+
+
+def contar_segundas_feiras_rapido(data_inicio, data_fim):
+    return contar_dia_semana_no_dia(data_inicio, data_fim, 0, 1)
+
+
+def contar_dia_semana_no_dia_lote(inicios, fins, dia_semana=0, dia_mes=1):
+    """
+    Versão vetorizada: recebe vetores datetime64 (de qualquer unidade) com os
+    inícios e os fins dos intervalos e devolve um vetor int64 com as contagens.
+    """
+    if np is None:
+        raise ImportError("O modo em lote precisa do NumPy instalado.")
+    _validar_parametros(dia_semana, dia_mes)
+
+    inicios = np.asarray(inicios, dtype="datetime64")
+    fins = np.asarray(fins, dtype="datetime64")
+
+    # Mesma regra de _ultimo_dia: desconta do fim o horário do início
+    dias_inicio = inicios.astype("datetime64[D]")
+    dias_fim = (fins - (inicios - dias_inicio)).astype("datetime64[D]")
+
+    meses_inicio = dias_inicio.astype("datetime64[M]")
+    meses_fim = dias_fim.astype("datetime64[M]")
+    dia_do_inicio = (dias_inicio - meses_inicio).astype(np.int64) + 1
+    dia_do_fim = (dias_fim - meses_fim).astype(np.int64) + 1
+
+    # datetime64[M] já conta meses a partir de janeiro de 1970 (ANO_BASE)
+    primeiro_mes = meses_inicio.astype(np.int64) + (dia_do_inicio > dia_mes)
+    fim_meses = meses_fim.astype(np.int64) + 1 - (dia_do_fim < dia_mes)
+
+    tabela = _tabela_numpy(dia_semana, dia_mes)
+
+    def contar_antes(indices):
+        ciclos, posicoes = np.divmod(indices, MESES_NO_CICLO)
+        return ciclos * tabela[-1] + tabela[posicoes]
+
+    contagens = contar_antes(fim_meses) - contar_antes(primeiro_mes)
+    return np.where((fim_meses > primeiro_mes) & (dias_inicio <= dias_fim), contagens, 0)
+
+
+def _datas_aleatorias(quantidade, sorteio):
+    datas = []
+    for _ in range(quantidade):
+        inicio = date(1600, 1, 1) + timedelta(days=sorteio.randrange(300_000))
+        fim = inicio + timedelta(days=sorteio.randrange(-30, 20_000))
+        datas.append((datetime.combine(inicio, datetime.min.time()),
+                      datetime.combine(fim, datetime.min.time())))
+    return datas
+
+
+def benchmark(consultas=200, consultas_lote=1_000_000):
+    sorteio = random.Random(21)
+    intervalos = _datas_aleatorias(consultas, sorteio)
+
+    for inicio, fim in intervalos:
+        assert contar_segundas_feiras_rapido(inicio, fim) == contar_segundas_feiras(inicio, fim)
+
+    inicio_400 = datetime(1800, 1, 1)
+    fim_400 = datetime(2199, 12, 31)
+
+    t0 = time.perf_counter()
+    esperado = contar_segundas_feiras(inicio_400, fim_400)
+    tempo_original = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    repeticoes = 10_000
+    for _ in range(repeticoes):
+        resultado = contar_segundas_feiras_rapido(inicio_400, fim_400)
+    tempo_rapido = (time.perf_counter() - t0) / repeticoes
+
+    assert resultado == esperado
+    print(f"Intervalo de 400 anos: {esperado} segundas-feiras no dia 1º")
+    print(f"Versão dia a dia: {tempo_original * 1e3:.2f} ms por consulta")
+    print(f"Versão com ciclo de 400 anos: {tempo_rapido * 1e6:.2f} µs por consulta")
+    print(f"Ganho: {tempo_original / tempo_rapido:.0f}x")
+
+    if np is None:
+        print("NumPy não instalado: benchmark do modo em lote ignorado.")
+        return
+
+    inicios = np.array([i for i, _ in intervalos], dtype="datetime64[D]")
+    fins = np.array([f for _, f in intervalos], dtype="datetime64[D]")
+    lote = contar_dia_semana_no_dia_lote(inicios, fins)
+    assert lote.tolist() == [contar_segundas_feiras(i, f) for i, f in intervalos]
+
+    rng = np.random.default_rng(21)
+    base = np.datetime64("1600-01-01")
+    inicios = base + rng.integers(0, 300_000, consultas_lote).astype("timedelta64[D]")
+    fins = inicios + rng.integers(0, 146_097, consultas_lote).astype("timedelta64[D]")
+
+    t0 = time.perf_counter()
+    contar_dia_semana_no_dia_lote(inicios, fins)
+    tempo_lote = time.perf_counter() - t0
+    print(f"Modo em lote: {consultas_lote} intervalos em {tempo_lote:.3f} s "
+          f"({consultas_lote / tempo_lote:,.0f} intervalos/s)")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:]))
@@ -25,24 +25,25 @@ def organizar_por_ano(carros):
     return sorted(carros, key=lambda carro: carro['ano_fabricacao'])
 
 
-carros = [
-    {"modelo": "Civic", "ano_fabricacao": 2010},
-    {"modelo": "Continental GT", "ano_fabricacao": 2022},
-    {"modelo": "SW4", "ano_fabricacao": 2023},
-    {"modelo": "Corolla", "ano_fabricacao": 2024},
-    {"modelo": "Fusca", "ano_fabricacao": 1980}
-]
+if __name__ == "__main__":
+    carros = [
+        {"modelo": "Civic", "ano_fabricacao": 2010},
+        {"modelo": "Continental GT", "ano_fabricacao": 2022},
+        {"modelo": "SW4", "ano_fabricacao": 2023},
+        {"modelo": "Corolla", "ano_fabricacao": 2024},
+        {"modelo": "Fusca", "ano_fabricacao": 1980}
+    ]
 
-print("Lista original de carros: ")
+    print("Lista original de carros: ")
 
-for carro in carros:
+    for carro in carros:
 
-    print(carro)
+        print(carro)
 
-carros_organizados = organizar_por_ano(carros)
+    carros_organizados = organizar_por_ano(carros)
 
-print("\nLista de carros organizada por ano de fabricação: ")
+    print("\nLista de carros organizada por ano de fabricação: ")
 
-for carro in carros_organizados:
+    for carro in carros_organizados:
 
-    print(carro)
+        print(carro)
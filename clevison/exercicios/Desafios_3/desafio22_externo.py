@@ -0,0 +1,230 @@
+"""
+22.1 Reorganização de carros por ano com ordenação externa
+
+Evolução do desafio 22 para exportações do cadastro de veículos com dezenas
+    de GB em JSONL (um carro por linha), que não cabem na memória.
+
+Requisitos:
+- Ler os registros sob demanda, ordenar blocos (runs) de tamanho limitado
+    e gravar cada bloco ordenado em um arquivo temporário.
+- Intercalar os blocos com heapq.merge, mantendo a ordenação estável de
+    organizar_por_ano (carros do mesmo ano continuam na ordem de entrada)
+    e sem modificar a entrada.
+- Aceitar chaves secundárias e ordem decrescente.
+- Permitir ordenar os blocos em paralelo com um pool de processos.
+- Informar o pico de memória do processo.
+"""
+
+import heapq
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+
+try:
+    import resource
+except ImportError:  # Não existe no Windows
+    resource = None
+
+try:
+    from utilitarios import lotes, reduzir_runs, resultados_em_ordem
+except ImportError:  # Executado da própria pasta: a raiz do repositório não está no caminho
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), *[os.pardir] * 3))
+    from utilitarios import lotes, reduzir_runs, resultados_em_ordem
+
+from desafio22 import organizar_por_ano
+
+REGISTROS_POR_RUN = 100_000
+MAXIMO_ARQUIVOS_ABERTOS = 256
+
+
+def pico_memoria_mb():
+    """
+    Maior uso de memória residente do processo até agora, em MB.
+    """
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB e macOS em bytes
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def ler_jsonl(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield json.loads(linha)
+
+
+def _gravar_jsonl(registros, caminho):
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.writelines(json.dumps(registro, ensure_ascii=False) + "\n" for registro in registros)
+
+
+def _preparar(lote):
+    """
+    Transforma o lote em pares (registro, linha JSON). Linhas lidas de um
+    arquivo são mantidas como estão, então cada registro é convertido para
+    JSON no máximo uma vez.
+    """
+    if isinstance(lote[0], str):
+        return [(json.loads(linha), linha if linha.endswith("\n") else linha + "\n")
+                for linha in lote if linha.strip()]
+    return [(registro, json.dumps(registro, ensure_ascii=False) + "\n") for registro in lote]
+
+
+def _ordenar_run(lote, chaves, decrescente, caminho):
+    # Roda no processo que vai ordenar o bloco, inclusive a conversão do JSON
+    chave = itemgetter(*chaves)
+    pares = _preparar(lote)
+    pares.sort(key=lambda par: chave(par[0]), reverse=decrescente)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.writelines(linha for _, linha in pares)
+    return caminho
+
+
+def _ler_run(caminho, chave):
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            registro = json.loads(linha)
+            yield chave(registro), registro, linha
+
+
+def _intercalar(caminhos, chaves, decrescente):
+    # Itens (chave, registro, linha). heapq.merge desempata pela posição do
+    # arquivo na lista, então com os blocos na ordem de entrada a ordenação
+    # continua estável.
+    chave = itemgetter(*chaves)
+    return heapq.merge(*(_ler_run(c, chave) for c in caminhos), key=itemgetter(0), reverse=decrescente)
+
+
+def _gravar_intercalados(caminhos, destino, chaves, decrescente):
+    with open(destino, "w", encoding="utf-8") as arquivo:
+        arquivo.writelines(linha for _, _, linha in _intercalar(caminhos, chaves, decrescente))
+
+
+def _ordenar_externo(carros, chaves=("ano_fabricacao",), decrescente=False,
+                     registros_por_run=REGISTROS_POR_RUN, processos=1,
+                     diretorio=None, maximo_arquivos=MAXIMO_ARQUIVOS_ABERTOS):
+    # Gera pares (registro, linha JSON) já ordenados
+    chaves = tuple(chaves)
+    if not chaves:
+        raise ValueError("Informe pelo menos uma chave de ordenação.")
+
+    blocos = lotes(carros, registros_por_run)
+    primeiro = next(blocos, None)
+    if primeiro is None:
+        return
+    segundo = next(blocos, None)
+
+    if segundo is None:
+        # Tudo coube em um bloco: não precisa de arquivos temporários
+        chave = itemgetter(*chaves)
+        yield from sorted(_preparar(primeiro), key=lambda par: chave(par[0]), reverse=decrescente)
+        return
+
+    with tempfile.TemporaryDirectory(dir=diretorio, prefix="ordenacao_") as pasta:
+        chamadas = ((lote, chaves, decrescente, os.path.join(pasta, f"run_{indice}.jsonl"))
+                    for indice, lote in enumerate(itertools.chain([primeiro, segundo], blocos)))
+
+        if processos <= 1:
+            caminhos = [_ordenar_run(*argumentos) for argumentos in chamadas]
+        else:
+            with ProcessPoolExecutor(max_workers=processos) as executor:
+                # Limita os blocos em trânsito para a memória continuar limitada
+                caminhos = list(resultados_em_ordem(executor, _ordenar_run, chamadas, 2 * processos))
+
+        gravar = partial(_gravar_intercalados, chaves=chaves, decrescente=decrescente)
+        caminhos = reduzir_runs(caminhos, pasta, maximo_arquivos, gravar, ".jsonl")
+        for _, registro, linha in _intercalar(caminhos, chaves, decrescente):
+            yield registro, linha
+
+
+def organizar_por_ano_externo(carros, chaves=("ano_fabricacao",), decrescente=False,
+                              registros_por_run=REGISTROS_POR_RUN, processos=1,
+                              diretorio=None, maximo_arquivos=MAXIMO_ARQUIVOS_ABERTOS):
+    """
+    Gera os registros de carros (um iterável de dicionários, ou de linhas
+    JSON) ordenados pelas chaves, em ordem estável. No máximo
+    registros_por_run registros por processo ficam na memória ao mesmo tempo.
+    """
+    pares = _ordenar_externo(carros, chaves, decrescente, registros_por_run,
+                             processos, diretorio, maximo_arquivos)
+    for registro, _ in pares:
+        yield registro
+
+
+def ordenar_arquivo_jsonl(entrada, saida, **opcoes):
+    """
+    Ordena o arquivo JSONL entrada e grava o resultado em saida. Retorna um
+    relatório com a quantidade de registros, o tempo e o pico de memória.
+    """
+    t0 = time.perf_counter()
+    total = 0
+    with open(entrada, encoding="utf-8") as arquivo_entrada, \
+            open(saida, "w", encoding="utf-8") as arquivo_saida:
+        for lote in lotes(_ordenar_externo(arquivo_entrada, **opcoes), 10_000):
+            arquivo_saida.writelines(linha for _, linha in lote)
+            total += len(lote)
+    return {
+        "registros": total,
+        "segundos": time.perf_counter() - t0,
+        "pico_memoria_mb": pico_memoria_mb(),
+    }
+
+
+def _gerar_carros(quantidade, semente=22):
+    sorteio = random.Random(semente)
+    modelos = ["Civic", "Continental GT", "SW4", "Corolla", "Fusca", "Gol", "Onix", "HB20"]
+    for i in range(quantidade):
+        yield {"id": i, "modelo": sorteio.choice(modelos), "ano_fabricacao": sorteio.randint(1970, 2025)}
+
+
+def benchmark(quantidade=300_000):
+    # Primeiro o arquivo, gerado sob demanda, para o pico de memória medir só
+    # a ordenação externa.
+    with tempfile.TemporaryDirectory() as pasta:
+        entrada = os.path.join(pasta, "carros.jsonl")
+        saida = os.path.join(pasta, "ordenados.jsonl")
+        _gravar_jsonl(_gerar_carros(quantidade), entrada)
+        megabytes = os.path.getsize(entrada) / 1e6
+
+        for processos in (1, max(2, os.cpu_count() or 1)):
+            relatorio = ordenar_arquivo_jsonl(entrada, saida, registros_por_run=quantidade // 20,
+                                              processos=processos)
+            print(f"{relatorio['registros']} registros ({megabytes:.0f} MB) com {processos} "
+                  f"processo(s): {relatorio['segundos']:.2f} s, "
+                  f"pico de memória {relatorio['pico_memoria_mb']} MB")
+        anos = [c["ano_fabricacao"] for c in ler_jsonl(saida)]
+        assert anos == sorted(anos)
+
+    carros = list(_gerar_carros(quantidade))
+    copia = [dict(carro) for carro in carros]
+
+    t0 = time.perf_counter()
+    esperado = organizar_por_ano(carros)
+    tempo_memoria = time.perf_counter() - t0
+    print(f"organizar_por_ano em memória: {tempo_memoria:.2f} s, "
+          f"pico de memória {pico_memoria_mb()} MB")
+
+    externo = list(organizar_por_ano_externo(carros, registros_por_run=quantidade // 10))
+    assert externo == esperado and carros == copia
+
+    esperado = sorted(carros, key=lambda c: (c["ano_fabricacao"], c["modelo"]), reverse=True)
+    externo = list(organizar_por_ano_externo(carros, ("ano_fabricacao", "modelo"), decrescente=True,
+                                             registros_por_run=quantidade // 10, maximo_arquivos=3))
+    assert externo == esperado
+    print("Resultados iguais aos de organizar_por_ano (estável, crescente e decrescente).")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        print(ordenar_arquivo_jsonl(sys.argv[1], sys.argv[2]))
+    else:
+        benchmark(*map(int, sys.argv[1:]))
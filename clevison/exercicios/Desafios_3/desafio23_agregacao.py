@@ -0,0 +1,404 @@
+"""
+23.1 Agregação de colunas numéricas enormes
+
+Evolução do desafio 23, que mostra dez formas de somar uma lista de cinco
+    elementos (algumas só como curiosidade, como sum(x) * len(x) / len(x)
+    ou o zip com uma lista de zeros), para somar colunas com centenas de
+    milhões de valores.
+
+Requisitos:
+- Calcular soma, média, variância (Welford, juntando blocos pela fórmula de
+    Chan), mínimo, máximo e a soma exata arredondada uma única vez, como a
+    de math.fsum, mas vetorizada.
+- Ler a coluna em blocos de um arquivo binário mapeado em memória (mmap)
+    ou de uma coluna de um CSV, usando NumPy quando disponível.
+- Modo map-reduce: faixas do arquivo binário são agregadas em processos
+    separados e os resultados parciais são juntados.
+- Comparar o tempo de todas as estratégias do exercício em vários tamanhos
+    de entrada.
+"""
+
+import csv
+import itertools
+import math
+import mmap
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+try:
+    import numpy as np
+except ImportError:  # Sem NumPy os blocos são array('d')
+    np = None
+
+VALORES_POR_BLOCO = 1 << 20
+
+# Todo float64 finito vezes 2**ESCALA é um inteiro (o menor subnormal é
+# 2**-1074 e as mantissas de frexp têm 53 bits), então a soma exata de uma
+# coluna cabe em um int do Python.
+ESCALA = 1074 + 53
+_VALORES_POR_BINCOUNT = 1 << 24  # Mantém as somas de bincount abaixo de 2**53
+
+
+def _soma_exata_numpy(valores):
+    """
+    Soma exata de um array de floats finitos, vezes 2**ESCALA. Cada valor é
+    separado em mantissa inteira e expoente (x = m * 2**(e - 53)); as
+    mantissas, divididas em duas metades de 26 bits, são somadas por
+    expoente com bincount sem nenhum arredondamento.
+    """
+    total = 0
+    for inicio in range(0, len(valores), _VALORES_POR_BINCOUNT):
+        mantissas, expoentes = np.frexp(valores[inicio:inicio + _VALORES_POR_BINCOUNT])
+        inteiros = np.ldexp(mantissas, 53).astype(np.int64)
+        menor = int(expoentes.min())
+        posicoes = expoentes - menor
+        altas = np.bincount(posicoes, weights=inteiros >> 26)
+        baixas = np.bincount(posicoes, weights=inteiros & ((1 << 26) - 1))
+        for k in np.flatnonzero((altas != 0) | (baixas != 0)).tolist():
+            total += ((int(altas[k]) << 26) + int(baixas[k])) << (menor + k + 1074)
+    return total
+
+
+def _soma_exata(valores):
+    """
+    Soma exata de uma sequência de floats finitos, vezes 2**ESCALA, sem
+    NumPy: math.fsum é repetido sobre o que falta somar até o resto ser
+    zero, e as parcelas obtidas somam exatamente o total.
+    """
+    parcelas = []
+    while True:
+        try:
+            resto = math.fsum(itertools.chain(valores, (-p for p in parcelas)))
+        except OverflowError:  # Soma parcial além do maior float: conta valor a valor
+            return sum(numerador * ((1 << ESCALA) // denominador)
+                       for numerador, denominador in map(float.as_integer_ratio, valores))
+        if resto == 0:
+            break
+        parcelas.append(resto)
+    total = 0
+    for parcela in parcelas:
+        numerador, denominador = parcela.as_integer_ratio()
+        total += numerador * ((1 << ESCALA) // denominador)
+    return total
+
+
+class Estatisticas:
+    """
+    Acumulador de uma coluna numérica, alimentado bloco a bloco. Dois
+    acumuladores (de faixas diferentes da coluna) podem ser juntados.
+    """
+
+    def __init__(self):
+        self.quantidade = 0
+        self.media = 0.0
+        self._m2 = 0.0  # Soma dos quadrados das diferenças para a média
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self._soma_inteira = 0     # Soma exata dos valores finitos, vezes 2**ESCALA
+        self._soma_infinitos = 0.0  # Soma dos valores infinitos ou NaN
+
+    def adicionar_bloco(self, bloco):
+        n = len(bloco)
+        if n == 0:
+            return self
+        if np is not None:
+            bloco = np.asarray(bloco, dtype=np.float64)
+            finitos = np.isfinite(bloco)
+            if finitos.all():
+                infinitos = 0.0
+                soma_inteira = _soma_exata_numpy(bloco)
+            else:
+                with np.errstate(invalid="ignore"):
+                    infinitos = float(bloco[~finitos].sum())
+                soma_inteira = _soma_exata_numpy(bloco[finitos])
+        else:
+            if all(map(math.isfinite, bloco)):
+                infinitos = 0.0
+                soma_inteira = _soma_exata(bloco)
+            else:
+                infinitos = sum(v for v in bloco if not math.isfinite(v))
+                soma_inteira = _soma_exata([v for v in bloco if math.isfinite(v)])
+
+        # Uma única divisão de inteiros: a média de valores finitos é finita
+        # mesmo quando a soma não cabe em um float
+        media = soma_inteira / ((1 << ESCALA) * n) + infinitos
+        if np is not None:
+            with np.errstate(over="ignore", invalid="ignore"):  # inf e NaN seguem adiante
+                desvios = bloco - media
+                m2 = float(np.dot(desvios, desvios))
+            minimo, maximo = float(bloco.min()), float(bloco.max())
+        else:
+            # Welford dentro do bloco
+            media_bloco = m2 = 0.0
+            for k, valor in enumerate(bloco, 1):
+                delta = valor - media_bloco
+                media_bloco += delta / k
+                m2 += delta * (valor - media_bloco)
+            minimo, maximo = min(bloco), max(bloco)
+        self._juntar(n, media, m2, minimo, maximo, soma_inteira, infinitos)
+        return self
+
+    def _juntar(self, n, media, m2, minimo, maximo, soma_inteira, infinitos):
+        # Fórmula de Chan para juntar as médias e variâncias de duas partes
+        total = self.quantidade + n
+        delta = media - self.media
+        if self.quantidade:
+            self._m2 += m2 + delta * delta * (self.quantidade / total * n)
+        else:
+            self._m2 = m2
+        self.quantidade = total
+        self.minimo = min(self.minimo, minimo)
+        self.maximo = max(self.maximo, maximo)
+        self._soma_inteira += soma_inteira
+        self._soma_infinitos += infinitos
+        if self._soma_infinitos != 0.0:  # Também vale para NaN
+            # Com infinitos, a média é a soma deles (inf, -inf ou NaN); a
+            # conta com delta daria inf - inf = NaN ao juntar um bloco finito
+            self.media = self._soma_infinitos
+        else:
+            # Média direto da soma exata: arredondada uma única vez e finita
+            # mesmo quando a soma não cabe em um float
+            self.media = self._soma_inteira / ((1 << ESCALA) * total)
+
+    def juntar(self, outro):
+        if outro.quantidade:
+            self._juntar(outro.quantidade, outro.media, outro._m2, outro.minimo, outro.maximo,
+                         outro._soma_inteira, outro._soma_infinitos)
+        return self
+
+    @property
+    def soma(self):
+        """
+        Soma exata arredondada uma única vez, igual a math.fsum da coluna.
+        Quando a soma exata passa do maior float, o resultado é inf ou -inf
+        (onde math.fsum levantaria OverflowError).
+        """
+        if self._soma_infinitos != 0.0:  # Também vale para NaN
+            return self._soma_infinitos
+        try:
+            return self._soma_inteira / (1 << ESCALA)
+        except OverflowError:
+            return math.inf if self._soma_inteira > 0 else -math.inf
+
+    @property
+    def variancia(self):
+        """
+        Variância populacional (divide por n).
+        """
+        return self._m2 / self.quantidade if self.quantidade else math.nan
+
+    @property
+    def variancia_amostral(self):
+        return self._m2 / (self.quantidade - 1) if self.quantidade > 1 else math.nan
+
+    @property
+    def desvio_padrao(self):
+        return math.sqrt(self.variancia)
+
+    def resumo(self):
+        return {
+            "quantidade": self.quantidade,
+            "soma": self.soma,
+            "media": self.media if self.quantidade else math.nan,
+            "variancia": self.variancia,
+            "desvio_padrao": self.desvio_padrao,
+            "minimo": self.minimo,
+            "maximo": self.maximo,
+        }
+
+
+# --- Leitura em blocos ---------------------------------------------------
+
+def ler_coluna_binaria(caminho, inicio=0, fim=None, valores_por_bloco=VALORES_POR_BLOCO):
+    """
+    Gera blocos de uma coluna gravada como float64 (na ordem de bytes da
+    máquina), mapeando o arquivo em memória. inicio e fim são posições de
+    valores, não de bytes.
+    """
+    tamanho = os.path.getsize(caminho) // 8
+    fim = tamanho if fim is None else min(fim, tamanho)
+    if fim <= inicio:
+        return
+    with open(caminho, "rb") as arquivo:
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+    # Os blocos são visões do mapa, sem cópia; o mapa é fechado quando o
+    # último bloco deixa de ser usado.
+    if np is not None:
+        valores = np.frombuffer(mapa, dtype=np.float64, count=fim - inicio, offset=inicio * 8)
+    else:
+        valores = memoryview(mapa)[:tamanho * 8].cast("d")[inicio:fim]
+    for posicao in range(0, len(valores), valores_por_bloco):
+        yield valores[posicao:posicao + valores_por_bloco]
+
+
+def _bloco(valores):
+    if np is not None:
+        return np.array(valores, dtype=np.float64)
+    return array("d", valores)
+
+
+def ler_coluna_csv(caminho, coluna, valores_por_bloco=VALORES_POR_BLOCO, delimitador=","):
+    """
+    Gera blocos com os valores de uma coluna (nome do cabeçalho ou índice)
+    de um arquivo CSV. Células vazias são ignoradas.
+    """
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        leitor = csv.reader(arquivo, delimiter=delimitador)
+        if isinstance(coluna, str):
+            coluna = next(leitor).index(coluna)
+        valores = []
+        for linha in leitor:
+            celula = linha[coluna]
+            if celula:
+                valores.append(float(celula))
+                if len(valores) == valores_por_bloco:
+                    yield _bloco(valores)
+                    valores = []
+        if valores:
+            yield _bloco(valores)
+
+
+def agregar(blocos):
+    """
+    Agrega uma sequência de blocos (de ler_coluna_binaria, ler_coluna_csv
+    ou qualquer iterável de listas/arrays) e retorna o resumo.
+    """
+    estatisticas = Estatisticas()
+    for bloco in blocos:
+        estatisticas.adicionar_bloco(bloco)
+    return estatisticas.resumo()
+
+
+def _agregar_faixa(caminho, inicio, fim):
+    estatisticas = Estatisticas()
+    for bloco in ler_coluna_binaria(caminho, inicio, fim):
+        estatisticas.adicionar_bloco(bloco)
+    return estatisticas
+
+
+def agregar_arquivo(caminho, processos=1):
+    """
+    Resumo de uma coluna binária float64. Com processos > 1 o arquivo é
+    dividido em faixas agregadas em paralelo (map) e juntadas (reduce).
+    """
+    tamanho = os.path.getsize(caminho) // 8
+    if processos <= 1:
+        return _agregar_faixa(caminho, 0, tamanho).resumo()
+    partes = processos * 4
+    cortes = [tamanho * i // partes for i in range(partes + 1)]
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        parciais = executor.map(_agregar_faixa, [caminho] * partes, cortes, cortes[1:])
+        return reduce(Estatisticas.juntar, parciais, Estatisticas()).resumo()
+
+
+# --- As estratégias do desafio 23 ----------------------------------------
+
+def _soma_for(x):
+    soma = 0
+    for numero in x:
+        soma += numero
+    return soma
+
+
+def _soma_while(x):
+    soma = 0
+    i = 0
+    while i < len(x):
+        soma += x[i]
+        i += 1
+    return soma
+
+
+ESTRATEGIAS = {
+    "sum()": sum,
+    "loop for": _soma_for,
+    "compreensão de lista": lambda x: sum([numero for numero in x]),
+    "reduce": lambda x: reduce(lambda a, b: a + b, x),
+    "loop while": _soma_while,
+    "map": lambda x: sum(map(int, x)),
+    "zip com zeros": lambda x: sum(a + b for a, b in zip(x, [0] * len(x))),
+    "enumerate": lambda x: sum(numero for index, numero in enumerate(x)),
+    "filter": lambda x: sum(filter(lambda n: n > 0, x)),
+    "média vezes tamanho": lambda x: sum(x) * len(x) / len(x),
+    "math.fsum": math.fsum,
+    "Estatisticas": lambda x: Estatisticas().adicionar_bloco(x).soma,
+}
+if np is not None:
+    ESTRATEGIAS["numpy.sum"] = lambda x: np.asarray(x).sum()
+
+
+def comparar_estrategias(tamanhos=(5, 1_000, 100_000, 1_000_000), tempo_minimo=0.05):
+    """
+    Mede cada estratégia em listas de inteiros positivos de cada tamanho e
+    retorna {estrategia: {tamanho: segundos por soma}}.
+    """
+    resultados = {nome: {} for nome in ESTRATEGIAS}
+    for tamanho in tamanhos:
+        x = list(range(5, 5 * tamanho + 1, 5))  # [5, 10, 15, ...] como no exercício
+        esperado = sum(x)
+        for nome, estrategia in ESTRATEGIAS.items():
+            assert estrategia(x) == esperado, nome
+            repeticoes = 0
+            t0 = time.perf_counter()
+            while (decorrido := time.perf_counter() - t0) < tempo_minimo or repeticoes == 0:
+                estrategia(x)
+                repeticoes += 1
+            resultados[nome][tamanho] = decorrido / repeticoes
+    return resultados
+
+
+def _formatar_tempo(segundos):
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:.1f} µs"
+    return f"{segundos * 1e3:.1f} ms"
+
+
+def benchmark(milhoes=20):
+    resultados = comparar_estrategias()
+    tamanhos = list(next(iter(resultados.values())))
+    print("Estratégia".ljust(22) + "".join(f"n={t:<12,}" for t in tamanhos))
+    for nome, tempos in resultados.items():
+        print(nome.ljust(22) + "".join(_formatar_tempo(tempos[t]).ljust(14) for t in tamanhos))
+
+    # Valores com ordens de grandeza diferentes: a soma simples perde precisão
+    quantidade = milhoes * 1_000_000
+    sorteio = random.Random(23)
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "coluna.f64")
+        with open(caminho, "wb") as arquivo:
+            for inicio in range(0, quantidade, VALORES_POR_BLOCO):
+                n = min(VALORES_POR_BLOCO, quantidade - inicio)
+                bloco = array("d", (sorteio.lognormvariate(0, 4) for _ in range(n)))
+                arquivo.write(bloco.tobytes())
+
+        for processos in (1, max(2, os.cpu_count() or 1)):
+            t0 = time.perf_counter()
+            resumo = agregar_arquivo(caminho, processos=processos)
+            tempo = time.perf_counter() - t0
+            print(f"{quantidade:,} valores com {processos} processo(s): {tempo:.2f} s "
+                  f"({quantidade / tempo / 1e6:.0f} milhões/s)")
+
+        valores = array("d")
+        with open(caminho, "rb") as arquivo:
+            valores.frombytes(arquivo.read())
+        exata = math.fsum(valores)
+        print(f"math.fsum da coluna inteira {exata!r}: Estatisticas {resumo['soma']!r} "
+              f"({abs(resumo['soma'] - exata) / math.ulp(exata):.0f} ulp), sum() {sum(valores)!r} "
+              f"({abs(sum(valores) - exata) / math.ulp(exata):.0f} ulp)")
+        print(f"Média {resumo['media']:.6f}, desvio padrão {resumo['desvio_padrao']:.6f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        if len(sys.argv) > 2:
+            print(agregar(ler_coluna_csv(sys.argv[1], sys.argv[2])))
+        else:
+            print(agregar_arquivo(sys.argv[1], processos=os.cpu_count() or 1))
+    else:
+        benchmark(*map(int, sys.argv[1:]))
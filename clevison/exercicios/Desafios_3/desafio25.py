@@ -21,10 +21,21 @@ Implemente um código em Python que reordene os elementos dessa lista de
 
 #=================================================================#
 
+# dias_da_semana = ['Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo', 'Segunda']
+# print("Lista original: ", dias_da_semana)
+
+# indice_segunda = dias_da_semana.index('Segunda')
+
+# dias_reordenados = dias_da_semana[indice_segunda:] + dias_da_semana[:indice_segunda]
+# print("Lista reordenada: ", dias_reordenados)
+
+#=================================================================#
+
+# RotatedView gira a lista sem copiá-la (veja desafio25_rotacao.py)
+from desafio25_rotacao import RotatedView
+
 dias_da_semana = ['Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado', 'Domingo', 'Segunda']
 print("Lista original: ", dias_da_semana)
 
-indice_segunda = dias_da_semana.index('Segunda')
-
-dias_reordenados = dias_da_semana[indice_segunda:] + dias_da_semana[:indice_segunda]
-print("Lista reordenada: ", dias_reordenados)
+dias_reordenados = RotatedView(dias_da_semana).rotacionar_para('Segunda')
+print("Lista reordenada: ", list(dias_reordenados))
@@ -0,0 +1,295 @@
+"""
+25.1 Sequências rotacionadas sem cópia
+
+Evolução do desafio 25 para escalas cíclicas grandes (turnos, séries
+    temporais em buffer circular), que são rotacionadas o tempo todo.
+    lista.index('Segunda') percorre a lista e as duas fatias mais a
+    concatenação copiam a lista inteira a cada rotação.
+
+Requisitos:
+- RotatedView envolve qualquer sequência (lista, tupla, memoryview, array
+    NumPy) com um deslocamento, sem copiar os dados.
+- Indexação, fatias, iteração e uma nova rotação em O(1); fatias e rotações
+    devolvem outras visões dos mesmos dados, nunca visões de visões. Só a
+    fatia que dá a volta em uma janela girada (menor que o ciclo) guarda
+    uma tupla com as suas posições nos dados.
+- "Rotacionar para começar em X" consulta um mapa valor -> posições,
+    montado uma única vez e compartilhado pelas visões dos mesmos dados.
+    visao[i] = valor grava nos dados e atualiza o mapa; depois de alterar
+    os dados por fora, reindexar() descarta o mapa.
+"""
+
+import bisect
+import itertools
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import Sequence
+
+
+class RotatedView(Sequence):
+    """
+    Visão de dados em que a posição i corresponde a
+    base[(inicio + ((i + giro) % tamanho) * passo) % len(base)], sendo a
+    base os próprios dados ou uma tupla de posições neles.
+    """
+
+    __slots__ = ("_dados", "_posicoes", "_n", "_inicio", "_passo", "_tamanho", "_giro", "_mapa",
+                 "_inverso")
+
+    def __init__(self, dados, deslocamento=0):
+        n = len(dados)
+        self._iniciar(dados, None, n, deslocamento % n if n else 0, 1, n, 0, [None], None)
+
+    def _iniciar(self, dados, posicoes, n, inicio, passo, tamanho, giro, mapa, inverso):
+        self._dados = dados
+        self._posicoes = posicoes  # None (a base são os dados) ou tupla de posições em dados
+        self._n = n                # Tamanho da base
+        self._inicio = inicio
+        self._passo = passo
+        self._tamanho = tamanho
+        self._giro = giro
+        self._mapa = mapa          # [mapa valor -> posições em dados], compartilhado
+        self._inverso = inverso    # [posição em dados -> posição em posicoes], compartilhado
+
+    def _nova(self, posicoes, n, inicio, passo, tamanho, giro, inverso):
+        visao = object.__new__(type(self))
+        # Uma janela que volta ao ponto de partida (tamanho * passo múltiplo
+        # do tamanho da base) gira só mudando o início.
+        if giro and (tamanho * passo) % n == 0:
+            inicio, giro = (inicio + giro * passo) % n, 0
+        visao._iniciar(self._dados, posicoes, n, inicio, passo, tamanho, giro, self._mapa, inverso)
+        return visao
+
+    def __len__(self):
+        return self._tamanho
+
+    def _posicao(self, i):
+        # Posição na base
+        j = i + self._giro
+        if j >= self._tamanho:
+            j -= self._tamanho
+        return (self._inicio + j * self._passo) % self._n
+
+    def _no_dado(self, posicao):
+        return posicao if self._posicoes is None else self._posicoes[posicao]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            faixa = range(self._tamanho)[i]
+            if not faixa:
+                return self._nova(self._posicoes, self._n, 0, 1, 0, 0, self._inverso)
+            primeiro, ultimo = faixa[0] + self._giro, faixa[-1] + self._giro
+            if (primeiro < self._tamanho) == (ultimo < self._tamanho):
+                # A fatia não passa pelo fim da janela: continua uma
+                # progressão na mesma base
+                inicio = (self._inicio + (primeiro % self._tamanho) * self._passo) % self._n
+                return self._nova(self._posicoes, self._n, inicio, self._passo * faixa.step, len(faixa), 0,
+                                  self._inverso)
+            # Fatia que dá a volta em uma janela girada menor que o ciclo: as
+            # posições não formam uma progressão e viram a base da nova visão
+            # (só as posições são guardadas, os dados não são copiados)
+            posicoes = tuple(self._no_dado(self._posicao(j)) for j in faixa)
+            return self._nova(posicoes, len(posicoes), 0, 1, len(posicoes), 0, [None])
+        return self._dados[self._no_dado(self._posicao(self._indice(i)))]
+
+    def _indice(self, i):
+        if i < 0:
+            i += self._tamanho
+        if not 0 <= i < self._tamanho:
+            raise IndexError("Índice fora da visão.")
+        return i
+
+    def __setitem__(self, i, valor):
+        """
+        Grava valor nos dados, na posição que corresponde a i, mantendo o
+        mapa de posições em dia.
+        """
+        posicao = self._no_dado(self._posicao(self._indice(i)))
+        antigo = self._dados[posicao]
+        self._dados[posicao] = valor
+        if self._mapa[0] is not None:
+            self._mover_no_mapa(posicao, antigo, valor)
+
+    def rotacionar(self, k):
+        """
+        Visão que começa k posições à frente (k negativo gira para trás).
+        """
+        if not self._tamanho:
+            return self
+        giro = (self._giro + k) % self._tamanho
+        return self._nova(self._posicoes, self._n, self._inicio, self._passo, self._tamanho, giro,
+                          self._inverso)
+
+    def reindexar(self):
+        """
+        Descarta o mapa de posições de todas as visões destes dados. Deve
+        ser chamado depois de alterar os dados por fora da visão; as
+        gravações por visao[i] = valor já mantêm o mapa em dia.
+        """
+        self._mapa[0] = None
+
+    def _posicoes_no_dado(self, valor):
+        if self._mapa[0] is None or self._mapa[0][2] != len(self._dados):
+            # Primeira posição de cada valor, montada em C: nos reversos, a
+            # menor posição é a última gravada.
+            n = len(self._dados)
+            primeiras = dict(zip(reversed(self._dados), range(n - 1, -1, -1)))
+            repetidos = {}
+            if len(primeiras) < n:
+                contagem = Counter(self._dados)
+                repetidos = {item: [] for item, vezes in contagem.items() if vezes > 1}
+                for posicao, item in enumerate(self._dados):
+                    if item in repetidos:
+                        repetidos[item].append(posicao)
+            self._mapa[0] = (primeiras, repetidos, n)
+
+        primeiras, repetidos, _ = self._mapa[0]
+        if valor in repetidos:
+            return repetidos[valor]
+        posicao = primeiras.get(valor)
+        return () if posicao is None else (posicao,)
+
+    def _mover_no_mapa(self, posicao, antigo, valor):
+        # Atualiza o mapa depois de dados[posicao] passar de antigo a valor
+        if antigo == valor:
+            return
+        primeiras, repetidos, _ = self._mapa[0]
+        if antigo in repetidos:
+            lista = repetidos[antigo]
+            del lista[bisect.bisect_left(lista, posicao)]
+            primeiras[antigo] = lista[0]
+            if len(lista) == 1:
+                del repetidos[antigo]
+        else:
+            del primeiras[antigo]
+        if valor in repetidos:
+            bisect.insort(repetidos[valor], posicao)
+            primeiras[valor] = repetidos[valor][0]
+        elif valor in primeiras:
+            repetidos[valor] = sorted((primeiras[valor], posicao))
+            primeiras[valor] = repetidos[valor][0]
+        else:
+            primeiras[valor] = posicao
+
+    def _indice_na_visao(self, posicao):
+        # Inverte a conta de _posicao; None se a posição não está na janela
+        if self._posicoes is not None:
+            if self._inverso[0] is None:
+                self._inverso[0] = dict(zip(self._posicoes, range(self._n)))
+            posicao = self._inverso[0].get(posicao)
+            if posicao is None:
+                return None
+        deslocamento = (posicao - self._inicio) % self._n
+        if self._passo < 0:
+            deslocamento = (self._n - deslocamento) % self._n
+        j, resto = divmod(deslocamento, abs(self._passo))
+        if resto or j >= self._tamanho:
+            return None
+        return (j - self._giro) % self._tamanho
+
+    def index(self, valor, inicio=0, fim=None):
+        """
+        Primeira posição de valor na visão, pelo mapa de posições (sem
+        percorrer os dados a cada consulta).
+        """
+        fim = self._tamanho if fim is None else fim
+        inicio, fim, _ = slice(inicio, fim).indices(self._tamanho)
+        candidatos = (self._indice_na_visao(p) for p in self._posicoes_no_dado(valor))
+        melhor = min((i for i in candidatos if i is not None and inicio <= i < fim), default=None)
+        if melhor is None:
+            raise ValueError(f"{valor!r} não está na visão.")
+        return melhor
+
+    def __contains__(self, valor):
+        try:
+            self.index(valor)
+        except ValueError:
+            return False
+        return True
+
+    def rotacionar_para(self, valor):
+        """
+        Visão que começa na primeira ocorrência de valor.
+        """
+        return self.rotacionar(self.index(valor))
+
+    def _faixas(self):
+        # Faixas de posições na base, sem dar a volta, na ordem da visão
+        for primeiro, quantidade in ((self._giro, self._tamanho - self._giro), (0, self._giro)):
+            atual = (self._inicio + primeiro * self._passo) % self._n if quantidade else 0
+            while quantidade > 0:
+                if self._passo > 0:
+                    cabem = (self._n - 1 - atual) // self._passo + 1
+                else:
+                    cabem = atual // -self._passo + 1
+                cabem = min(cabem, quantidade)
+                yield range(atual, atual + cabem * self._passo, self._passo)
+                atual = (atual + cabem * self._passo) % self._n
+                quantidade -= cabem
+
+    def _ler(self, faixa):
+        if self._posicoes is not None:
+            faixa = map(self._posicoes.__getitem__, faixa)
+        return map(self._dados.__getitem__, faixa)
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(map(self._ler, self._faixas()))
+
+    def __reversed__(self):
+        faixas = list(self._faixas())
+        return itertools.chain.from_iterable(self._ler(faixa[::-1]) for faixa in reversed(faixas))
+
+    def __eq__(self, outro):
+        if not isinstance(outro, (RotatedView, list, tuple)):
+            return NotImplemented
+        return len(self) == len(outro) and all(a == b for a, b in zip(self, outro))
+
+    def __repr__(self):
+        return f"RotatedView({list(self)!r})"
+
+
+def reordenar_por_fatias(lista, valor):
+    """
+    A forma do desafio 25: index, duas fatias e uma concatenação.
+    """
+    indice = lista.index(valor)
+    return lista[indice:] + lista[:indice]
+
+
+def benchmark(tamanho=1_000_000, rotacoes=200):
+    escala = [f"turno {i}" for i in range(tamanho)]
+    sorteio = random.Random(25)
+    alvos = [escala[sorteio.randrange(tamanho)] for _ in range(rotacoes)]
+
+    t0 = time.perf_counter()
+    for alvo in alvos:
+        esperado = reordenar_por_fatias(escala, alvo)
+    tempo_fatias = (time.perf_counter() - t0) / rotacoes
+
+    visao = RotatedView(escala)
+    t0 = time.perf_counter()
+    visao.rotacionar_para(alvos[0])  # Monta o mapa de posições
+    tempo_mapa = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for alvo in alvos:
+        rotacionada = visao.rotacionar_para(alvo)
+    tempo_visao = (time.perf_counter() - t0) / rotacoes
+    assert rotacionada == esperado and rotacionada[-3:] == esperado[-3:]
+    assert list(rotacionada[::-7]) == esperado[::-7]
+
+    print(f"Escala com {tamanho} turnos, {rotacoes} rotações para um valor:")
+    print(f"index + fatias + concatenação: {tempo_fatias * 1e3:.2f} ms por rotação")
+    print(f"RotatedView: mapa montado uma vez em {tempo_mapa * 1e3:.0f} ms, "
+          f"depois {tempo_visao * 1e6:.2f} µs por rotação")
+
+    t0 = time.perf_counter()
+    for _ in rotacionada:
+        pass
+    tempo_iteracao = time.perf_counter() - t0
+    print(f"Percorrer a visão inteira: {tempo_iteracao * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,213 @@
+"""
+Remoção de acentos e contagem de vogais para textos grandes
+
+Evolução das funções remover_acentos e contar_vogais (função 13 de
+Função.ipynb), usadas nas descrições de todos os produtos importados. A
+versão original aplica unicodedata.normalize("NFD") ao texto inteiro, chama
+unicodedata.category em cada caractere e depois percorre o resultado de novo
+para contar as vogais.
+
+- Uma tabela de str.translate já vem preenchida com os caracteres Latin-1 e
+    Latin Extended (A e B) e com os acentos combinantes. Um caractere fora da
+    tabela é decomposto com NFD uma única vez e o resultado fica guardado.
+- Uma segunda tabela junta as duas etapas de contar_vogais (lower e remoção
+    dos acentos), então cada bloco é convertido em uma única passada.
+- Na contagem, as vogais ASCII são contadas direto nos bytes em UTF-8 e só
+    os outros caracteres passam pela tabela.
+- Geradores encadeados leem o arquivo em blocos, convertem e contam as
+    vogais sem carregar o arquivo inteiro.
+"""
+
+import codecs
+import random
+import sys
+import os
+import time
+import unicodedata
+
+try:
+    from utilitarios import TabelaTraducao
+except ImportError:  # Executado da própria pasta: a raiz do repositório não está no caminho
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+    from utilitarios import TabelaTraducao
+
+TAMANHO_BLOCO = 1 << 20
+VOGAIS = "aeiou"
+_VOGAIS_BYTES = [v.encode() for v in VOGAIS]
+_ASCII_TODOS = bytes(range(128))
+
+# Latin-1 Supplement, Latin Extended-A e Latin Extended-B, e os acentos
+# combinantes (que o NFD separa das letras)
+_FAIXAS_PRECALCULADAS = (range(0xC0, 0x250), range(0x300, 0x370))
+
+
+def remover_acentos_original(texto):
+    """
+    Cópia da função remover_acentos de Função.ipynb, usada como referência.
+    """
+    return ''.join(
+        c for c in unicodedata.normalize('NFD', texto)
+        if unicodedata.category(c) != 'Mn'
+    )
+
+
+def contar_vogais_original(string):
+    """
+    Cópia da função contar_vogais de Função.ipynb, usada como referência.
+    """
+    string = remover_acentos_original(string.lower())
+    vogais = "aeiou"
+    contador = 0
+    for letra in string:
+        if letra in vogais:
+            contador += 1
+    return contador
+
+
+# Tabelas de str.translate: cada caractere é convertido uma única vez
+TABELA_DOBRA = TabelaTraducao(remover_acentos_original, _FAIXAS_PRECALCULADAS)
+TABELA_DOBRA_MINUSCULA = TabelaTraducao(lambda c: remover_acentos_original(c.lower()), _FAIXAS_PRECALCULADAS)
+
+
+def remover_acentos(texto):
+    """
+    Mesmo resultado de remover_acentos_original. O NFD é aplicado a cada
+    caractere separadamente, o que só poderia mudar a ordem de marcas
+    combinantes que não são acentos (categoria Mc) em sequência.
+    """
+    if texto.isascii():
+        return texto
+    return texto.translate(TABELA_DOBRA)
+
+
+def _minusculas_sem_acentos(texto):
+    if texto.isascii():
+        return texto.lower()
+    return texto.translate(TABELA_DOBRA_MINUSCULA)
+
+
+def _contar(texto):
+    return sum(map(texto.count, VOGAIS))
+
+
+def contar_vogais_bytes(dados, decodificador=None):
+    """
+    Vogais de um bloco de bytes em UTF-8. Em UTF-8 um byte ASCII nunca faz
+    parte de um caractere de vários bytes, então as vogais ASCII são
+    contadas direto nos bytes e só o restante é decodificado e convertido
+    pela tabela. Com um decodificador incremental, o bloco pode terminar no
+    meio de um caractere.
+    """
+    minusculos = dados.lower()  # bytes.lower só altera as letras ASCII
+    total = sum(map(minusculos.count, _VOGAIS_BYTES))
+    if not dados.isascii():
+        resto = dados.translate(None, _ASCII_TODOS)
+        texto = decodificador.decode(resto) if decodificador else resto.decode("utf-8", "surrogatepass")
+        total += _contar(texto.translate(TABELA_DOBRA_MINUSCULA))
+    return total
+
+
+def contar_vogais(texto):
+    """
+    Mesmo resultado de contar_vogais_original.
+    """
+    return contar_vogais_bytes(texto.encode("utf-8", "surrogatepass"))
+
+
+def ler_blocos(caminho, tamanho_bloco=TAMANHO_BLOCO, encoding="utf-8"):
+    """
+    Gera o texto do arquivo em blocos de até tamanho_bloco caracteres.
+    """
+    with open(caminho, encoding=encoding) as arquivo:
+        while bloco := arquivo.read(tamanho_bloco):
+            yield bloco
+
+
+def dobrar_fluxo(blocos, minusculas=False):
+    """
+    Gera cada bloco sem acentos (e em minúsculas, se pedido). Como cada
+    caractere é convertido sozinho, um acento separado da sua letra pelo
+    fim de um bloco não muda o resultado.
+    """
+    converter = _minusculas_sem_acentos if minusculas else remover_acentos
+    for bloco in blocos:
+        yield converter(bloco)
+
+
+def contar_vogais_fluxo(blocos):
+    """
+    Soma as vogais de uma sequência de blocos de texto (str) ou de bytes em
+    UTF-8, que podem cortar caracteres entre um bloco e o seguinte.
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    total = 0
+    for bloco in blocos:
+        if isinstance(bloco, str):
+            total += contar_vogais(bloco)
+        else:
+            total += contar_vogais_bytes(bloco, decodificador)
+    decodificador.decode(b"", final=True)
+    return total
+
+
+def ler_blocos_bytes(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    with open(caminho, "rb") as arquivo:
+        while bloco := arquivo.read(tamanho_bloco):
+            yield bloco
+
+
+def contar_vogais_arquivo(caminho, tamanho_bloco=TAMANHO_BLOCO, encoding="utf-8"):
+    if codecs.lookup(encoding).name == "utf-8":
+        return contar_vogais_fluxo(ler_blocos_bytes(caminho, tamanho_bloco))
+    return contar_vogais_fluxo(ler_blocos(caminho, tamanho_bloco, encoding))
+
+
+def _gerar_texto(megabytes, semente=13):
+    sorteio = random.Random(semente)
+    palavras = ["Camiseta", "algodão", "orgânico", "coleção", "verão", "Tênis", "esportivo",
+                "AÇÚCAR", "cristal", "pão", "francês", "Limão", "Maçã", "é", "à", "vovô",
+                "Crème", "brûlée", "Ångström", "ÓCULOS", "proteção", "UV", "café", "preço"]
+    linhas = []
+    tamanho = 0
+    while tamanho < megabytes * 1_000_000:
+        linha = " ".join(sorteio.choices(palavras, k=10)) + ".\n"
+        linhas.append(linha)
+        tamanho += len(linha)
+    return "".join(linhas)
+
+
+def benchmark(megabytes=20):
+    texto = _gerar_texto(megabytes)
+    tamanho_mb = len(texto.encode("utf-8")) / 1e6
+
+    t0 = time.perf_counter()
+    esperado = contar_vogais_original(texto)
+    tempo_original = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    resultado = contar_vogais_fluxo(texto[i:i + TAMANHO_BLOCO]
+                                    for i in range(0, len(texto), TAMANHO_BLOCO))
+    tempo_fluxo = time.perf_counter() - t0
+    assert resultado == esperado
+
+    t0 = time.perf_counter()
+    sem_acentos_original = remover_acentos_original(texto)
+    tempo_remover_original = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    sem_acentos = remover_acentos(texto)
+    tempo_remover = time.perf_counter() - t0
+    assert sem_acentos == sem_acentos_original
+
+    print(f"Texto de {tamanho_mb:.0f} MB com {esperado} vogais")
+    print(f"contar_vogais original: {tempo_original:.2f} s ({tamanho_mb / tempo_original:.1f} MB/s)")
+    print(f"contar_vogais_fluxo: {tempo_fluxo:.2f} s ({tamanho_mb / tempo_fluxo:.1f} MB/s), "
+          f"{tempo_original / tempo_fluxo:.0f}x mais rápido")
+    print(f"remover_acentos: original {tempo_remover_original:.2f} s, "
+          f"com tabela {tempo_remover:.2f} s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        print(f"Vogais: {contar_vogais_arquivo(sys.argv[1])}")
+    else:
+        benchmark(*map(int, sys.argv[1:]))
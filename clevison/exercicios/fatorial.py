@@ -0,0 +1,240 @@
+"""
+Fatorial e coeficientes binomiais para n grande
+
+Evolução da função 3 de Função.ipynb (fatorial), que é recursiva: estoura
+RecursionError perto de n = 1000 e multiplica um número gigante por um
+número pequeno a cada passo.
+
+- O produto de um intervalo é feito por divisão binária (binary splitting):
+    os fatores são multiplicados em pares de tamanho parecido, que é a ordem
+    em que a multiplicação de inteiros grandes fica mais barata.
+- Fatoriais em pontos de controle (múltiplos de um passo fixo) ficam em um
+    cache LRU limitado, então um n próximo de outro já calculado só precisa
+    do produto dos números que faltam.
+- binomial(n, k), fatorial_mod(n, m) e binomial_mod(n, k, p) (teorema de
+    Lucas) completam o módulo.
+"""
+
+import math
+import operator
+import sys
+import time
+from collections import OrderedDict
+
+from primos import miller_rabin, primos_entre
+
+PASSO_CONTROLE = 1024
+MAXIMO_CONTROLES = 64
+
+
+def fatorial_recursivo(n):
+    """
+    Cópia da função fatorial de Função.ipynb, usada como referência.
+    """
+    if n == 0 or n == 1:
+        return 1
+    else:
+        return n * fatorial_recursivo(n - 1)
+
+
+def produto_intervalo(a, b):
+    """
+    Produto dos inteiros em (a, b], por divisão binária.
+    """
+    if b - a <= 32:
+        return math.prod(range(a + 1, b + 1))
+    meio = (a + b) // 2
+    return produto_intervalo(a, meio) * produto_intervalo(meio, b)
+
+
+def produto_lista(valores, inicio=0, fim=None):
+    """
+    Produto de valores[inicio:fim], por divisão binária.
+    """
+    if fim is None:
+        fim = len(valores)
+    if fim - inicio <= 32:
+        return math.prod(valores[inicio:fim])
+    meio = (inicio + fim) // 2
+    return produto_lista(valores, inicio, meio) * produto_lista(valores, meio, fim)
+
+
+def _validar(n, nome="n"):
+    n = operator.index(n)
+    if n < 0:
+        raise ValueError(f"{nome} não pode ser negativo.")
+    return n
+
+
+class MotorFatorial:
+    def __init__(self, passo=PASSO_CONTROLE, maximo_controles=MAXIMO_CONTROLES):
+        self.passo = passo
+        self.maximo_controles = maximo_controles
+        self._controles = OrderedDict()  # ponto de controle -> fatorial
+
+    def _controle(self, c):
+        """
+        Fatorial do ponto de controle c (múltiplo de passo), pelo cache ou a
+        partir do maior ponto de controle menor que c que estiver no cache.
+        """
+        if c == 0:
+            return 1
+        if c in self._controles:
+            self._controles.move_to_end(c)
+            return self._controles[c]
+
+        anterior = max((k for k in self._controles if k < c), default=0)
+        base = self._controles[anterior] if anterior else 1
+        valor = base * produto_intervalo(anterior, c)
+
+        self._controles[c] = valor
+        if len(self._controles) > self.maximo_controles:
+            self._controles.popitem(last=False)
+        return valor
+
+    def fatorial(self, n):
+        n = _validar(n)
+        if n < self.passo:
+            return produto_intervalo(0, n)
+        c = n - n % self.passo
+        return self._controle(c) * produto_intervalo(c, n)
+
+    def binomial(self, n, k):
+        """
+        Coeficiente binomial C(n, k) = n! / (k! (n - k)!).
+        """
+        n = _validar(n)
+        k = _validar(k, "k")
+        if k > n:
+            return 0
+        k = min(k, n - k)
+        if k < self.passo:
+            return produto_intervalo(n - k, n) // self.fatorial(k)
+        return binomial_fatorado(n, k)
+
+
+def binomial_fatorado(n, k):
+    """
+    C(n, k) montado a partir da fatoração: pela fórmula de Legendre, o
+    expoente do primo p é a soma de n//p^i - k//p^i - (n-k)//p^i. Assim não
+    há nenhuma divisão de inteiros grandes.
+    """
+    fatores = []
+    for p in primos_entre(2, n):
+        expoente = 0
+        potencia = p
+        while potencia <= n:
+            expoente += n // potencia - k // potencia - (n - k) // potencia
+            potencia *= p
+        if expoente:
+            fatores.append(p ** expoente if expoente > 1 else p)
+    return produto_lista(fatores)
+
+
+def fatorial_mod(n, m):
+    """
+    n! mod m. Se m é primo e n está perto de m, usa o teorema de Wilson,
+    (m - 1)! ≡ -1 (mod m), para multiplicar só os m - 1 - n números que faltam.
+    """
+    n = _validar(n)
+    m = operator.index(m)
+    if m < 1:
+        raise ValueError("O módulo deve ser positivo.")
+    if n >= m:
+        return 0  # m aparece como fator de n!
+
+    if m - 1 - n < n and miller_rabin(m):
+        resto = 1
+        for i in range(n + 1, m):
+            resto = resto * i % m
+        return (-pow(resto, -1, m)) % m
+
+    resto = 1 % m
+    for i in range(2, n + 1):
+        resto = resto * i % m
+    return resto
+
+
+def binomial_mod(n, k, p):
+    """
+    C(n, k) mod p para p primo, pelo teorema de Lucas: multiplica os
+    binomiais dos dígitos de n e k na base p.
+    """
+    n = _validar(n)
+    k = _validar(k, "k")
+    p = operator.index(p)
+    if p < 2 or not miller_rabin(p):
+        raise ValueError("O módulo deve ser um número primo.")
+
+    resultado = 1
+    while k:
+        ni, ki = n % p, k % p
+        if ki > ni:
+            return 0
+        numerador = fatorial_mod(ni, p)
+        denominador = fatorial_mod(ki, p) * fatorial_mod(ni - ki, p) % p
+        resultado = resultado * numerador * pow(denominador, -1, p) % p
+        n //= p
+        k //= p
+    return resultado
+
+
+_motor_padrao = MotorFatorial()
+
+
+def fatorial(n):
+    return _motor_padrao.fatorial(n)
+
+
+def binomial(n, k):
+    return _motor_padrao.binomial(n, k)
+
+
+def _tempo(funcao, *argumentos, repeticoes=1):
+    t0 = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = funcao(*argumentos)
+    return resultado, (time.perf_counter() - t0) / repeticoes
+
+
+def benchmark(n_grande=100_000):
+    n_pequeno = 900  # Acima disso a versão recursiva estoura a pilha
+    esperado, tempo_recursivo = _tempo(fatorial_recursivo, n_pequeno, repeticoes=200)
+    resultado, tempo_motor = _tempo(MotorFatorial().fatorial, n_pequeno, repeticoes=200)
+    _, tempo_math = _tempo(math.factorial, n_pequeno, repeticoes=200)
+    assert resultado == esperado
+    print(f"{n_pequeno}!: recursivo {tempo_recursivo * 1e6:.0f} µs, "
+          f"divisão binária {tempo_motor * 1e6:.0f} µs, math.factorial {tempo_math * 1e6:.0f} µs")
+
+    motor = MotorFatorial()
+    esperado, tempo_math = _tempo(math.factorial, n_grande)
+    resultado, tempo_frio = _tempo(motor.fatorial, n_grande)
+    assert resultado == esperado
+    _, tempo_vizinho = _tempo(motor.fatorial, n_grande + 500)
+    print(f"{n_grande}!: math.factorial {tempo_math:.3f} s, motor sem cache {tempo_frio:.3f} s, "
+          f"vizinho {n_grande + 500}! com ponto de controle {tempo_vizinho:.3f} s")
+
+    t0 = time.perf_counter()
+    for i in range(n_pequeno):
+        assert fatorial_recursivo(i) == motor.fatorial(i)
+    tempo_iterado = time.perf_counter() - t0
+    print(f"Todos os fatoriais de 0 a {n_pequeno - 1} conferidos em {tempo_iterado:.2f} s")
+
+    n, k = 300_000, 100_000
+    esperado, tempo_math = _tempo(math.comb, n, k)
+    resultado, tempo_motor = _tempo(binomial, n, k)
+    assert resultado == esperado
+    print(f"C({n}, {k}): math.comb {tempo_math:.3f} s, binomial {tempo_motor:.3f} s")
+
+    p = 1_000_003
+    resultado, tempo_wilson = _tempo(fatorial_mod, p - 10, p)
+    esperado = 1
+    for i in range(2, p - 9):
+        esperado = esperado * i % p
+    assert resultado == esperado
+    print(f"({p - 10})! mod {p} = {resultado} em {tempo_wilson * 1e6:.0f} µs (Wilson)")
+    print(f"C(10^18, 10^9) mod 1000003 = {binomial_mod(10 ** 18, 10 ** 9, p)}")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,424 @@
+"""
+Interseção e agrupamento por comprimento para listas grandes
+
+Evolução das funções intersecao_listas (exercício 12) e
+agrupar_por_comprimento (exercício 14) de listas.ipynb, usadas para
+comparar listas de produtos e catálogos de palavras com milhões de itens.
+A interseção original procura cada item de lista1 em lista2 com "in", uma
+varredura da lista inteira por item (O(n·m)), e o agrupamento precisa de
+todas as palavras na memória.
+
+- intersecao_listas escolhe a estratégia pelo tamanho e pela ordem das
+    listas: varredura para listas pequenas, conjunto (hash) no caso geral,
+    busca binária em lista2 ordenada quando lista1 é bem menor, e merge
+    quando as duas estão ordenadas (sem montar um conjunto). O resultado é
+    sempre o da original: a ordem e as repetições de lista1.
+- Listas de inteiros e arrays NumPy numéricos usam np.isin.
+- contar_por_comprimento só conta as palavras de cada comprimento, e
+    contar_comprimentos_arquivo conta direto nos bytes de um arquivo (uma
+    palavra por linha), com NumPy, sem criar as strings.
+- agrupar_em_disco agrupa um fluxo de palavras em lotes e grava cada grupo
+    em um arquivo, então a memória depende do lote e não da entrada.
+"""
+
+import bisect
+import codecs
+import itertools
+import math
+import operator
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict, namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # Sem NumPy, listas de inteiros usam o conjunto (hash)
+    np = None
+
+TAMANHO_BLOCO = 1 << 22
+PALAVRAS_POR_LOTE = 1 << 20
+POUCOS = 16      # Até aqui a varredura da original é mais rápida que montar um conjunto
+_AMOSTRAS = 32   # Pares vizinhos testados antes de verificar a ordem da lista inteira
+
+GrupoEmDisco = namedtuple("GrupoEmDisco", ["caminho", "quantidade"])
+
+
+def intersecao_listas_original(lista1, lista2):
+    """
+    Cópia da função intersecao_listas de listas.ipynb, usada como referência.
+    """
+    #return list(set(lista1) & set(lista2))
+    return [item for item in lista1 if item in lista2]
+
+
+def agrupar_por_comprimento_original(palavras):
+    """
+    Cópia da função agrupar_por_comprimento de listas.ipynb, usada como
+    referência.
+    """
+    dicionario = {}
+    for palavra in palavras:
+        comprimento = len(palavra)
+        if comprimento not in dicionario:
+            dicionario[comprimento] = []
+        dicionario[comprimento].append(palavra)
+    return dicionario
+
+
+def _ordenada(lista):
+    try:
+        # Uma lista fora de ordem quase sempre falha em algum par da amostra,
+        # sem percorrer a lista inteira
+        passo = max(1, (len(lista) - 1) // _AMOSTRAS)
+        if any(lista[i + 1] < lista[i] for i in range(0, len(lista) - 1, passo)):
+            return False
+        return all(map(operator.le, lista, itertools.islice(lista, 1, None)))
+    except (TypeError, ValueError):  # Itens que não podem ser comparados com <
+        return False
+
+
+def _inteiros(lista):
+    # Lista Python que o NumPy converte para um array de inteiros
+    if not lista or type(lista[0]) is not int:
+        return None
+    try:
+        array = np.array(lista)
+    except (TypeError, ValueError):  # Sequências misturadas aos inteiros
+        return None
+    return array if array.dtype.kind in "iu" else None
+
+
+def escolher_metodo(lista1, lista2):
+    """
+    Nome do método que intersecao_listas usa para estas listas.
+    """
+    if np is not None and isinstance(lista1, np.ndarray) and lista1.dtype.kind in "biuf":
+        return "numpy"
+    if len(lista2) <= POUCOS:
+        return "varredura"
+    if np is not None and type(lista1[0] if len(lista1) else None) is type(lista2[0]) is int:
+        return "numpy"
+    if _ordenada(lista2):
+        # Cada busca binária custa log2(n) comparações; o merge percorre lista2 inteira
+        if len(lista1) * math.log2(len(lista2)) < len(lista2):
+            return "busca"
+        if _ordenada(lista1):
+            return "merge"
+    return "hash"
+
+
+def _intersecao_hash(lista1, lista2):
+    try:
+        conjunto = set(lista2)
+        return [item for item in lista1 if item in conjunto]
+    except TypeError:  # Itens que não podem entrar em um conjunto (listas, dicionários)
+        return intersecao_listas_original(lista1, lista2)
+
+
+def _intersecao_busca(lista1, lista2):
+    # lista2 ordenada
+    fim = len(lista2)
+    procurar = bisect.bisect_left
+    try:
+        return [item for item in lista1
+                if (posicao := procurar(lista2, item)) < fim and lista2[posicao] == item]
+    except TypeError:  # Item de lista1 que não pode ser comparado com os de lista2
+        return _intersecao_hash(lista1, lista2)
+
+
+def _intersecao_merge(lista1, lista2):
+    # lista1 e lista2 ordenadas: lista2 é percorrida uma única vez, e um item
+    # de lista2 só é deixado para trás quando é menor que o item atual
+    resultado = []
+    posicao, fim = 0, len(lista2)
+    try:
+        for item in lista1:
+            while posicao < fim and lista2[posicao] < item:
+                posicao += 1
+            if posicao == fim:
+                break
+            if lista2[posicao] == item:
+                resultado.append(item)
+    except TypeError:  # Item de lista1 que não pode ser comparado com os de lista2
+        return _intersecao_hash(lista1, lista2)
+    return resultado
+
+
+def _intersecao_numpy(lista1, lista2):
+    if np is None:
+        raise ValueError("O método numpy precisa do NumPy.")
+    if isinstance(lista1, np.ndarray):
+        return lista1[np.isin(lista1, lista2)]
+    array1, array2 = _inteiros(lista1), _inteiros(lista2)
+    if array1 is None or array2 is None:
+        return _intersecao_hash(lista1, lista2)
+    # Os itens do resultado são os próprios objetos de lista1
+    return list(itertools.compress(lista1, np.isin(array1, array2).tolist()))
+
+
+METODOS = {
+    "varredura": intersecao_listas_original,
+    "hash": _intersecao_hash,
+    "busca": _intersecao_busca,
+    "merge": _intersecao_merge,
+    "numpy": _intersecao_numpy,
+}
+
+
+def intersecao_listas(lista1, lista2, metodo=None):
+    """
+    Mesmo resultado de intersecao_listas_original: os itens de lista1 (na
+    mesma ordem e com as repetições) que estão em lista2. Sem metodo, a
+    estratégia é escolhida por escolher_metodo. "busca" exige lista2
+    ordenada e "merge" exige as duas ordenadas. Com um array NumPy em
+    lista1, o resultado também é um array.
+    """
+    if metodo is None:
+        metodo = escolher_metodo(lista1, lista2)
+    if metodo not in METODOS:
+        raise ValueError(f"Método desconhecido: {metodo!r}")
+    return METODOS[metodo](lista1, lista2)
+
+
+def agrupar_por_comprimento(palavras):
+    """
+    Mesmo resultado de agrupar_por_comprimento_original, para qualquer
+    iterável de palavras.
+    """
+    grupos = defaultdict(list)
+    for palavra in palavras:
+        grupos[len(palavra)].append(palavra)
+    return dict(grupos)
+
+
+def contar_por_comprimento(palavras):
+    """
+    Quantidade de palavras de cada comprimento, com os comprimentos na ordem
+    em que aparecem (como as chaves de agrupar_por_comprimento).
+    """
+    return Counter(map(len, palavras))
+
+
+def ler_palavras(caminho, tamanho_bloco=TAMANHO_BLOCO, encoding="utf-8"):
+    """
+    Gera as palavras de um arquivo com uma palavra por linha (separadas por
+    "\\n"). Uma linha vazia é a palavra "".
+    """
+    pendente = ""
+    with open(caminho, encoding=encoding, newline="") as arquivo:
+        while bloco := arquivo.read(tamanho_bloco):
+            linhas = (pendente + bloco).split("\n")
+            pendente = linhas.pop()
+            yield from linhas
+    if pendente:
+        yield pendente
+
+
+def _comprimentos_bytes(dados, fim):
+    # Comprimento (em caracteres) de cada linha terminada em "\n" de dados[:fim]
+    bytes_linha = np.frombuffer(dados, dtype=np.uint8, count=fim)
+    quebras = np.flatnonzero(bytes_linha == ord("\n"))
+    comprimentos = np.diff(quebras, prepend=-1) - 1
+    if not dados.isascii():
+        dados[:fim].decode("utf-8")  # Mesmo erro que a leitura como texto daria
+        # Em UTF-8 só os bytes de continuação de um caractere (0x80 a 0xBF,
+        # de -128 a -65 como int8) não começam um caractere novo
+        continuacoes = np.cumsum(bytes_linha.view(np.int8) < -64, dtype=np.int32)[quebras]
+        comprimentos -= np.diff(continuacoes, prepend=0)
+    return comprimentos
+
+
+def contar_comprimentos_arquivo(caminho, tamanho_bloco=TAMANHO_BLOCO, encoding="utf-8"):
+    """
+    contar_por_comprimento das palavras de um arquivo (como em
+    ler_palavras). Em UTF-8 e com NumPy os comprimentos são calculados
+    direto nos bytes de cada bloco, sem criar as strings.
+    """
+    if np is None or codecs.lookup(encoding).name != "utf-8":
+        return contar_por_comprimento(ler_palavras(caminho, tamanho_bloco, encoding))
+    contagem = Counter()
+    pendente = b""
+    with open(caminho, "rb") as arquivo:
+        while bloco := arquivo.read(tamanho_bloco):
+            bloco = pendente + bloco if pendente else bloco
+            fim = bloco.rfind(b"\n") + 1
+            pendente = bloco[fim:]
+            if not fim:
+                continue
+            comprimentos = _comprimentos_bytes(bloco, fim)
+            quantidades = np.bincount(comprimentos)
+            # Comprimentos que ainda não apareceram entram na contagem na
+            # ordem da sua primeira palavra no bloco
+            novos = [c for c in np.flatnonzero(quantidades).tolist() if c not in contagem]
+            novos.sort(key=lambda c: int(np.argmax(comprimentos == c)))
+            for comprimento in novos:
+                contagem[comprimento] = 0
+            for comprimento in contagem:
+                if comprimento < len(quantidades):
+                    contagem[comprimento] += int(quantidades[comprimento])
+    if pendente:
+        contagem[len(pendente.decode("utf-8"))] += 1
+    return contagem
+
+
+def agrupar_em_disco(palavras, pasta, palavras_por_lote=PALAVRAS_POR_LOTE, encoding="utf-8"):
+    """
+    Agrupa um fluxo de palavras por comprimento gravando cada grupo em
+    pasta/comprimento_<n>.txt, uma palavra por linha, na ordem de entrada.
+    Só um lote de palavras fica na memória. Retorna um dicionário
+    comprimento -> GrupoEmDisco(caminho, quantidade), com os comprimentos na
+    ordem em que aparecem.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    palavras = iter(palavras)
+    quantidades = {}
+    while lote := list(itertools.islice(palavras, palavras_por_lote)):
+        for comprimento, grupo in agrupar_por_comprimento(lote).items():
+            texto = "\n".join(grupo) + "\n"
+            if texto.count("\n") != len(grupo):
+                raise ValueError("Uma palavra com quebra de linha não cabe no arquivo do grupo.")
+            caminho = os.path.join(pasta, f"comprimento_{comprimento}.txt")
+            # Na primeira gravação o arquivo de uma execução anterior é substituído
+            with open(caminho, "a" if comprimento in quantidades else "w", encoding=encoding,
+                      newline="") as arquivo:
+                arquivo.write(texto)
+            quantidades[comprimento] = quantidades.get(comprimento, 0) + len(grupo)
+    return {comprimento: GrupoEmDisco(os.path.join(pasta, f"comprimento_{comprimento}.txt"), quantidade)
+            for comprimento, quantidade in quantidades.items()}
+
+
+def ler_grupo(grupo, encoding="utf-8"):
+    """
+    Gera as palavras de um grupo gravado por agrupar_em_disco.
+    """
+    return ler_palavras(grupo.caminho, encoding=encoding)
+
+
+def _palavras(quantidade, sorteio):
+    letras = string.ascii_lowercase + "áéíóúãõç"
+    return ["".join(sorteio.choices(letras, k=max(1, int(sorteio.gauss(8, 3)))))
+            for _ in range(quantidade)]
+
+
+def _verificar(sorteio):
+    # Listas pequenas de vários tipos, comparadas com a original em todos os
+    # métodos que valem para elas
+    for _ in range(2000):
+        tipo = sorteio.choice(("int", "str", "float", "misto", "lista"))
+        tamanhos = sorteio.randint(0, 40), sorteio.randint(0, 40)
+        if tipo == "int":
+            listas = [[sorteio.randint(-10, 10) for _ in range(n)] for n in tamanhos]
+        elif tipo == "str":
+            listas = [sorteio.choices(["a", "b", "ç", "dd", "", "e"], k=n) for n in tamanhos]
+        elif tipo == "float":
+            listas = [[sorteio.choice((0.5, 1.0, 2, True, -3)) for _ in range(n)] for n in tamanhos]
+        elif tipo == "misto":
+            listas = [sorteio.choices([1, "1", (1,), None, 2.0], k=n) for n in tamanhos]
+        else:
+            listas = [[[sorteio.randint(0, 3)] for _ in range(n)] for n in tamanhos]
+        if sorteio.random() < 0.5 and tipo not in ("misto",):
+            listas = [sorted(lista) for lista in listas]
+        lista1, lista2 = listas
+        esperado = intersecao_listas_original(lista1, lista2)
+        metodos = ["varredura", "hash", None]
+        if _ordenada(lista2):
+            metodos.append("busca")
+            if _ordenada(lista1):
+                metodos.append("merge")
+        if np is not None:
+            metodos.append("numpy")
+        for metodo in metodos:
+            resultado = intersecao_listas(lista1, lista2, metodo)
+            assert resultado == esperado and list(map(type, resultado)) == list(map(type, esperado)), metodo
+
+        palavras = sorteio.choices(["maçã", "banana", "uva", "kiwi", "", "pera", "日本"], k=tamanhos[0])
+        esperado = agrupar_por_comprimento_original(palavras)
+        assert agrupar_por_comprimento(palavras) == esperado
+        assert list(agrupar_por_comprimento(palavras)) == list(esperado)
+        assert list(contar_por_comprimento(palavras).items()) == [(c, len(g)) for c, g in esperado.items()]
+
+
+def _medir(funcao, *argumentos):
+    t0 = time.perf_counter()
+    resultado = funcao(*argumentos)
+    return resultado, time.perf_counter() - t0
+
+
+def benchmark(quantidade=1_000_000):
+    sorteio = random.Random(25)
+    _verificar(sorteio)
+
+    # A original é O(n·m): medida em listas menores
+    pequena = min(quantidade, 20_000)
+    palavras = _palavras(quantidade, sorteio)
+    lista1, lista2 = palavras[: quantidade // 2], palavras[quantidade // 4:]
+    esperado, tempo_original = _medir(intersecao_listas_original, lista1[:pequena], lista2[:pequena])
+    resultado, tempo = _medir(intersecao_listas, lista1[:pequena], lista2[:pequena])
+    assert resultado == esperado
+    print(f"{pequena} x {pequena} palavras: original {tempo_original:.2f} s, "
+          f"intersecao_listas {tempo * 1e3:.1f} ms ({tempo_original / tempo:.0f}x)")
+
+    numeros1 = [sorteio.randrange(4 * quantidade) for _ in range(quantidade)]
+    numeros2 = [sorteio.randrange(4 * quantidade) for _ in range(quantidade)]
+    ordenadas1, ordenadas2 = sorted(lista1), sorted(lista2)
+    cenarios = [
+        ("palavras", lista1, lista2, ()),
+        ("palavras ordenadas", ordenadas1, ordenadas2, ("merge",)),
+        ("1000 palavras em lista ordenada", lista1[:1000], ordenadas2, ("busca",)),
+        ("inteiros", numeros1, numeros2, ("numpy",) if np is not None else ()),
+    ]
+    print(f"Listas com {quantidade:,} itens:")
+    for nome, primeira, segunda, outros in cenarios:
+        escolhido = escolher_metodo(primeira, segunda)
+        esperado, tempo_hash = _medir(intersecao_listas, primeira, segunda, "hash")
+        tempos = []
+        for metodo in dict.fromkeys((*outros, escolhido)):
+            if metodo == "hash":
+                continue
+            resultado, tempo = _medir(intersecao_listas, primeira, segunda, metodo)
+            assert resultado == esperado
+            tempos.append(f"{metodo} {tempo * 1e3:.0f} ms")
+        print(f"  {nome}: {len(esperado):,} em comum, método escolhido {escolhido}; "
+              f"hash {tempo_hash * 1e3:.0f} ms" + "".join(f", {t}" for t in tempos))
+    if np is not None:
+        array1, array2 = np.array(numeros1), np.array(numeros2)
+        resultado, tempo = _medir(intersecao_listas, array1, array2)
+        assert resultado.tolist() == esperado
+        print(f"  inteiros em arrays NumPy: {tempo * 1e3:.0f} ms")
+
+    esperado, tempo_original = _medir(agrupar_por_comprimento_original, palavras)
+    resultado, tempo = _medir(agrupar_por_comprimento, palavras)
+    assert resultado == esperado and list(resultado) == list(esperado)
+    contagem, tempo_contagem = _medir(contar_por_comprimento, palavras)
+    assert list(contagem.items()) == [(c, len(g)) for c, g in esperado.items()]
+    print(f"Agrupar {quantidade:,} palavras: original {tempo_original * 1e3:.0f} ms, "
+          f"agrupar_por_comprimento {tempo * 1e3:.0f} ms, só contar {tempo_contagem * 1e3:.0f} ms")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "palavras.txt")
+        with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+            arquivo.write("\n".join(palavras) + "\n")
+        tamanho = os.path.getsize(caminho) / 1e6
+        resultado, tempo = _medir(contar_comprimentos_arquivo, caminho)
+        assert list(resultado.items()) == list(contagem.items())
+        print(f"contar_comprimentos_arquivo ({tamanho:.0f} MB): {tempo * 1e3:.0f} ms "
+              f"({tamanho / tempo:.0f} MB/s)")
+
+        grupos, tempo = _medir(agrupar_em_disco, ler_palavras(caminho), os.path.join(pasta, "grupos"),
+                               quantidade // 8)
+        assert list(grupos) == list(esperado)
+        assert all(list(ler_grupo(grupos[c])) == grupo for c, grupo in esperado.items())
+        print(f"agrupar_em_disco em lotes de {quantidade // 8:,} palavras: {tempo * 1e3:.0f} ms, "
+              f"{len(grupos)} arquivos")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        for comprimento, quantidade in contar_comprimentos_arquivo(sys.argv[1]).items():
+            print(f"{comprimento}: {quantidade}")
+    else:
+        benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,258 @@
+"""
+Números primos em grande escala
+
+Evolução da função 8 de Função.ipynb (eh_primo), que faz divisão por
+tentativa até a raiz quadrada a cada chamada. Aqui os primos vêm de um
+crivo de Eratóstenes segmentado, guardado em cache e ampliado sob demanda.
+
+- O crivo guarda só os números ímpares, um byte por número, em um
+    bytearray (riscar múltiplos vira atribuição de fatias, feita em C).
+- eh_primo é uma consulta O(1) dentro da faixa já crivada. Acima do limite
+    do cache usa Miller-Rabin com as 12 primeiras bases primas, que é
+    determinístico para qualquer valor de 64 bits.
+- primos_entre(a, b) e contar_primos(a, b) percorrem o intervalo [a, b]
+    em segmentos de tamanho fixo, com memória limitada.
+"""
+
+import bisect
+import itertools
+import math
+import sys
+import time
+
+BASES_MILLER_RABIN = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+LIMITE_INICIAL = 1 << 16
+LIMITE_MAXIMO_CACHE = 1 << 25
+TAMANHO_SEGMENTO = 1 << 20
+
+
+def eh_primo_divisao(numero):
+    """
+    Cópia da função eh_primo de Função.ipynb, usada como referência.
+    """
+    if numero < 2:
+        return False
+    for i in range(2, int(numero ** 0.5) + 1):
+        if numero % i == 0:
+            return False
+    return True
+
+
+def miller_rabin(numero):
+    """
+    Teste de Miller-Rabin. Com as bases de BASES_MILLER_RABIN o resultado é
+    exato para todo número menor que 3,3 * 10^24 (o que inclui 64 bits).
+    """
+    if numero < 2:
+        return False
+    for primo in BASES_MILLER_RABIN:
+        if numero % primo == 0:
+            return numero == primo
+
+    d = numero - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for base in BASES_MILLER_RABIN:
+        x = pow(base, d, numero)
+        if x == 1 or x == numero - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % numero
+            if x == numero - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _crivar_segmento(inicio, fim, primos_base):
+    """
+    Crivo dos ímpares em [inicio, fim). A posição k do bytearray retornado
+    representa o número primeiro_impar + 2k e vale 1 se ele não tem divisor
+    em primos_base (lista de primos ímpares).
+    """
+    primeiro_impar = inicio | 1
+    tamanho = max(0, (fim - primeiro_impar + 1) // 2)
+    segmento = bytearray(b"\x01") * tamanho
+
+    for primo in primos_base:
+        quadrado = primo * primo
+        if quadrado >= fim:
+            break
+        multiplo = max(quadrado, -(-primeiro_impar // primo) * primo)
+        if multiplo % 2 == 0:
+            multiplo += primo
+        posicao = (multiplo - primeiro_impar) // 2
+        if posicao < tamanho:
+            segmento[posicao::primo] = bytes((tamanho - 1 - posicao) // primo + 1)
+
+    if primeiro_impar == 1 and tamanho:
+        segmento[0] = 0  # 1 não é primo
+    return primeiro_impar, segmento
+
+
+class CrivoPrimos:
+    def __init__(self, limite_maximo=LIMITE_MAXIMO_CACHE, tamanho_segmento=TAMANHO_SEGMENTO):
+        # Limites pares mantêm os segmentos alinhados com os índices do crivo
+        self.limite_maximo = limite_maximo - limite_maximo % 2
+        self.tamanho_segmento = tamanho_segmento - tamanho_segmento % 2
+        self.limite = 0                # O cache cobre os números em [0, limite)
+        self.crivo = bytearray()       # Posição i representa o número 2i + 1
+        self._primos_base = []
+        self._primos_base_ate = 0
+        self._crescer(min(LIMITE_INICIAL, limite_maximo))
+
+    def _crescer(self, novo_limite):
+        novo_limite = min(novo_limite + (novo_limite & 1), self.limite_maximo)
+        if novo_limite <= self.limite:
+            return
+        raiz = math.isqrt(novo_limite - 1)
+        if raiz >= self.limite and self.limite:
+            self._crescer(raiz + 1)
+
+        base = self._primos_impares_ate(raiz) if self.limite else _primos_impares_simples(raiz)
+        for inicio in range(self.limite, novo_limite, self.tamanho_segmento):
+            fim = min(inicio + self.tamanho_segmento, novo_limite)
+            _, segmento = _crivar_segmento(inicio, fim, base)
+            self.crivo += segmento
+        self.limite = novo_limite
+
+    def _primos_impares_ate(self, limite):
+        """
+        Lista dos primos ímpares até limite (inclusive), tirada do cache.
+        """
+        if limite > self._primos_base_ate:
+            tamanho = (limite + 1) // 2
+            posicoes = itertools.compress(range(1, tamanho), self.crivo[1:tamanho])
+            self._primos_base = [2 * i + 1 for i in posicoes]
+            self._primos_base_ate = limite
+        return self._primos_base[:bisect.bisect_right(self._primos_base, limite)]
+
+    def eh_primo(self, numero):
+        if numero < self.limite:
+            if numero < 3:
+                return numero == 2
+            return numero % 2 == 1 and self.crivo[numero // 2] == 1
+        if numero < self.limite_maximo:
+            self._crescer(max(numero + 1, 2 * self.limite))
+            return self.eh_primo(numero)
+        return miller_rabin(numero)
+
+    def _segmentos(self, a, b):
+        """
+        Gera (primeiro_impar, bytearray) cobrindo os ímpares de [a, b].
+        """
+        fim_total = b + 1
+        raiz = math.isqrt(b)
+        self._crescer(raiz + 1)
+        base = self._primos_impares_ate(min(raiz, self.limite - 1))
+        base_completa = raiz < self.limite
+
+        for inicio in range(a, fim_total, self.tamanho_segmento):
+            fim = min(inicio + self.tamanho_segmento, fim_total)
+            if fim <= self.limite:
+                primeiro_impar = inicio | 1
+                yield primeiro_impar, self.crivo[primeiro_impar // 2:fim // 2]
+                continue
+
+            primeiro_impar, segmento = _crivar_segmento(inicio, fim, base)
+            if not base_completa:
+                # Sobraram números sem divisor até o limite do cache: só
+                # compostos com todos os fatores acima dele, que o
+                # Miller-Rabin elimina.
+                for posicao in itertools.compress(range(len(segmento)), segmento):
+                    if not miller_rabin(primeiro_impar + 2 * posicao):
+                        segmento[posicao] = 0
+            yield primeiro_impar, segmento
+
+    def primos_entre(self, a, b):
+        """
+        Gera os primos de a até b (inclusive), em ordem crescente.
+        """
+        a = max(a, 0)
+        if a <= 2 <= b:
+            yield 2
+        if b < 3:
+            return
+        for primeiro_impar, segmento in self._segmentos(max(a, 3), b):
+            for posicao in itertools.compress(range(len(segmento)), segmento):
+                yield primeiro_impar + 2 * posicao
+
+    def contar_primos(self, a, b):
+        """
+        Quantidade de primos de a até b (inclusive).
+        """
+        a = max(a, 0)
+        total = 1 if a <= 2 <= b else 0
+        if b < 3:
+            return total
+        for _, segmento in self._segmentos(max(a, 3), b):
+            total += segmento.count(1)
+        return total
+
+
+def _primos_impares_simples(limite):
+    if limite < 3:
+        return []
+    _, crivo = _crivar_segmento(0, limite + 1, [])
+    for i in range(1, (math.isqrt(limite) + 1) // 2):
+        if crivo[i]:
+            primo = 2 * i + 1
+            inicio = primo * primo // 2
+            crivo[inicio::primo] = bytes(len(range(inicio, len(crivo), primo)))
+    return [2 * i + 1 for i in itertools.compress(range(len(crivo)), crivo)]
+
+
+_crivo_padrao = CrivoPrimos()
+
+
+def eh_primo(numero):
+    return _crivo_padrao.eh_primo(numero)
+
+
+def primos_entre(a, b):
+    return _crivo_padrao.primos_entre(a, b)
+
+
+def contar_primos(a, b):
+    return _crivo_padrao.contar_primos(a, b)
+
+
+def benchmark(limite=2_000_000, intervalo=10_000_000):
+    t0 = time.perf_counter()
+    esperado = [eh_primo_divisao(n) for n in range(limite)]
+    tempo_original = time.perf_counter() - t0
+
+    crivo = CrivoPrimos()
+    t0 = time.perf_counter()
+    resultado = [crivo.eh_primo(n) for n in range(limite)]
+    tempo_crivo = time.perf_counter() - t0
+    assert resultado == esperado
+
+    print(f"eh_primo para 0..{limite - 1}")
+    print(f"Divisão por tentativa: {tempo_original:.2f} s")
+    print(f"Crivo em cache: {tempo_crivo:.2f} s ({tempo_original / tempo_crivo:.1f}x)")
+
+    t0 = time.perf_counter()
+    total = crivo.contar_primos(0, intervalo)
+    print(f"contar_primos(0, {intervalo}) = {total} em {time.perf_counter() - t0:.2f} s")
+
+    inicio = 10 ** 12
+    t0 = time.perf_counter()
+    total = crivo.contar_primos(inicio, inicio + intervalo)
+    print(f"contar_primos(10^12, 10^12 + {intervalo}) = {total} "
+          f"em {time.perf_counter() - t0:.2f} s")
+
+    grandes = [2 ** 61 - 1, 2 ** 64 - 59, 2 ** 64 - 1, 18446744073709551557]
+    t0 = time.perf_counter()
+    resultados = [crivo.eh_primo(n) for n in grandes]
+    print(f"Miller-Rabin em valores de 64 bits: {resultados} "
+          f"em {(time.perf_counter() - t0) * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:]))
@@ -0,0 +1,123 @@
+# Exercício: Gerar links de perfil para tabelas inteiras de usuários
+#📝 Descrição:
+#generate_link chama urllib.parse.quote para cada nome, mesmo quando o nome
+#  já é seguro em uma URL (o caso mais comum) ou já apareceu antes.
+#  Aqui os nomes seguros passam direto, os outros são codificados uma vez e
+#  guardados em um cache LRU limitado, e a saída é gravada em blocos grandes.
+
+"""
+📥 Entrada:
+Um iterável de nomes de usuário (ou um arquivo com um nome por linha).
+
+📤 Saída:
+Os mesmos links de generate_link, na mesma ordem.
+"""
+
+import itertools
+import os
+import random
+import re
+import string
+import sys
+import tempfile
+import time
+import urllib.parse
+from functools import lru_cache
+
+from ex_001 import generate_link
+
+PREFIXO = "http://www.codewars.com/users/"
+TAMANHO_CACHE = 65536
+LINKS_POR_BLOCO = 16384
+
+# Caracteres que urllib.parse.quote nunca altera (com safe="/", o padrão)
+_SEGURO = re.compile(r"[A-Za-z0-9_.~/-]*").fullmatch
+
+
+def _link(nome):
+    if _SEGURO(nome):
+        return PREFIXO + nome
+    return PREFIXO + urllib.parse.quote(nome)
+
+
+def generate_links(nomes, tamanho_cache=TAMANHO_CACHE):
+    """
+    Gera o link de cada nome, igual a generate_link. Os links dos nomes
+    mais recentes ficam em um cache LRU: um nome repetido custa só uma
+    consulta ao cache, feita em C junto com o map.
+    """
+    yield from map(lru_cache(maxsize=tamanho_cache)(_link), nomes)
+
+
+def escrever_links(nomes, saida, tamanho_cache=TAMANHO_CACHE, links_por_bloco=LINKS_POR_BLOCO):
+    """
+    Grava os links (um por linha) no arquivo saida, que pode ser um caminho
+    ou um arquivo já aberto em modo texto, em blocos de links_por_bloco
+    linhas. Retorna a quantidade de links.
+    """
+    if isinstance(saida, (str, os.PathLike)):
+        with open(saida, "w", encoding="utf-8", buffering=1 << 20) as arquivo:
+            return escrever_links(nomes, arquivo, tamanho_cache, links_por_bloco)
+
+    total = 0
+    links = generate_links(nomes, tamanho_cache)
+    while bloco := list(itertools.islice(links, links_por_bloco)):
+        bloco.append("")  # Quebra de linha depois do último link
+        saida.write("\n".join(bloco))
+        total += len(bloco) - 1
+    return total
+
+
+def converter_arquivo(entrada, saida, **opcoes):
+    """
+    Lê um nome por linha do arquivo entrada e grava os links em saida.
+    """
+    with open(entrada, encoding="utf-8") as arquivo:
+        return escrever_links((linha.rstrip("\r\n") for linha in arquivo), saida, **opcoes)
+
+
+def _gerar_nomes(quantidade, semente=1):
+    sorteio = random.Random(semente)
+    letras = string.ascii_letters + string.digits + "_-."
+    # Alguns nomes com espaço, acento ou símbolos, e muitos repetidos
+    especiais = ["João Silva", "maria@dev", "zé_ninguém", "a/b", "100%", "ñandú", "x y", "C#"]
+    distintos = ["".join(sorteio.choices(letras, k=sorteio.randint(4, 14))) for _ in range(50_000)]
+    nomes = []
+    for _ in range(quantidade):
+        if sorteio.random() < 0.05:
+            nomes.append(sorteio.choice(especiais) + str(sorteio.randrange(100)))
+        else:
+            nomes.append(sorteio.choice(distintos))
+    return nomes
+
+
+def benchmark(quantidade=10_000_000):
+    nomes = _gerar_nomes(quantidade)
+
+    t0 = time.perf_counter()
+    esperado = [generate_link(nome) for nome in nomes]
+    tempo_original = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    resultado = list(generate_links(nomes))
+    tempo_lote = time.perf_counter() - t0
+    assert resultado == esperado
+    del esperado, resultado
+
+    with tempfile.TemporaryDirectory() as pasta:
+        t0 = time.perf_counter()
+        total = escrever_links(nomes, os.path.join(pasta, "links.txt"))
+        tempo_arquivo = time.perf_counter() - t0
+
+    print(f"{quantidade:,} nomes")
+    print(f"generate_link: {quantidade / tempo_original:,.0f} nomes/s")
+    print(f"generate_links: {quantidade / tempo_lote:,.0f} nomes/s "
+          f"({tempo_original / tempo_lote:.1f}x)")
+    print(f"escrever_links em arquivo: {total / tempo_arquivo:,.0f} nomes/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        print(f"{converter_arquivo(sys.argv[1], sys.argv[2])} links gravados.")
+    else:
+        benchmark(*map(int, sys.argv[1:]))
@@ -30,25 +30,25 @@ if __name__ == "__main__":
     resultado = eh_palindromo(palavra)
     print(resultado)
 
-# Testando a função com exemplos
-palavras = [
-    "arara",
-    "radar",
-    "reviver",
-    "python",
-    "socorram me subi no onibus em marrocos",
-    "a base do teto desaba",
-    "anotaram a data da maratona",
-    "a mala nada na lama",
-    "a grama é amarga",
-    "a lata é tália",
-    "a torre da derrota",
-    "a vida é a arte do encontro",
-    "a cara rajada da jararaca",
-    "a dama admirou o rim da amada",
-    "a mãe te ama"
-]
-
-for palavra in palavras:
-    resultado = eh_palindromo(palavra)
-    print(f"{palavra}: {resultado}")
+    # Testando a função com exemplos
+    palavras = [
+        "arara",
+        "radar",
+        "reviver",
+        "python",
+        "socorram me subi no onibus em marrocos",
+        "a base do teto desaba",
+        "anotaram a data da maratona",
+        "a mala nada na lama",
+        "a grama é amarga",
+        "a lata é tália",
+        "a torre da derrota",
+        "a vida é a arte do encontro",
+        "a cara rajada da jararaca",
+        "a dama admirou o rim da amada",
+        "a mãe te ama"
+    ]
+
+    for palavra in palavras:
+        resultado = eh_palindromo(palavra)
+        print(f"{palavra}: {resultado}")
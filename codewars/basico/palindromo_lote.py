@@ -0,0 +1,275 @@
+# Exercício: Verificar palíndromos em textos grandes e em lote
+#📝 Descrição:
+#A função eh_palindromo remove os espaços, converte para minúsculas e compara
+#  com uma cópia invertida: são três cópias completas da entrada, e os acentos
+#  não são ignorados ("a mãe te ama" falha).
+#  Aqui a verificação anda com dois ponteiros, um de cada ponta, lendo blocos
+#  de tamanho fixo, sem copiar a entrada inteira.
+#  Listas de frases curtas são dobradas em lotes, com um único translate
+#  em Latin-1 para o lote inteiro.
+
+"""
+📥 Entrada:
+Uma str, bytes (UTF-8), memoryview, um arquivo mapeado em memória, ou uma
+lista/arquivo de frases.
+
+📤 Saída:
+True ou False para cada texto. Só letras e dígitos contam: espaços e
+pontuação são pulados, maiúsculas e acentos são ignorados ("á" == "A").
+"""
+
+import mmap
+import os
+import sys
+import time
+import tracemalloc
+
+try:
+    from utilitarios import TabelaTraducao, dobrar_caractere, lotes
+except ImportError:  # Executado da própria pasta: a raiz do repositório não está no caminho
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+    from utilitarios import TabelaTraducao, dobrar_caractere, lotes
+
+from palindromo import eh_palindromo
+
+TAMANHO_BLOCO = 1 << 16
+FRASES_POR_LOTE = 4096
+
+
+def _dobrar_caractere(caractere):
+    # Letra base em minúsculas, ou "" se não for letra nem dígito
+    return dobrar_caractere(caractere) if caractere.isalnum() else ""
+
+
+# Tabela para str.translate, com Latin-1 e Latin Extended A/B pré-calculados
+TABELA_DOBRA = TabelaTraducao(_dobrar_caractere, [range(0x250)])
+
+# Caminho rápido para blocos só com ASCII: bytes.translate é bem mais rápido
+# que str.translate com um dicionário.
+_ASCII_MINUSCULAS = bytes(range(256)).lower()
+_ASCII_IGNORADOS = bytes(b for b in range(128) if not chr(b).isalnum()) + bytes(range(128, 256))
+
+
+# Caminho para textos curtos em Latin-1, em que cada caractere é um byte: a
+# tabela de bytes.translate dobra e apaga sem consultar o dicionário. Os
+# poucos caracteres que não dobram para um único caractere Latin-1 ("ß" vira
+# "ss", "µ" vira "μ") viram \0, que não sobra de nenhum outro caractere, e
+# mandam o texto para TABELA_DOBRA.
+_LATIN1_DOBRA = bytearray(256)
+for _codigo in range(256):
+    _valor = TABELA_DOBRA[_codigo]
+    if _valor and not (len(_valor) == 1 and ord(_valor) < 256):
+        _valor = "\0"
+    _LATIN1_DOBRA[_codigo] = ord(_valor) if _valor else 0
+_LATIN1_DOBRA = bytes(_LATIN1_DOBRA)
+_LATIN1_APAGADOS = bytes(b for b in range(256) if not TABELA_DOBRA[b])
+# Para várias frases de uma vez, unidas por "\n", que então é mantido
+_LATIN1_DOBRA_LINHAS = _LATIN1_DOBRA[:10] + b"\n" + _LATIN1_DOBRA[11:]
+_LATIN1_APAGADOS_LINHAS = _LATIN1_APAGADOS.replace(b"\n", b"")
+
+
+def _eh_palindromo_curto(texto):
+    # Texto que cabe em um bloco: basta dobrar e comparar com o reverso
+    try:
+        dobrado = texto.encode("latin-1").translate(_LATIN1_DOBRA, _LATIN1_APAGADOS)
+        if b"\0" not in dobrado:
+            return dobrado == dobrado[::-1]
+    except UnicodeEncodeError:
+        pass
+    dobrado = texto.translate(TABELA_DOBRA)
+    return dobrado == dobrado[::-1]
+
+
+def _dobrar(bloco):
+    if bloco.isascii():
+        return bloco.encode("ascii").translate(_ASCII_MINUSCULAS, _ASCII_IGNORADOS).decode("ascii")
+    return bloco.translate(TABELA_DOBRA)
+
+
+def _dobrar_utf8(bloco):
+    if bloco.isascii():
+        return bloco.translate(_ASCII_MINUSCULAS, _ASCII_IGNORADOS).decode("ascii")
+    return bloco.decode("utf-8", errors="replace").translate(TABELA_DOBRA)
+
+
+def _eh_continuacao(dados, posicao):
+    return (dados[posicao] & 0xC0) == 0x80
+
+
+def _verificar(ler_esquerda, ler_direita, tamanho):
+    """
+    Compara o texto dobrado vindo da esquerda com o vindo da direita. Cada
+    ponta só lê um novo bloco quando o seu buffer esvazia; quando as pontas
+    se encontram, o que sobrou no meio precisa ser um palíndromo.
+    """
+    inicio, fim = 0, tamanho
+    esquerda = direita = ""
+
+    while True:
+        while not esquerda and inicio < fim:
+            esquerda, inicio = ler_esquerda(inicio, fim)
+        while not direita and inicio < fim:
+            direita, fim = ler_direita(inicio, fim)
+        if not esquerda or not direita:
+            break
+
+        n = min(len(esquerda), len(direita))
+        if esquerda[:n] != direita[:-n - 1:-1]:
+            return False
+        esquerda = esquerda[n:]
+        direita = direita[:len(direita) - n]
+
+    meio = esquerda + direita
+    return meio == meio[::-1]
+
+
+def _eh_palindromo_str(texto, tamanho_bloco):
+    def ler_esquerda(inicio, fim):
+        corte = min(inicio + tamanho_bloco, fim)
+        return _dobrar(texto[inicio:corte]), corte
+
+    def ler_direita(inicio, fim):
+        corte = max(fim - tamanho_bloco, inicio)
+        return _dobrar(texto[corte:fim]), corte
+
+    return _verificar(ler_esquerda, ler_direita, len(texto))
+
+
+def _eh_palindromo_bytes(dados, tamanho_bloco):
+    # Os blocos são ajustados para nunca cortar um caractere UTF-8 ao meio
+    def ler_esquerda(inicio, fim):
+        corte = min(inicio + tamanho_bloco, fim)
+        while inicio < corte < fim and _eh_continuacao(dados, corte):
+            corte += 1
+        return _dobrar_utf8(bytes(dados[inicio:corte])), corte
+
+    def ler_direita(inicio, fim):
+        corte = max(fim - tamanho_bloco, inicio)
+        while inicio < corte < fim and _eh_continuacao(dados, corte):
+            corte -= 1
+        return _dobrar_utf8(bytes(dados[corte:fim])), corte
+
+    return _verificar(ler_esquerda, ler_direita, len(dados))
+
+
+def eh_palindromo_rapido(texto, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Verifica se texto é um palíndromo ignorando acentos, maiúsculas e tudo o
+    que não for letra ou dígito. Aceita str, bytes/bytearray/memoryview em
+    UTF-8 e objetos mmap, lendo no máximo tamanho_bloco de cada ponta por vez.
+    """
+    if isinstance(texto, str):
+        if len(texto) <= tamanho_bloco:
+            return _eh_palindromo_curto(texto)
+        return _eh_palindromo_str(texto, tamanho_bloco)
+    if isinstance(texto, memoryview):
+        texto = texto.cast("B")
+    return _eh_palindromo_bytes(texto, tamanho_bloco)
+
+
+def eh_palindromo_arquivo(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Verifica se o conteúdo inteiro de um arquivo UTF-8 é um palíndromo,
+    mapeando o arquivo em memória em vez de lê-lo.
+    """
+    with open(caminho, "rb") as arquivo:
+        try:
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Arquivo vazio não pode ser mapeado
+            return True
+        with mapa:
+            return _eh_palindromo_bytes(mapa, tamanho_bloco)
+
+
+def _dobrar_lote(frases):
+    # Dobra frases curtas com um único encode e um único translate; None se
+    # alguma frase não for str em Latin-1, for longa ou tiver "\n"
+    if max(map(len, frases)) > TAMANHO_BLOCO:
+        return None
+    try:
+        dados = "\n".join(frases).encode("latin-1")
+    except (TypeError, UnicodeEncodeError):
+        return None
+    if dados.count(b"\n") != len(frases) - 1:
+        return None
+    dobrado = dados.translate(_LATIN1_DOBRA_LINHAS, _LATIN1_APAGADOS_LINHAS)
+    if b"\0" in dobrado:
+        return None
+    return dobrado.split(b"\n")
+
+
+def verificar_palindromos(frases):
+    """
+    Gera (frase, resultado) para cada frase do iterável. As frases curtas
+    são dobradas em lotes e cada uma só é comparada com o seu reverso; os
+    outros lotes passam frase a frase por eh_palindromo_rapido.
+    """
+    for lote in lotes(frases, FRASES_POR_LOTE):
+        dobradas = _dobrar_lote(lote)
+        if dobradas is None:
+            for frase in lote:
+                yield frase, eh_palindromo_rapido(frase)
+        else:
+            yield from zip(lote, [dobrado == dobrado[::-1] for dobrado in dobradas])
+
+
+def verificar_arquivo_de_frases(caminho):
+    """
+    Gera (frase, resultado) para cada linha de um arquivo de frases.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        yield from verificar_palindromos(linha.rstrip("\r\n") for linha in arquivo)
+
+
+def _medir(funcao, *argumentos):
+    t0 = time.perf_counter()
+    resultado = funcao(*argumentos)
+    tempo = time.perf_counter() - t0
+
+    tracemalloc.start()
+    funcao(*argumentos)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return resultado, tempo, pico
+
+
+def benchmark(repeticoes=500_000):
+    frase = "socorram me subi no onibus em marrocos "
+    metade = frase * repeticoes
+    texto = metade + metade[::-1]
+    megabytes = len(texto) / 1e6
+
+    original, tempo_original, pico_original = _medir(eh_palindromo, texto)
+    rapido, tempo_rapido, pico_rapido = _medir(eh_palindromo_rapido, texto)
+    assert original == "É um palíndromo" and rapido
+
+    print(f"Texto de {megabytes:.1f} MB")
+    print(f"eh_palindromo: {tempo_original:.3f} s, pico de memória {pico_original / 1e6:.1f} MB")
+    print(f"eh_palindromo_rapido: {tempo_rapido:.3f} s, pico de memória {pico_rapido / 1e6:.2f} MB")
+
+    # Texto que falha logo no início: a comparação por pontas para cedo
+    diferente = "x" + texto
+    _, tempo_original, _ = _medir(eh_palindromo, diferente)
+    _, tempo_rapido, _ = _medir(eh_palindromo_rapido, diferente)
+    print(f"Não palíndromo: {tempo_original * 1e3:.1f} ms contra {tempo_rapido * 1e3:.2f} ms")
+
+    frases = ["a mãe te ama", "A grama é amarga", "Anotaram a data da maratona",
+              "python", "Socorram-me, subi no ônibus em Marrocos!"] * 100_000
+    t0 = time.perf_counter()
+    for frase in frases:
+        eh_palindromo(frase)
+    tempo_original = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in verificar_palindromos(frases):
+        pass
+    tempo_rapido = time.perf_counter() - t0
+    print(f"{len(frases)} frases curtas: {len(frases) / tempo_original:,.0f} frases/s "
+          f"contra {len(frases) / tempo_rapido:,.0f} frases/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for caminho in sys.argv[1:]:
+            print(f"{caminho}: {eh_palindromo_arquivo(caminho)}")
+    else:
+        benchmark()
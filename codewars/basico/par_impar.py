@@ -10,11 +10,11 @@ if __name__ == "__main__":
     resultado = par_ou_impar(numero)
     print(f"O número {numero} é {resultado}.")
 
-print("$==============================================$")
+    print("$==============================================$")
 
-# Testando a função com números pares e ímpares
-numeros = [2, 3, 4, 5, 6, 7, 8, 9, 10]
-for numero in numeros:
-    resultado = par_ou_impar(numero)
-    print(f"O número {numero} é {resultado}.")
+    # Testando a função com números pares e ímpares
+    numeros = [2, 3, 4, 5, 6, 7, 8, 9, 10]
+    for numero in numeros:
+        resultado = par_ou_impar(numero)
+        print(f"O número {numero} é {resultado}.")
 
@@ -0,0 +1,233 @@
+# Exercício: Classificar colunas inteiras de números em par ou ímpar
+#📝 Descrição:
+#par_ou_impar calcula numero % 2 e devolve uma string "Par"/"Ímpar" por
+#  chamada. Para colunas com centenas de milhões de inteiros, aqui a
+#  paridade é o bit mais baixo (& 1) calculado em arrays NumPy, e o resultado
+#  pode ser uma máscara booleana (ou compactada em bits) ou só as contagens.
+#  Nos arquivos a paridade vem direto dos bytes: o último dígito de cada
+#  número no texto, o byte menos significativo de cada número no binário.
+
+"""
+📥 Entrada:
+Um array NumPy (ou iterável) de inteiros, um arquivo de texto com inteiros
+separados por espaços ou quebras de linha, ou um arquivo binário de
+inteiros de tamanho fixo (tipo no formato do NumPy, como "<i8").
+
+📤 Saída:
+"Par"/"Ímpar" para cada número (como par_ou_impar), uma máscara com
+True (ou 1) para os ímpares, ou as contagens (pares, impares).
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+try:
+    import numpy as np
+except ImportError:  # Sem NumPy as máscaras são bytes com 0 ou 1 por número
+    np = None
+
+from par_impar import par_ou_impar
+
+NOMES = ("Par", "Ímpar")
+BYTES_POR_BLOCO = 1 << 24
+
+_DIGITOS_E_SINAIS = b"0123456789+-"
+_PERMITIDOS_TEXTO = _DIGITOS_E_SINAIS + b" \t\n\r\v\f"
+# bytes.translate: cada byte vira o seu bit mais baixo
+_BIT_BAIXO = bytes(b & 1 for b in range(256))
+
+
+def mascara_impares(numeros):
+    """
+    True para cada número ímpar. Com NumPy, um array bool calculado com
+    & 1 (que também vale para negativos: -3 & 1 == 1, como -3 % 2 == 1).
+    """
+    if np is not None:
+        numeros = np.asarray(numeros)
+        if numeros.dtype.kind not in "iubO":  # O: inteiros Python grandes demais para int64
+            raise TypeError(f"Paridade só para inteiros, não {numeros.dtype}.")
+        return (numeros & 1).astype(bool)
+    return bytes(numero & 1 for numero in numeros)
+
+
+def classificar(numeros):
+    """
+    "Par" ou "Ímpar" para cada número, na mesma ordem.
+    """
+    mascara = mascara_impares(numeros)
+    if np is not None:
+        return np.array(NOMES)[mascara.view(np.uint8)]
+    return [NOMES[impar] for impar in mascara]
+
+
+def contar(mascara):
+    """
+    (pares, impares) de uma máscara de ímpares.
+    """
+    if np is not None:
+        impares = int(np.count_nonzero(mascara))
+    else:
+        impares = mascara.count(1)
+    return len(mascara) - impares, impares
+
+
+def contar_pares_impares(numeros):
+    return contar(mascara_impares(numeros))
+
+
+def compactar(mascara):
+    """
+    Máscara com um bit por número (np.packbits, ordem big-endian dos bits).
+    """
+    if np is not None:
+        return np.packbits(mascara)
+    compactada = bytearray((len(mascara) + 7) // 8)
+    for posicao, impar in enumerate(mascara):
+        if impar:
+            compactada[posicao >> 3] |= 0x80 >> (posicao & 7)
+    return bytes(compactada)
+
+
+def _paridade_texto(bloco):
+    # bloco termina em espaço (ou está vazio) e só tem dígitos, sinais e espaços
+    if bloco.translate(None, _PERMITIDOS_TEXTO):
+        raise ValueError("O arquivo tem algo que não é um número inteiro.")
+    if np is None:
+        tokens = bloco.split()
+        if any(not token.lstrip(b"+-").isdigit() or len(token.lstrip(b"+-")) < len(token) - 1
+               for token in tokens):
+            raise ValueError("O arquivo tem algo que não é um número inteiro.")
+        return bytes(token[-1] & 1 for token in tokens)
+
+    dados = np.frombuffer(bloco, dtype=np.uint8)
+    digito = (dados >= ord("0")) & (dados <= ord("9"))
+    sinal = (dados == ord("+")) | (dados == ord("-"))
+    # Um sinal só pode vir no começo do número e antes de um dígito
+    posicoes = np.flatnonzero(sinal)
+    if len(posicoes):
+        antes_ok = (posicoes == 0) | ~(digito | sinal)[np.maximum(posicoes - 1, 0)]
+        if not (antes_ok & digito[posicoes + 1]).all():
+            raise ValueError("O arquivo tem algo que não é um número inteiro.")
+    # O último dígito de cada número decide a paridade ("0" é o byte 48, par)
+    ultimos = np.flatnonzero(digito[:-1] & ~digito[1:])
+    return (dados[ultimos] & 1).astype(bool)
+
+
+def ler_paridade_texto(arquivo, bytes_por_bloco=BYTES_POR_BLOCO):
+    """
+    Gera a máscara de ímpares de cada bloco de um arquivo de texto com
+    inteiros (ASCII) separados por espaços ou quebras de linha, sem
+    converter os números: vale para inteiros de qualquer tamanho.
+    """
+    if isinstance(arquivo, (str, os.PathLike)):
+        with open(arquivo, "rb") as aberto:
+            yield from ler_paridade_texto(aberto, bytes_por_bloco)
+        return
+    pendente = b""
+    while bloco := arquivo.read(bytes_por_bloco):
+        bloco = pendente + bloco if pendente else bloco
+        # O número no fim do bloco pode continuar no próximo
+        corte = len(bloco.rstrip(_DIGITOS_E_SINAIS))
+        pendente = bloco[corte:]
+        if corte:
+            yield _paridade_texto(bloco[:corte])
+    if pendente:
+        yield _paridade_texto(pendente + b"\n")
+
+
+def _posicao_bit_baixo(tipo):
+    # Posição do byte menos significativo em cada número do tipo
+    ordem, codigo = (tipo[0], tipo[1:]) if tipo[:1] in ("<", ">", "=", "|") else ("=", tipo)
+    if codigo[:1] not in ("i", "u") or codigo[1:] not in ("1", "2", "4", "8"):
+        raise ValueError(f"Tipo de inteiro não suportado: {tipo!r}")
+    tamanho = int(codigo[1:])
+    grande = ordem == ">" or ordem in ("=", "|") and sys.byteorder == "big"
+    return tamanho, tamanho - 1 if grande else 0
+
+
+def ler_paridade_binario(arquivo, tipo="<i8", numeros_por_bloco=BYTES_POR_BLOCO // 8):
+    """
+    Gera a máscara de ímpares de cada bloco de um arquivo binário de
+    inteiros do tipo informado. Só o byte menos significativo de cada
+    número é lido para a máscara.
+    """
+    if isinstance(arquivo, (str, os.PathLike)):
+        with open(arquivo, "rb") as aberto:
+            yield from ler_paridade_binario(aberto, tipo, numeros_por_bloco)
+        return
+    tamanho, deslocamento = _posicao_bit_baixo(tipo)
+    while bloco := arquivo.read(numeros_por_bloco * tamanho):
+        if len(bloco) % tamanho:
+            raise ValueError(f"O arquivo termina no meio de um número de {tamanho} bytes.")
+        if np is not None:
+            yield (np.frombuffer(bloco, dtype=np.uint8)[deslocamento::tamanho] & 1).astype(bool)
+        else:
+            yield bloco[deslocamento::tamanho].translate(_BIT_BAIXO)
+
+
+def contar_arquivo(caminho, tipo=None):
+    """
+    (pares, impares) de um arquivo de texto, ou binário quando tipo é
+    informado.
+    """
+    blocos = ler_paridade_texto(caminho) if tipo is None else ler_paridade_binario(caminho, tipo)
+    pares = impares = 0
+    for mascara in blocos:
+        pares_bloco, impares_bloco = contar(mascara)
+        pares += pares_bloco
+        impares += impares_bloco
+    return pares, impares
+
+
+def benchmark(quantidade=20_000_000):
+    sorteio = random.Random(24)
+    numeros = np.random.default_rng(24).integers(-10**12, 10**12, quantidade) if np is not None else \
+        [sorteio.randint(-10**12, 10**12) for _ in range(quantidade)]
+    lista = numeros.tolist() if np is not None else numeros
+    amostra = lista[:1_000_000]
+    assert list(classificar(amostra)) == [par_ou_impar(numero) for numero in amostra]
+
+    t0 = time.perf_counter()
+    impares_original = sum(par_ou_impar(numero) == "Ímpar" for numero in amostra)
+    tempo_original = (time.perf_counter() - t0) / len(amostra)
+    t0 = time.perf_counter()
+    pares, impares = contar_pares_impares(numeros)
+    tempo_lote = (time.perf_counter() - t0) / quantidade
+    assert contar_pares_impares(amostra)[1] == impares_original
+
+    print(f"{quantidade} inteiros")
+    print(f"par_ou_impar: {1 / tempo_original:,.0f} números/s")
+    print(f"contar_pares_impares (& 1): {1 / tempo_lote:,.0f} números/s ({tempo_original / tempo_lote:.1f}x), "
+          f"{pares} pares e {impares} ímpares")
+    if np is not None:
+        print(f"Máscara: {quantidade:,} bytes como bool, {len(compactar(mascara_impares(numeros))):,} "
+              f"bytes compactada em bits")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        texto, binario = os.path.join(pasta, "numeros.txt"), os.path.join(pasta, "numeros.bin")
+        with open(texto, "w") as arquivo:
+            arquivo.write("\n".join(map(str, lista)) + "\n")
+        with open(binario, "wb") as arquivo:
+            if np is not None:
+                numeros.astype("<i8").tofile(arquivo)
+            else:
+                arquivo.write(b"".join(numero.to_bytes(8, "little", signed=True) for numero in lista))
+
+        for nome, caminho, tipo in (("texto", texto, None), ("binário", binario, "<i8")):
+            t0 = time.perf_counter()
+            resultado = contar_arquivo(caminho, tipo)
+            tempo = time.perf_counter() - t0
+            assert resultado == (pares, impares)
+            print(f"Arquivo {nome} ({os.path.getsize(caminho) / 1e6:.0f} MB): "
+                  f"{quantidade / tempo:,.0f} números/s, {os.path.getsize(caminho) / tempo / 1e6:.0f} MB/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        pares, impares = contar_arquivo(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+        print(f"{pares} pares e {impares} ímpares.")
+    else:
+        benchmark(*map(int, sys.argv[1:]))
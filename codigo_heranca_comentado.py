@@ -64,26 +64,27 @@ class Professor(Pessoa):
     def ensinar(self):
         print(f"{self.nome} está ensinando {self.disciplina}.")
     
-# Criação de objetos - instanciando as classes
-
-# Instância da classe base
-pessoa = Pessoa("João", 30)
-# Instância da subclasse Estudante
-estudante = Estudante("Maria", 20, "12345")
-# Instância da subclasse Professor
-professor = Professor("Carlos", 40, "Matemática")
-
-# Demonstração do uso dos objetos
-print("\nInformações da Pessoa:")
-pessoa.exibir_info()  # Chamada de método da classe base
-print()
-
-print("\nInformações do Estudante:")
-estudante.exibir_info()  # Método herdado da classe base
-estudante.estudar()      # Método específico da subclasse
-print()
-
-print("\nInformações do Professor:")
-professor.exibir_info()  # Método herdado da classe base
-professor.ensinar()      # Método específico da subclasse
-print()
+if __name__ == "__main__":
+    # Criação de objetos - instanciando as classes
+
+    # Instância da classe base
+    pessoa = Pessoa("João", 30)
+    # Instância da subclasse Estudante
+    estudante = Estudante("Maria", 20, "12345")
+    # Instância da subclasse Professor
+    professor = Professor("Carlos", 40, "Matemática")
+
+    # Demonstração do uso dos objetos
+    print("\nInformações da Pessoa:")
+    pessoa.exibir_info()  # Chamada de método da classe base
+    print()
+
+    print("\nInformações do Estudante:")
+    estudante.exibir_info()  # Método herdado da classe base
+    estudante.estudar()      # Método específico da subclasse
+    print()
+
+    print("\nInformações do Professor:")
+    professor.exibir_info()  # Método herdado da classe base
+    professor.ensinar()      # Método específico da subclasse
+    print()
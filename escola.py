@@ -0,0 +1,259 @@
+"""
+Cadastro de escolas com milhões de pessoas
+
+Evolução do exemplo Pessoa/Estudante/Professor de codigo_heranca_comentado.py
+para carregar a lista completa de alunos e professores de uma rede de
+escolas. Lá cada objeto tem o seu próprio __dict__ e qualquer consulta
+precisaria percorrer todas as pessoas.
+
+Nesta versão:
+
+    1. Pessoa, Estudante e Professor usam __slots__ e mantêm os mesmos
+    atributos e métodos.
+    2. Escola guarda índices por matrícula, por disciplina e por idade,
+    atualizados a cada cadastro: as consultas não percorrem o cadastro.
+    3. importar_csv lê o arquivo linha a linha, sem carregá-lo inteiro.
+"""
+
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import codigo_heranca_comentado as heranca
+
+LARGURA_FAIXA_ETARIA = 5
+
+
+# Classe base: __slots__ troca o __dict__ de cada objeto por campos fixos
+class Pessoa:
+    __slots__ = ("nome", "idade")
+
+    def __init__(self, nome, idade):
+        self.nome = nome
+        self.idade = idade
+
+    exibir_info = heranca.Pessoa.exibir_info
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.nome!r}, {self.idade})"
+
+
+# Cada subclasse declara só os campos novos; os de Pessoa são herdados
+class Estudante(Pessoa):
+    __slots__ = ("matricula",)
+
+    def __init__(self, nome, idade, matricula):
+        Pessoa.__init__(self, nome, idade)
+        self.matricula = matricula
+
+    estudar = heranca.Estudante.estudar
+
+
+class Professor(Pessoa):
+    __slots__ = ("disciplina",)
+
+    def __init__(self, nome, idade, disciplina):
+        Pessoa.__init__(self, nome, idade)
+        self.disciplina = disciplina
+
+    ensinar = heranca.Professor.ensinar
+
+
+class Escola:
+    def __init__(self, largura_faixa=LARGURA_FAIXA_ETARIA):
+        self.largura_faixa = largura_faixa
+        self.pessoas = []                  # Quem não é estudante nem professor
+        self._por_matricula = {}           # matrícula -> Estudante
+        self._por_disciplina = {}          # disciplina -> [Professor]
+        self._estudantes_por_idade = {}    # idade -> [Estudante]
+
+    def __len__(self):
+        return len(self.pessoas) + len(self._por_matricula) + sum(map(len, self._por_disciplina.values()))
+
+    def adicionar(self, pessoa):
+        """
+        Cadastra uma Pessoa, um Estudante ou um Professor. A matrícula de
+        cada estudante deve ser única.
+        """
+        if isinstance(pessoa, Estudante):
+            if pessoa.matricula in self._por_matricula:
+                raise ValueError(f"Matrícula repetida: {pessoa.matricula}")
+            self._por_matricula[pessoa.matricula] = pessoa
+            self._estudantes_por_idade.setdefault(pessoa.idade, []).append(pessoa)
+        elif isinstance(pessoa, Professor):
+            self._por_disciplina.setdefault(pessoa.disciplina, []).append(pessoa)
+        else:
+            self.pessoas.append(pessoa)
+        return pessoa
+
+    def adicionar_estudante(self, nome, idade, matricula):
+        return self.adicionar(Estudante(nome, idade, matricula))
+
+    def adicionar_professor(self, nome, idade, disciplina):
+        return self.adicionar(Professor(nome, idade, disciplina))
+
+    def estudante(self, matricula):
+        """
+        Estudante com essa matrícula, ou None.
+        """
+        return self._por_matricula.get(matricula)
+
+    def professores_da_disciplina(self, disciplina):
+        return list(self._por_disciplina.get(disciplina, ()))
+
+    def disciplinas(self):
+        return sorted(self._por_disciplina)
+
+    def faixa_etaria(self, idade):
+        """
+        Faixa (inicio, fim) que contém a idade: com largura 5, 17 -> (15, 19).
+        """
+        inicio = idade - idade % self.largura_faixa
+        return inicio, inicio + self.largura_faixa - 1
+
+    def estudantes_por_idade(self, idade_min, idade_max):
+        """
+        Estudantes com idade_min <= idade <= idade_max, das idades mais novas
+        para as mais velhas. Só as idades cadastradas são consultadas.
+        """
+        resultado = []
+        if idade_max - idade_min < len(self._estudantes_por_idade):
+            idades = range(idade_min, idade_max + 1)
+        else:
+            idades = sorted(i for i in self._estudantes_por_idade if idade_min <= i <= idade_max)
+        for idade in idades:
+            resultado.extend(self._estudantes_por_idade.get(idade, ()))
+        return resultado
+
+    def estudantes_da_faixa(self, idade):
+        """
+        Estudantes da mesma faixa etária da idade informada.
+        """
+        return self.estudantes_por_idade(*self.faixa_etaria(idade))
+
+    def contagem_por_faixa(self):
+        """
+        Quantidade de estudantes em cada faixa etária, em ordem.
+        """
+        contagem = {}
+        for idade in sorted(self._estudantes_por_idade):
+            faixa = self.faixa_etaria(idade)
+            contagem[faixa] = contagem.get(faixa, 0) + len(self._estudantes_por_idade[idade])
+        return contagem
+
+    def importar_csv(self, caminho_csv):
+        """
+        Importa um CSV com cabeçalho tipo,nome,idade,matricula,disciplina,
+        em que tipo é pessoa, estudante ou professor. Retorna a quantidade
+        de pessoas importadas.
+        """
+        total = 0
+        with open(caminho_csv, newline="", encoding="utf-8") as arquivo:
+            for linha in csv.DictReader(arquivo):
+                tipo = linha["tipo"].strip().lower()
+                nome, idade = linha["nome"], int(linha["idade"])
+                if tipo == "estudante":
+                    self.adicionar(Estudante(nome, idade, linha["matricula"]))
+                elif tipo == "professor":
+                    self.adicionar(Professor(nome, idade, linha["disciplina"]))
+                elif tipo == "pessoa":
+                    self.adicionar(Pessoa(nome, idade))
+                else:
+                    raise ValueError(f"Tipo desconhecido na linha {total + 2}: {linha['tipo']!r}")
+                total += 1
+        return total
+
+
+DISCIPLINAS = ["Matemática", "Português", "História", "Geografia", "Física", "Química",
+               "Biologia", "Inglês", "Artes", "Educação Física"]
+
+
+def _gerar_csv(caminho, estudantes, professores, semente=3):
+    sorteio = random.Random(semente)
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["tipo", "nome", "idade", "matricula", "disciplina"])
+        for i in range(estudantes):
+            escritor.writerow(["estudante", f"Aluno {i}", sorteio.randint(5, 25), f"M{i:08d}", ""])
+        for i in range(professores):
+            escritor.writerow(["professor", f"Professor {i}", sorteio.randint(23, 70), "",
+                               sorteio.choice(DISCIPLINAS)])
+
+
+def _memoria(criar):
+    tracemalloc.start()
+    objeto = criar()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objeto, memoria
+
+
+def benchmark(estudantes=1_000_000, professores=50_000, consultas=200):
+    dados = [(f"Aluno {i}", 5 + i % 21, f"M{i:08d}") for i in range(estudantes)]
+    originais, memoria_original = _memoria(lambda: [heranca.Estudante(*d) for d in dados])
+    compactos, memoria_slots = _memoria(lambda: [Estudante(*d) for d in dados])
+    print(f"{estudantes} estudantes, memória por objeto: original {memoria_original / estudantes:.0f} "
+          f"bytes, com __slots__ {memoria_slots / estudantes:.0f} bytes")
+    del originais, compactos, dados
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "rede.csv")
+        _gerar_csv(caminho, estudantes, professores)
+        escola = Escola()
+        t0 = time.perf_counter()
+        total = escola.importar_csv(caminho)
+        print(f"{total} pessoas importadas do CSV em {time.perf_counter() - t0:.2f} s")
+
+    # Consultas com índice contra a busca em uma lista com todos
+    todos = list(escola._por_matricula.values())
+    for professores_disciplina in escola._por_disciplina.values():
+        todos.extend(professores_disciplina)
+    sorteio = random.Random(4)
+    matriculas = [f"M{sorteio.randrange(estudantes):08d}" for _ in range(consultas)]
+
+    t0 = time.perf_counter()
+    for matricula in matriculas:
+        esperado = next(p for p in todos if isinstance(p, Estudante) and p.matricula == matricula)
+    tempo_lista = (time.perf_counter() - t0) / consultas
+    t0 = time.perf_counter()
+    for matricula in matriculas:
+        encontrado = escola.estudante(matricula)
+    tempo_indice = (time.perf_counter() - t0) / consultas
+    assert encontrado is esperado
+    print(f"Estudante por matrícula: lista {tempo_lista * 1e3:.2f} ms, índice {tempo_indice * 1e6:.2f} µs")
+
+    t0 = time.perf_counter()
+    esperado = [p for p in todos if isinstance(p, Professor) and p.disciplina == "Física"]
+    tempo_lista = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    encontrados = escola.professores_da_disciplina("Física")
+    tempo_indice = time.perf_counter() - t0
+    assert encontrados == esperado
+    print(f"Professores de Física ({len(encontrados)}): lista {tempo_lista * 1e3:.1f} ms, "
+          f"índice {tempo_indice * 1e3:.3f} ms")
+
+    t0 = time.perf_counter()
+    esperado = [p for p in todos if isinstance(p, Estudante) and 15 <= p.idade <= 19]
+    tempo_lista = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    encontrados = escola.estudantes_da_faixa(17)
+    tempo_indice = time.perf_counter() - t0
+    assert sorted(encontrados, key=lambda e: e.matricula) == sorted(esperado, key=lambda e: e.matricula)
+    print(f"Estudantes de 15 a 19 anos ({len(encontrados)}): lista {tempo_lista * 1e3:.1f} ms, "
+          f"índice {tempo_indice * 1e3:.1f} ms")
+    print(f"Estudantes por faixa etária: {escola.contagem_por_faixa()}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        escola = Escola()
+        print(f"{escola.importar_csv(sys.argv[1])} pessoas importadas.")
+        print(f"Estudantes por faixa etária: {escola.contagem_por_faixa()}")
+        for disciplina in escola.disciplinas():
+            print(f"{disciplina}: {len(escola.professores_da_disciplina(disciplina))} professores")
+    else:
+        benchmark(*map(int, sys.argv[1:]))
@@ -5,44 +5,58 @@ que você gostaria de convidar para jantar. Em seguida, utilize sua lista para
 exibir uma mensagem para cada pessoa, convidando-a para jantar.
 """
 
-# Definindo a lista de convidados
-convidados = ['Albert Einstein', 'Jesus Cristo', 'Abraham Lincoln']
-
-# Exibindo mensagens de convite
-for convidado in convidados:
-    print(f"Olá {convidado}, você está convidado para um jantar especial!")
-
-# Adicionando um novo convidado à lista
-convidados.append('Marie Curie')
-print(f"\n{convidados[-1]} também está convidada para o jantar!")
-
-# Exibindo a lista atualizada de convidados
-print("\nLista atualizada de convidados:")
-for convidado in convidados:
-    print(convidado)
-
-# Adicionando mais convidados à lista
-convidados.insert(0, 'Leonardo da Vinci')
-convidados.insert(2, 'Mahatma Gandhi')
-convidados.append('Simão Pedro')
-print("\nNovos convidados foram adicionados à lista!")
-
-# Exibindo a lista atualizada de convidados
-print("\nLista atualizada de convidados:")
-for convidado in convidados:
-    print(convidado)
-
-# Removendo convidados da lista
-print("\nInfelizmente, não podemos convidar todos os convidados.")
-removidos = [convidados.pop(0), convidados.pop(2), convidados.pop(3)]
-print(f"\nOs seguintes convidados foram removidos da lista: {', '.join(removidos)}")
-# Exibindo a lista final de convidados
-print("\nLista final de convidados:")
-for convidado in convidados:
-    print(convidado)
-# Limpando a lista de convidados
-convidados.clear()
-print("\nTodos os convidados foram removidos da lista.")
-# Exibindo a lista final de convidados
-print("\nLista final de convidados:")
-print(convidados)
+import os
+import sys
+
+
+# Cada mensagem é gerada como uma linha; quem chama decide onde gravar
+def lista_de_convidados():
+    # Definindo a lista de convidados
+    convidados = ['Albert Einstein', 'Jesus Cristo', 'Abraham Lincoln']
+
+    # Exibindo mensagens de convite
+    for convidado in convidados:
+        yield f"Olá {convidado}, você está convidado para um jantar especial!\n"
+
+    # Adicionando um novo convidado à lista
+    convidados.append('Marie Curie')
+    yield f"\n{convidados[-1]} também está convidada para o jantar!\n"
+
+    # Exibindo a lista atualizada de convidados
+    yield "\nLista atualizada de convidados:\n"
+    for convidado in convidados:
+        yield f"{convidado}\n"
+
+    # Adicionando mais convidados à lista
+    convidados.insert(0, 'Leonardo da Vinci')
+    convidados.insert(2, 'Mahatma Gandhi')
+    convidados.append('Simão Pedro')
+    yield "\nNovos convidados foram adicionados à lista!\n"
+
+    # Exibindo a lista atualizada de convidados
+    yield "\nLista atualizada de convidados:\n"
+    for convidado in convidados:
+        yield f"{convidado}\n"
+
+    # Removendo convidados da lista
+    yield "\nInfelizmente, não podemos convidar todos os convidados.\n"
+    removidos = [convidados.pop(0), convidados.pop(2), convidados.pop(3)]
+    yield f"\nOs seguintes convidados foram removidos da lista: {', '.join(removidos)}\n"
+    # Exibindo a lista final de convidados
+    yield "\nLista final de convidados:\n"
+    for convidado in convidados:
+        yield f"{convidado}\n"
+    # Limpando a lista de convidados
+    convidados.clear()
+    yield "\nTodos os convidados foram removidos da lista.\n"
+    # Exibindo a lista final de convidados
+    yield "\nLista final de convidados:\n"
+    yield f"{convidados}\n"
+
+
+if __name__ == "__main__":
+    # saida.py fica na raiz do repositório
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+    import saida
+
+    saida.escrever(lista_de_convidados())
@@ -0,0 +1,214 @@
+"""
+Saída em blocos para scripts que imprimem muito
+
+Camada de saída compartilhada por use_a_cabeca/beersong.py,
+Veiculo.exibir_informacoes (clevison/exercicios/Desafios_2/desafio16.py) e
+intensivo/cap_3/ex_3.4.py. Esses scripts faziam um print por linha: com a
+saída redirecionada sem buffer (ou em um terminal, que descarrega a cada
+linha) cada print vira uma chamada de sistema, e cada chamada codifica o
+seu pedaço de texto separadamente.
+
+Nesta versão:
+
+    1. Os scripts geram as linhas com geradores, e escrever as junta em um
+    io.StringIO com writelines, gravando no destino um bloco grande por vez.
+    2. renderizar_bytes e exportar produzem o texto já codificado, para
+    exportar muitas saídas de uma vez.
+    3. O benchmark compara print linha a linha com a saída em blocos,
+    contando o tempo e as gravações no arquivo.
+"""
+
+import io
+import itertools
+import os
+import runpy
+import sys
+import tempfile
+import time
+
+TAMANHO_BLOCO = 1 << 16      # Caracteres acumulados antes de gravar no destino
+LINHAS_POR_VEZ = 1024        # Linhas passadas de uma vez para o writelines
+
+
+class SaidaEmBlocos:
+    """
+    Arquivo de texto que acumula o que recebe e grava no destino (por
+    padrão sys.stdout) só quando tem tamanho_bloco caracteres, ou no flush.
+    """
+
+    def __init__(self, destino=None, tamanho_bloco=TAMANHO_BLOCO):
+        self.destino = destino
+        self.tamanho_bloco = tamanho_bloco
+        self.gravacoes = 0
+        self._buffer = io.StringIO()
+
+    def write(self, texto):
+        self._buffer.write(texto)
+        if self._buffer.tell() >= self.tamanho_bloco:
+            self.flush()
+        return len(texto)
+
+    def writelines(self, linhas):
+        linhas = iter(linhas)
+        while True:
+            inicio = self._buffer.tell()
+            self._buffer.writelines(itertools.islice(linhas, LINHAS_POR_VEZ))
+            if self._buffer.tell() == inicio:
+                return
+            if self._buffer.tell() >= self.tamanho_bloco:
+                self.flush()
+
+    def flush(self):
+        texto = self._buffer.getvalue()
+        if texto:
+            # O destino é lido na hora: sys.stdout pode ter sido trocado
+            destino = self.destino if self.destino is not None else sys.stdout
+            destino.write(texto)
+            destino.flush()
+            self.gravacoes += 1
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        self.flush()
+
+
+def escrever(linhas, destino=None, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Grava as linhas (cada uma já com o seu "\\n") no destino, em blocos.
+    Retorna a quantidade de gravações.
+    """
+    with SaidaEmBlocos(destino, tamanho_bloco) as saida:
+        saida.writelines(linhas)
+    return saida.gravacoes
+
+
+def renderizar(linhas):
+    buffer = io.StringIO()
+    buffer.writelines(linhas)
+    return buffer.getvalue()
+
+
+def renderizar_bytes(linhas, encoding="utf-8"):
+    """
+    Todas as linhas já codificadas, com uma única codificação do texto.
+    """
+    return renderizar(linhas).encode(encoding)
+
+
+class _DestinoBinario:
+    # Destino para SaidaEmBlocos que codifica cada bloco uma única vez
+    def __init__(self, arquivo, encoding):
+        self.arquivo = arquivo
+        self.encoding = encoding
+        self.bytes = 0
+
+    def write(self, texto):
+        self.bytes += self.arquivo.write(texto.encode(self.encoding))
+
+    def flush(self):
+        pass
+
+
+def exportar(linhas, caminho, encoding="utf-8", tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Grava as linhas em um arquivo binário, codificando um bloco por vez.
+    Retorna a quantidade de bytes gravados.
+    """
+    with open(caminho, "wb") as arquivo:
+        destino = _DestinoBinario(arquivo, encoding)
+        escrever(linhas, destino, tamanho_bloco)
+    return destino.bytes
+
+
+class _ContadorGravacoes(io.RawIOBase):
+    # Arquivo binário que só conta as gravações (cada uma seria uma chamada
+    # de sistema em um arquivo de verdade) e descarta os dados
+    def __init__(self):
+        self.gravacoes = 0
+        self.bytes = 0
+
+    def writable(self):
+        return True
+
+    def write(self, dados):
+        self.gravacoes += 1
+        self.bytes += len(dados)
+        return len(dados)
+
+
+def _saida_sem_buffer():
+    # Como um terminal ou python -u: o texto é enviado a cada quebra de linha
+    contador = _ContadorGravacoes()
+    return contador, io.TextIOWrapper(io.BufferedWriter(contador), encoding="utf-8", line_buffering=True)
+
+
+def _medir(funcao):
+    contador, destino = _saida_sem_buffer()
+    stdout = sys.stdout
+    sys.stdout = destino
+    try:
+        t0 = time.perf_counter()
+        funcao()
+        destino.flush()
+        tempo = time.perf_counter() - t0
+    finally:
+        sys.stdout = stdout
+    return tempo, contador.gravacoes, contador.bytes
+
+
+def _scripts():
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    for pasta in ("use_a_cabeca", os.path.join("clevison", "exercicios", "Desafios_2")):
+        if os.path.join(raiz, pasta) not in sys.path:
+            sys.path.append(os.path.join(raiz, pasta))
+    import beersong
+    import desafio16
+    # "ex_3.4" não é um nome de módulo válido para import
+    ex_3_4 = runpy.run_path(os.path.join(raiz, "intensivo", "cap_3", "ex_3.4.py"))
+    return beersong, ex_3_4["lista_de_convidados"], desafio16
+
+
+def _repetir(gerar, vezes):
+    return itertools.chain.from_iterable(gerar() for _ in range(vezes))
+
+
+def benchmark(repeticoes=200, veiculos=20_000):
+    beersong, lista_de_convidados, desafio16 = _scripts()
+    frota = [desafio16.Veiculo("Ford", "Mustang", 2000 + i % 26, "Vermelho", 350000.0 + i)
+             for i in range(veiculos)]
+    cenarios = [
+        ("beersong", lambda: _repetir(beersong.song, repeticoes)),
+        ("ex_3.4", lambda: _repetir(lista_de_convidados, repeticoes)),
+        ("exibir_informacoes", lambda: itertools.chain.from_iterable(v.linhas_informacoes() for v in frota)),
+    ]
+
+    print(f"Saída sem buffer (como um terminal ou python -u); {repeticoes} execuções de cada script "
+          f"e {veiculos} veículos:")
+    for nome, linhas in cenarios:
+        def com_print():
+            for linha in linhas():
+                print(linha, end="")
+
+        tempo_print, gravacoes_print, bytes_print = _medir(com_print)
+        tempo_blocos, gravacoes_blocos, bytes_blocos = _medir(lambda: escrever(linhas()))
+        t0 = time.perf_counter()
+        dados = renderizar_bytes(linhas())
+        tempo_bytes = time.perf_counter() - t0
+        assert bytes_print == bytes_blocos == len(dados)
+        print(f"{nome}: print {tempo_print * 1e3:.0f} ms / {gravacoes_print} gravações, "
+              f"em blocos {tempo_blocos * 1e3:.0f} ms / {gravacoes_blocos} gravações "
+              f"({tempo_print / tempo_blocos:.1f}x), renderizar_bytes {tempo_bytes * 1e3:.0f} ms")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "frota.txt")
+        t0 = time.perf_counter()
+        total = exportar(cenarios[-1][1](), caminho)
+        print(f"exportar a frota para um arquivo: {total:,} bytes em {(time.perf_counter() - t0) * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    benchmark(*map(int, sys.argv[1:]))
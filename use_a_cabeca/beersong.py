@@ -1,16 +1,29 @@
-word = "bottles"
+import os
+import sys
 
-for beer_num in range(99, 0, -1):
-    print(beer_num, word, "of beer on the wall.")
-    print(beer_num, word, "of beer.")
-    print("Take on down.")
-    print("Pass it around.")
 
-    if beer_num == 1:
-        print("No more bottles of beer on the wall.")
-    else:
-        new_num = beer_num - 1
-        if new_num == 1:
-            word = "bottle"
-        print(new_num, word, "of beer on the wall.\n")
-    print()
+def song(bottles=99):
+    word = "bottles"
+
+    for beer_num in range(bottles, 0, -1):
+        yield f"{beer_num} {word} of beer on the wall.\n"
+        yield f"{beer_num} {word} of beer.\n"
+        yield "Take on down.\n"
+        yield "Pass it around.\n"
+
+        if beer_num == 1:
+            yield "No more bottles of beer on the wall.\n"
+        else:
+            new_num = beer_num - 1
+            if new_num == 1:
+                word = "bottle"
+            yield f"{new_num} {word} of beer on the wall.\n\n"
+        yield "\n"
+
+
+if __name__ == "__main__":
+    # saida.py fica na raiz do repositório
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+    import saida
+
+    saida.escrever(song())
@@ -0,0 +1,243 @@
+"""
+html.escape e html.unescape em fluxo
+
+Evolução do final de odd.py para higienizar exportações de HTML e logs com
+vários GB. html.escape e html.unescape recebem a string inteira, então o
+arquivo precisaria estar todo na memória.
+
+Nesta versão:
+
+    1. Os arquivos são processados em blocos grandes, com resultado idêntico
+    byte a byte ao de html.escape / html.unescape no texto inteiro (UTF-8).
+    2. escapar trabalha direto nos bytes: em UTF-8 os caracteres &, <, >, "
+    e ' nunca aparecem dentro de um caractere de vários bytes.
+    3. desescapar guarda para o bloco seguinte o fim de um bloco que pode ser
+    o começo de uma entidade (como "&hea" + "rts;"). Uma entidade nunca
+    contém "&", então cortar o texto antes de um "&" nunca muda o resultado.
+    4. Texto sem nenhum caractere especial é devolvido sem cópia (o mesmo
+    objeto), e cada entidade diferente é convertida uma única vez (cache).
+    5. processar_arquivos distribui arquivos independentes entre processos.
+"""
+
+import codecs
+import html
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+TAMANHO_BLOCO = 1 << 22
+
+# Mesma expressão que html.unescape usa para achar as entidades
+_ENTIDADE = re.compile(r"&(#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?)")
+_ESPECIAIS = re.compile(rb"[&<>\"']")
+_ESPECIAIS_SEM_ASPAS = re.compile(rb"[&<>]")
+_ESPECIAIS_TEXTO = re.compile(r"[&<>\"']")
+_ESPECIAIS_TEXTO_SEM_ASPAS = re.compile(r"[&<>]")
+
+
+def escapar(texto, quote=True):
+    """
+    html.escape para str ou bytes (UTF-8). Sem caracteres especiais, o
+    próprio texto é devolvido.
+    """
+    if isinstance(texto, str):
+        if (_ESPECIAIS_TEXTO if quote else _ESPECIAIS_TEXTO_SEM_ASPAS).search(texto) is None:
+            return texto
+        return html.escape(texto, quote)
+    if (_ESPECIAIS if quote else _ESPECIAIS_SEM_ASPAS).search(texto) is None:
+        return texto
+    texto = texto.replace(b"&", b"&amp;").replace(b"<", b"&lt;").replace(b">", b"&gt;")
+    if quote:
+        texto = texto.replace(b'"', b"&quot;").replace(b"'", b"&#x27;")
+    return texto
+
+
+@lru_cache(maxsize=4096)
+def _converter_entidade(nome):
+    return html.unescape("&" + nome)
+
+
+def desescapar(texto):
+    """
+    html.unescape, convertendo cada entidade diferente uma única vez. Sem
+    "&", o próprio texto é devolvido.
+    """
+    if "&" not in texto:
+        return texto
+    # split alterna texto e nome da entidade (sem o "&"); as entidades são
+    # convertidas por map, sem uma chamada Python por entidade encontrada
+    partes = _ENTIDADE.split(texto)
+    partes[1::2] = map(_converter_entidade, partes[1::2])
+    return "".join(partes)
+
+
+def _fim_seguro(texto):
+    # Até onde o texto pode ser convertido sem conhecer o bloco seguinte.
+    # Só a entidade que começa no último "&" pode continuar no próximo
+    # bloco: as anteriores terminam antes desse "&".
+    inicio = texto.rfind("&")
+    if inicio == -1:
+        return len(texto)
+    encontrada = _ENTIDADE.match(texto, inicio)
+    if encontrada is None:
+        # "&", "&#" e "&#x" ainda podem virar entidades
+        return inicio if len(texto) - inicio <= 3 else len(texto)
+    return inicio if encontrada.end() == len(texto) else len(texto)
+
+
+def escapar_fluxo(blocos, quote=True):
+    """
+    Gera os blocos (str ou bytes) escapados. Cada caractere é escapado
+    sozinho, então os blocos não dependem uns dos outros.
+    """
+    for bloco in blocos:
+        yield escapar(bloco, quote)
+
+
+def desescapar_fluxo(blocos):
+    """
+    Gera o texto desescapado de uma sequência de blocos str, com o mesmo
+    resultado de html.unescape("".join(blocos)).
+    """
+    pendente = ""
+    for bloco in blocos:
+        if pendente:
+            bloco = pendente + bloco
+        fim = _fim_seguro(bloco)
+        pendente = bloco[fim:]
+        if fim:
+            yield desescapar(bloco[:fim] if fim < len(bloco) else bloco)
+    if pendente:
+        yield desescapar(pendente)
+
+
+def _ler_blocos(arquivo, tamanho_bloco):
+    while bloco := arquivo.read(tamanho_bloco):
+        yield bloco
+
+
+def escapar_arquivo(entrada, saida, quote=True, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Grava em saida o conteúdo de entrada (UTF-8) escapado. Retorna a
+    quantidade de bytes lidos.
+    """
+    total = 0
+    with open(entrada, "rb") as arquivo_entrada, open(saida, "wb") as arquivo_saida:
+        for bloco in _ler_blocos(arquivo_entrada, tamanho_bloco):
+            arquivo_saida.write(escapar(bloco, quote))
+            total += len(bloco)
+    return total
+
+
+def desescapar_arquivo(entrada, saida, encoding="utf-8", tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Grava em saida o conteúdo de entrada desescapado. O decodificador
+    incremental cuida dos caracteres cortados entre blocos. Retorna a
+    quantidade de bytes lidos.
+    """
+    decodificador = codecs.getincrementaldecoder(encoding)()
+    lidos = 0
+
+    def blocos_texto(arquivo):
+        nonlocal lidos
+        for bloco in _ler_blocos(arquivo, tamanho_bloco):
+            lidos += len(bloco)
+            yield decodificador.decode(bloco)
+        yield decodificador.decode(b"", final=True)
+
+    with open(entrada, "rb") as arquivo_entrada, open(saida, "wb") as arquivo_saida:
+        for texto in desescapar_fluxo(blocos_texto(arquivo_entrada)):
+            arquivo_saida.write(texto.encode(encoding))
+    return lidos
+
+
+OPERACOES = {"escapar": escapar_arquivo, "desescapar": desescapar_arquivo}
+
+
+def _executar(tarefa):
+    operacao, entrada, saida = tarefa
+    return OPERACOES[operacao](entrada, saida)
+
+
+def processar_arquivos(tarefas, operacao="escapar", processos=None):
+    """
+    Processa vários pares (entrada, saida) independentes, um arquivo por
+    processo de cada vez. Retorna os bytes lidos de cada entrada.
+    """
+    tarefas = [(operacao, entrada, saida) for entrada, saida in tarefas]
+    if processos == 1 or len(tarefas) <= 1:
+        return list(map(_executar, tarefas))
+    with ProcessPoolExecutor(processos) as executor:
+        return list(executor.map(_executar, tarefas))
+
+
+TRECHOS = [
+    "<p class=\"nota\">Relatório de 'vendas' & custos</p>\n",
+    "I &hearts; Python's &lt;standard library&gt;. &amp;&amp &copy 2025 &#169; &#xA9; &#0; &notit;\n",
+    "linha comum de log sem nada de especial, só texto e números 12345\n" * 8,
+    "café, ação, 日本語 &eacute;&Eacute &#233 &#x00e9; &bogus; & &# &#x; &#x110000;\n",
+]
+
+
+def _gerar(caminho, megabytes, sorteio):
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        escritos = 0
+        while escritos < megabytes << 20:
+            pedaco = "".join(sorteio.choices(TRECHOS, k=1000))
+            escritos += arquivo.write(pedaco)
+
+
+def benchmark(megabytes=64, processos=None):
+    processos = processos or max(2, os.cpu_count() or 1)
+    sorteio = random.Random(23)
+
+    # Cortes em todas as posições de um texto cheio de entidades
+    amostra = "".join(TRECHOS) + "&hearts;&heart&#" + "&#12345678901234567890;&amp"
+    for tamanho in (1, 2, 3, 5, 7, 16):
+        blocos = [amostra[i:i + tamanho] for i in range(0, len(amostra), tamanho)]
+        assert "".join(desescapar_fluxo(blocos)) == html.unescape(amostra)
+        assert b"".join(escapar_fluxo(b.encode() for b in blocos)) == html.escape(amostra).encode()
+    texto = "sem nada para trocar"
+    assert escapar(texto) is texto and desescapar(texto) is texto
+
+    with tempfile.TemporaryDirectory() as pasta:
+        entrada = os.path.join(pasta, "export.html")
+        _gerar(entrada, megabytes, sorteio)
+        tamanho = os.path.getsize(entrada)
+
+        for nome, original, fluxo in (("escape", html.escape, escapar_arquivo),
+                                      ("unescape", html.unescape, desescapar_arquivo)):
+            t0 = time.perf_counter()
+            with open(entrada, encoding="utf-8", newline="") as arquivo:
+                esperado = original(arquivo.read()).encode("utf-8")
+            tempo_original = time.perf_counter() - t0
+
+            saida = os.path.join(pasta, f"{nome}.html")
+            t0 = time.perf_counter()
+            fluxo(entrada, saida)
+            tempo_fluxo = time.perf_counter() - t0
+            with open(saida, "rb") as arquivo:
+                assert arquivo.read() == esperado
+            del esperado
+            print(f"{nome}: html.{nome} no arquivo inteiro {tamanho / tempo_original / 1e6:.0f} MB/s, "
+                  f"em blocos {tamanho / tempo_fluxo / 1e6:.0f} MB/s")
+
+        copias = [(entrada, os.path.join(pasta, f"saida{i}.html")) for i in range(processos)]
+        t0 = time.perf_counter()
+        processar_arquivos(copias, "escapar", processos)
+        tempo = time.perf_counter() - t0
+        print(f"{processos} arquivos em {processos} processos: "
+              f"{tamanho * processos / tempo / 1e6:.0f} MB/s no total")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] in OPERACOES:
+        lidos = OPERACOES[sys.argv[1]](sys.argv[2], sys.argv[3])
+        print(f"{lidos} bytes processados.")
+    else:
+        benchmark(*map(int, sys.argv[1:]))
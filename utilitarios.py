@@ -0,0 +1,98 @@
+"""
+Peças compartilhadas pelas versões para volumes grandes
+
+Usadas por clevison/exercicios/Desafios_2/desafio14_externo.py,
+clevison/exercicios/Desafios_2/desafio17_fluxo.py,
+clevison/exercicios/Desafios_3/desafio22_externo.py,
+clevison/exercicios/acentos.py e codewars/basico/palindromo_lote.py, que
+tinham cada uma a sua cópia:
+
+    1. TabelaTraducao: tabela de str.translate que calcula cada caractere
+    uma única vez, e dobrar_caractere, a conversão sem acentos e em
+    minúsculas usada por várias delas.
+    2. lotes: divide um iterável em listas de tamanho limitado.
+    3. resultados_em_ordem: envia tarefas a um pool de processos sem deixar
+    mais que um número fixo delas em trânsito.
+    4. reduzir_runs: intercala arquivos ordenados em rodadas, sem abrir mais
+    arquivos que o permitido.
+"""
+
+import collections
+import itertools
+import os
+import unicodedata
+
+
+class TabelaTraducao(dict):
+    """
+    Tabela para str.translate que converte cada caractere com converter e
+    guarda o resultado na primeira vez que o caractere aparece. Os códigos
+    das faixas já são calculados na criação.
+    """
+
+    def __init__(self, converter, faixas=()):
+        super().__init__()
+        self.converter = converter
+        for faixa in faixas:
+            for codigo in faixa:
+                self[codigo]  # Preenche pela __missing__
+
+    def __missing__(self, codigo):
+        valor = self.converter(chr(codigo))
+        self[codigo] = valor
+        return valor
+
+
+def dobrar_caractere(caractere):
+    """
+    Letra base em minúsculas (casefold): "Á" -> "a", "ß" -> "ss".
+    """
+    base = unicodedata.normalize("NFD", caractere)
+    return "".join(c for c in base if not unicodedata.combining(c)).casefold()
+
+
+def lotes(iteravel, tamanho):
+    """
+    Gera listas com até tamanho itens do iterável, na ordem.
+    """
+    iterador = iter(iteravel)
+    while lote := list(itertools.islice(iterador, tamanho)):
+        yield lote
+
+
+def resultados_em_ordem(executor, funcao, chamadas, maximo_pendentes):
+    """
+    Chama executor.submit(funcao, *argumentos) para cada item de chamadas
+    e gera os resultados na ordem de envio. Com maximo_pendentes tarefas em
+    trânsito, espera a mais antiga antes de enviar outra, para a memória
+    continuar limitada quando as chamadas carregam blocos grandes.
+    """
+    pendentes = collections.deque()
+    for argumentos in chamadas:
+        pendentes.append(executor.submit(funcao, *argumentos))
+        while len(pendentes) >= maximo_pendentes:
+            yield pendentes.popleft().result()
+    while pendentes:
+        yield pendentes.popleft().result()
+
+
+def reduzir_runs(caminhos, diretorio, maximo, gravar_intercalados, extensao):
+    """
+    Intercala grupos de runs vizinhos até sobrarem no máximo maximo
+    arquivos, para não estourar o limite de arquivos abertos.
+    gravar_intercalados(grupo, destino) grava em destino a intercalação dos
+    arquivos do grupo; os arquivos intercalados são apagados.
+    """
+    rodada = 0
+    while len(caminhos) > maximo:
+        novos = []
+        for i in range(0, len(caminhos), maximo):
+            grupo = caminhos[i:i + maximo]
+            destino = os.path.join(diretorio, f"intercalado_{rodada}_{i}{extensao}")
+            gravar_intercalados(grupo, destino)
+            for caminho in grupo:
+                os.remove(caminho)
+            novos.append(destino)
+        caminhos = novos
+        rodada += 1
+    return caminhos